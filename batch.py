@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Batch runner - generate many resumes from a manifest, resumable and shardable
+
+The manifest is a JSON Lines file, one job per line:
+    {"folder_name": "Amazon+SDE", "chatgpt_file": "jobs/amazon.txt"}
+    {"job_id": "stripe-01", "folder_name": "Stripe+SWE", "chatgpt_text": "...", "company": [...]}
+
+Keys other than job_id / chatgpt_file override the base config (input/base_data.json).
+"template": "<name or hash>" picks a template from input/ (see template_registry.py);
+without it the --template-folder / --template-doc template is used.
+Every finished job is appended to a journal together with its output hashes;
+a rerun skips journaled jobs, so a crashed batch continues where it stopped.
+--shard i/N (1 <= i <= N) splits one manifest deterministically across machines.
+--metrics-port / --metrics-file expose Prometheus metrics (see metrics.py).
+
+Usage:
+    python batch.py jobs.jsonl
+    python batch.py jobs.jsonl --shard 2/4 --journal output/journal-2.jsonl
+    python batch.py jobs.jsonl --metrics-port 9464
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+
+DEFAULT_JOURNAL = os.path.join("output", ".batch_journal.jsonl")
+DEFAULT_BASE_DATA = os.path.join("input", "base_data.json")
+# Name of the template given by --template-folder / --template-doc
+DEFAULT_TEMPLATE_NAME = "default"
+
+
+def job_id_for(job):
+    """Explicit job_id, or a stable hash of the job's content."""
+    if job.get('job_id'):
+        return str(job['job_id'])
+    canonical = json.dumps(job, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def parse_shard(spec):
+    """'i/N' -> (i, N) with 1 <= i <= N."""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected i/N")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}', need 1 <= i <= N")
+    return index, count
+
+
+def in_shard(job_id, shard):
+    """Deterministic shard assignment; every machine computes the same split."""
+    if shard is None:
+        return True
+    index, count = shard
+    bucket = int(hashlib.sha256(job_id.encode('utf-8')).hexdigest(), 16) % count
+    return bucket == index - 1
+
+
+def load_manifest(manifest_path):
+    """Read manifest jobs, skipping blank and comment lines."""
+    jobs = []
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                jobs.append(json.loads(line))
+            except ValueError as e:
+                raise ValueError(f"{manifest_path}:{line_number}: {e}")
+    return jobs
+
+
+def file_hash(path):
+    """SHA-256 of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Journal:
+    """Append-only JSON Lines journal of completed jobs."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.completed = self._load()
+        self._file = open(path, 'a', encoding='utf-8')
+        # End a torn last line so the next record does not share (and lose) it
+        if self._file.tell() and not self._ends_with_newline():
+            self._file.write('\n')
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def _load(self):
+        completed = {}
+        if not os.path.exists(self.path):
+            return completed
+        # Binary, decoded per line: a crash can tear a multibyte character too
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    # Torn last line from a crash mid-write
+                    continue
+                if record.get('status') == 'done':
+                    completed[record['job_id']] = record
+        return completed
+
+    def append(self, record):
+        """Write one record durably before the job counts as done."""
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if record.get('status') == 'done':
+            self.completed[record['job_id']] = record
+
+    def close(self):
+        self._file.close()
+
+
+def run_job(job, base_config, args, parse_cache=None, templates=None):
+    """Generate (and convert) one resume; returns the journal record.
+
+    The record's 'metrics' key holds processor.metrics and is not journaled.
+    """
+    from pdf_converter import convert_docx_to_pdf
+    from pdf_export import export_from_config
+    from process_limits import limits_from_config
+    from catalog import record_job
+
+    config = json.loads(json.dumps(base_config))
+    config.update({k: v for k, v in job.items() if k not in ('job_id', 'chatgpt_file')})
+
+    # Templates are loaded once per batch and shared by every job that uses them
+    if templates is None:
+        from template_registry import TemplateRegistry
+        templates = TemplateRegistry()
+        templates.register(DEFAULT_TEMPLATE_NAME, args.template_folder, args.template_doc)
+    template = templates.get(job.get('template') or DEFAULT_TEMPLATE_NAME)
+
+    processor = template.processor(
+        chatgpt_file=job.get('chatgpt_file'),
+        config=config,
+        parse_cache=parse_cache,
+    )
+    docx_path = processor.run()
+    if not docx_path:
+        return {'status': 'failed', 'error': 'generation failed', 'metrics': processor.metrics}
+
+    pdf_path = None
+    if not args.no_pdf:
+        pdf_path = convert_docx_to_pdf(docx_path, metrics=processor.metrics,
+                                       export=export_from_config(config),
+                                       limits=limits_from_config(config))
+        if not pdf_path:
+            return {'status': 'failed', 'error': 'PDF conversion failed', 'docx': docx_path,
+                    'metrics': processor.metrics}
+
+    try:
+        record_job(processor, docx_path, pdf_path)
+    except Exception as e:
+        print(f"⚠ Could not update catalog: {e}")
+
+    return {
+        'status': 'done',
+        'docx': docx_path,
+        'docx_sha256': file_hash(docx_path),
+        'pdf': pdf_path,
+        'pdf_sha256': file_hash(pdf_path) if pdf_path else None,
+        'timings': processor.timings,
+        'metrics': processor.metrics,
+    }
+
+
+def run_batch(args):
+    """Run every pending job of this shard; returns a summary dict."""
+    shard = parse_shard(args.shard) if args.shard else None
+
+    base_config = {}
+    if args.base and os.path.exists(args.base):
+        with open(args.base, 'r', encoding='utf-8') as f:
+            base_config = json.load(f)
+
+    jobs = load_manifest(args.manifest)
+    journal = Journal(args.journal)
+    summary = {'done': 0, 'skipped': 0, 'failed': 0, 'other_shards': 0}
+
+    from template_registry import TemplateRegistry
+    templates = TemplateRegistry()
+    templates.register(DEFAULT_TEMPLATE_NAME, args.template_folder, args.template_doc)
+
+    parse_cache = None
+    if not args.no_parse_cache:
+        from parse_cache import ParseCache
+        parse_cache = ParseCache(args.parse_cache)
+
+    metrics = None
+    if args.metrics_port is not None or args.metrics_file:
+        import metrics
+        metrics.REGISTRY.register_collector('templates', metrics.template_registry_collector(templates))
+        if parse_cache is not None:
+            metrics.REGISTRY.register_collector('parse_cache', metrics.parse_cache_collector(parse_cache))
+        if args.metrics_port is not None:
+            metrics.serve(args.metrics_port)
+
+    job_ids = [job_id_for(job) for job in jobs]
+    pending = sum(1 for job_id in job_ids if in_shard(job_id, shard) and job_id not in journal.completed)
+
+    try:
+        for job, job_id in zip(jobs, job_ids):
+            if not in_shard(job_id, shard):
+                summary['other_shards'] += 1
+                continue
+            if job_id in journal.completed:
+                summary['skipped'] += 1
+                continue
+
+            print(f"\n=== Job {job_id}: {job.get('folder_name', '')} ===")
+            pending -= 1
+            if metrics:
+                metrics.QUEUE_DEPTH.set(pending)
+                metrics.JOBS_IN_PROGRESS.inc()
+            started = time.time()
+            try:
+                result = run_job(job, base_config, args, parse_cache, templates)
+            except Exception as e:
+                result = {'status': 'failed', 'error': str(e)}
+
+            job_metrics = result.pop('metrics', None)
+            result.update({'job_id': job_id, 'finished_at': time.time(),
+                           'seconds': time.time() - started})
+            journal.append(result)
+            summary['done' if result['status'] == 'done' else 'failed'] += 1
+
+            if metrics:
+                metrics.JOBS_IN_PROGRESS.dec()
+                metrics.observe_job(job_metrics, result['status'])
+                if args.metrics_file:
+                    metrics.write_textfile(args.metrics_file)
+    finally:
+        journal.close()
+        if parse_cache is not None:
+            summary['parse_cache'] = parse_cache.stats()
+            if metrics:
+                metrics.REGISTRY.unregister_collector('parse_cache')
+            parse_cache.close()
+
+    shard_text = f" (shard {args.shard})" if shard else ""
+    print(f"\n🎉 Batch complete{shard_text}: {summary['done']} done, "
+          f"{summary['skipped']} already done, {summary['failed']} failed, "
+          f"{summary['other_shards']} in other shards")
+    if 'parse_cache' in summary:
+        from parse_cache import format_stats
+        print(format_stats(summary['parse_cache']))
+    return summary
+
+
+def main():
+    """Command line interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate resumes from a JSON Lines manifest')
+    parser.add_argument('manifest', help='JSON Lines manifest, one job per line')
+    parser.add_argument('--shard', help='Only run shard i of N, e.g. 2/4')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL, help='Checkpoint journal path')
+    parser.add_argument('--base', default=DEFAULT_BASE_DATA, help='Base config JSON')
+    parser.add_argument('--template-folder', default='input/template1', help='Extracted template folder')
+    parser.add_argument('--template-doc', default='input/document.xml', help='Tagged document.xml')
+    parser.add_argument('--no-pdf', action='store_true', help='Skip PDF conversion')
+    parser.add_argument('--parse-cache', default=os.path.join("output", "parse_cache.db"),
+                        help='Parse result cache database')
+    parser.add_argument('--no-parse-cache', action='store_true', help='Always parse from scratch')
+    parser.add_argument('--metrics-port', type=int,
+                        help='Serve Prometheus metrics on 127.0.0.1:PORT/metrics while running')
+    parser.add_argument('--metrics-file',
+                        help='Write Prometheus metrics to this file after every job (textfile collector)')
+    args = parser.parse_args()
+
+    summary = run_batch(args)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Artifact catalog - SQLite index of every generated resume
+
+Each successful job writes one row (job id, folder, companies, content and
+template hashes, backend, sizes, stage timings) to output/catalog.db, so past
+resumes can be found by company, date or hash without walking output/.
+
+Usage:
+    python catalog.py rebuild              # backfill from an existing output/ tree
+    python catalog.py find --company PayPal
+    python catalog.py find --since 2024-01-01 --until 2024-02-01
+    python catalog.py find --hash <content hash>
+    python catalog.py stats                # jobs per day
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+import uuid
+import zipfile
+from datetime import datetime
+
+DEFAULT_DB_PATH = os.path.join("output", "catalog.db")
+DEFAULT_OUTPUT_ROOT = "output"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    job_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    folder TEXT NOT NULL,
+    docx_path TEXT NOT NULL,
+    pdf_path TEXT,
+    content_hash TEXT,
+    template_hash TEXT,
+    backend TEXT,
+    docx_size INTEGER,
+    pdf_size INTEGER,
+    timings TEXT,
+    pdf_preset TEXT
+);
+CREATE INDEX IF NOT EXISTS artifacts_created ON artifacts (created_at);
+CREATE INDEX IF NOT EXISTS artifacts_content_hash ON artifacts (content_hash);
+CREATE INDEX IF NOT EXISTS artifacts_folder ON artifacts (folder);
+CREATE INDEX IF NOT EXISTS artifacts_docx_path ON artifacts (docx_path);
+CREATE TABLE IF NOT EXISTS artifact_companies (
+    job_id TEXT NOT NULL REFERENCES artifacts (job_id) ON DELETE CASCADE,
+    company_key TEXT NOT NULL,
+    company TEXT NOT NULL,
+    role TEXT NOT NULL,
+    PRIMARY KEY (job_id, company_key, role)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS artifact_companies_key ON artifact_companies (company_key);
+"""
+
+# Namespace for job ids of backfilled artifacts (stable across rebuilds)
+BACKFILL_NAMESPACE = uuid.UUID('6f1c2b1e-6a52-4c55-9a53-6f0d1e1b9c21')
+
+
+def content_hash_of_xml(document_xml):
+    """Content hash of a resume: SHA-256 of its rendered word/document.xml."""
+    if isinstance(document_xml, str):
+        document_xml = document_xml.encode('utf-8')
+    return hashlib.sha256(document_xml).hexdigest()
+
+
+def content_hash_of_docx(docx_path):
+    """Content hash of a .docx: the hash of the word/document.xml stored in it."""
+    with zipfile.ZipFile(docx_path) as z:
+        return content_hash_of_xml(z.read('word/document.xml'))
+
+
+def _company_key(name):
+    return ' '.join(name.split()).casefold()
+
+
+def _target_company(folder):
+    """Company a resume was made for: the part before '+' in the folder name."""
+    return folder.split('+', 1)[0].strip()
+
+
+class Catalog:
+    """SQLite catalog of generated artifacts."""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add columns that catalogs created by older versions lack."""
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(artifacts)")}
+        if 'pdf_preset' not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE artifacts ADD COLUMN pdf_preset TEXT")
+
+    def record(self, entry):
+        """Insert (or replace) one artifact row with its companies."""
+        companies = [(c, 'target') for c in entry.get('target_companies', [])]
+        companies += [(c, 'experience') for c in entry.get('companies', [])]
+
+        with self.conn:
+            self.conn.execute("DELETE FROM artifact_companies WHERE job_id = ?", (entry['job_id'],))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO artifacts (job_id, created_at, folder, docx_path, pdf_path, "
+                "content_hash, template_hash, backend, docx_size, pdf_size, timings, pdf_preset) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry['job_id'], entry.get('created_at', time.time()), entry['folder'],
+                    os.path.normpath(entry['docx_path']), entry.get('pdf_path'), entry.get('content_hash'),
+                    entry.get('template_hash'), entry.get('backend'), entry.get('docx_size'),
+                    entry.get('pdf_size'), json.dumps(entry.get('timings', {})), entry.get('pdf_preset'),
+                )
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO artifact_companies (job_id, company_key, company, role) "
+                "VALUES (?, ?, ?, ?)",
+                [(entry['job_id'], _company_key(c), c, role) for c, role in companies if c.strip()]
+            )
+
+    def find_by_company(self, company):
+        """Artifacts made for, or mentioning, a company."""
+        return self._query(
+            "SELECT DISTINCT a.* FROM artifacts a JOIN artifact_companies c ON c.job_id = a.job_id "
+            "WHERE c.company_key = ? ORDER BY a.created_at",
+            (_company_key(company),)
+        )
+
+    def find_by_date(self, since=None, until=None):
+        """Artifacts created in [since, until) (datetimes or timestamps)."""
+        since = since.timestamp() if isinstance(since, datetime) else (since or 0)
+        until = until.timestamp() if isinstance(until, datetime) else (until or float('inf'))
+        return self._query(
+            "SELECT * FROM artifacts WHERE created_at >= ? AND created_at < ? ORDER BY created_at",
+            (since, until)
+        )
+
+    def find_by_hash(self, content_hash):
+        """Artifacts with this content (or template) hash, e.g. to spot duplicates."""
+        return self._query(
+            "SELECT * FROM artifacts WHERE content_hash = ? OR template_hash = ? ORDER BY created_at",
+            (content_hash, content_hash)
+        )
+
+    def jobs_per_day(self):
+        """[(day, jobs)] throughput report."""
+        rows = self.conn.execute(
+            "SELECT date(created_at, 'unixepoch', 'localtime') AS day, COUNT(*) AS jobs "
+            "FROM artifacts GROUP BY day ORDER BY day"
+        ).fetchall()
+        return [(row['day'], row['jobs']) for row in rows]
+
+    def preset_stats(self):
+        """{preset: {jobs, avg_pdf_size, avg_convert_seconds}} over artifacts with a PDF."""
+        totals = {}
+        for row in self.conn.execute(
+            "SELECT pdf_preset, pdf_size, timings FROM artifacts WHERE pdf_size IS NOT NULL"
+        ):
+            preset = row['pdf_preset'] or 'default'
+            total = totals.setdefault(preset, {'jobs': 0, 'bytes': 0, 'seconds': 0.0, 'timed': 0})
+            total['jobs'] += 1
+            total['bytes'] += row['pdf_size']
+            convert = json.loads(row['timings'] or '{}').get('convert')
+            if convert is not None:
+                total['seconds'] += convert
+                total['timed'] += 1
+        return {
+            preset: {
+                'jobs': total['jobs'],
+                'avg_pdf_size': total['bytes'] / total['jobs'],
+                'avg_convert_seconds': total['seconds'] / total['timed'] if total['timed'] else None,
+            }
+            for preset, total in sorted(totals.items())
+        }
+
+    def _query(self, sql, params):
+        rows = self.conn.execute(sql, params).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def _row_to_dict(self, row):
+        entry = dict(row)
+        entry['timings'] = json.loads(entry['timings'] or '{}')
+        entry['companies'] = [
+            r['company'] for r in self.conn.execute(
+                "SELECT company FROM artifact_companies WHERE job_id = ? ORDER BY role, company",
+                (entry['job_id'],)
+            )
+        ]
+        return entry
+
+    def rebuild(self, output_root=DEFAULT_OUTPUT_ROOT):
+        """Backfill the catalog from output/<folder>/resume.docx files."""
+        added = 0
+        for entry in os.scandir(output_root):
+            docx_path = os.path.join(entry.path, "resume.docx")
+            if not entry.is_dir() or not os.path.exists(docx_path):
+                continue
+
+            # Already recorded by a job (or an earlier rebuild)
+            if self.conn.execute(
+                "SELECT 1 FROM artifacts WHERE docx_path = ?", (os.path.normpath(docx_path),)
+            ).fetchone():
+                continue
+
+            pdf_path = os.path.join(entry.path, "resume.pdf")
+            try:
+                content_hash = content_hash_of_docx(docx_path)
+            except (zipfile.BadZipFile, KeyError) as e:
+                print(f"⚠ Skipping {docx_path}: {e}")
+                continue
+
+            self.record({
+                'job_id': str(uuid.uuid5(BACKFILL_NAMESPACE, os.path.abspath(docx_path))),
+                'created_at': os.path.getmtime(docx_path),
+                'folder': entry.name,
+                'docx_path': docx_path,
+                'pdf_path': pdf_path if os.path.exists(pdf_path) else None,
+                'content_hash': content_hash,
+                'backend': None,
+                'docx_size': os.path.getsize(docx_path),
+                'pdf_size': os.path.getsize(pdf_path) if os.path.exists(pdf_path) else None,
+                'target_companies': [_target_company(entry.name)],
+            })
+            added += 1
+
+        print(f"✓ Catalog rebuilt: {added} artifacts added from {output_root}")
+        return added
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+
+def record_job(processor, docx_path, pdf_path=None, catalog=None):
+    """Write the catalog row for a finished ResumeProcessor job."""
+    folder = (processor.config or {}).get('folder_name', '')
+    conversion = processor.metrics.get('conversion', {})
+    entry = {
+        'job_id': processor.job_id,
+        'folder': folder,
+        'docx_path': docx_path,
+        'pdf_path': pdf_path,
+        # Hash what was packaged (either path), so rebuild() computes the same value
+        'content_hash': content_hash_of_docx(docx_path),
+        'template_hash': processor.template_hash,
+        'backend': conversion.get('backend'),
+        'docx_size': os.path.getsize(docx_path),
+        'pdf_size': os.path.getsize(pdf_path) if pdf_path and os.path.exists(pdf_path) else None,
+        'timings': processor.timings,
+        # A backend other than LibreOffice ignores the preset and makes a plain PDF
+        'pdf_preset': (('default' if conversion.get('preset_ignored') else conversion.get('preset'))
+                       if pdf_path else None),
+        'target_companies': [_target_company(folder)] if folder else [],
+        'companies': [exp['company'] for exp in processor.parsed_data.get('experiences', [])],
+    }
+
+    own_catalog = catalog is None
+    catalog = catalog or Catalog()
+    try:
+        catalog.record(entry)
+    finally:
+        if own_catalog:
+            catalog.close()
+    return entry
+
+
+def _print_rows(rows):
+    for row in rows:
+        created = datetime.fromtimestamp(row['created_at']).strftime('%Y-%m-%d %H:%M')
+        print(f"{created}  {row['folder']:<40} {row['backend'] or '-':<12} "
+              f"{(row['content_hash'] or '')[:12]}  {', '.join(row['companies'])}")
+    print(f"({len(rows)} artifacts)")
+
+
+def main():
+    """Command line interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Query or rebuild the artifact catalog')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='Catalog database path')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = sub.add_parser('rebuild', help='Backfill the catalog from an output tree')
+    rebuild.add_argument('--output', default=DEFAULT_OUTPUT_ROOT, help='Output folder to scan')
+
+    find = sub.add_parser('find', help='Find artifacts')
+    find.add_argument('--company', help='Target or experience company')
+    find.add_argument('--hash', help='Content or template hash')
+    find.add_argument('--since', help='YYYY-MM-DD (inclusive)')
+    find.add_argument('--until', help='YYYY-MM-DD (exclusive)')
+
+    sub.add_parser('stats', help='Jobs per day')
+    sub.add_parser('presets', help='PDF size and conversion time per PDF preset')
+
+    args = parser.parse_args()
+    catalog = Catalog(args.db)
+    try:
+        if args.command == 'rebuild':
+            catalog.rebuild(args.output)
+        elif args.command == 'stats':
+            for day, jobs in catalog.jobs_per_day():
+                print(f"{day}  {jobs}")
+        elif args.command == 'presets':
+            for preset, stats in catalog.preset_stats().items():
+                seconds = stats['avg_convert_seconds']
+                print(f"{preset:<20} {stats['jobs']:>6} jobs  {stats['avg_pdf_size'] / 1024:8.1f} KB  "
+                      + (f"{seconds:6.2f}s" if seconds is not None else "     -"))
+        elif args.company:
+            _print_rows(catalog.find_by_company(args.company))
+        elif args.hash:
+            _print_rows(catalog.find_by_hash(args.hash))
+        else:
+            since = datetime.strptime(args.since, '%Y-%m-%d') if args.since else None
+            until = datetime.strptime(args.until, '%Y-%m-%d') if args.until else None
+            _print_rows(catalog.find_by_date(since, until))
+    finally:
+        catalog.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
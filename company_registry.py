@@ -0,0 +1,159 @@
+"""
+Company registry - "already bid" companies in an indexed SQLite store
+
+Replaces re-reading input/company.txt into a set on every generation. Keys are
+case- and whitespace-normalized, and claiming a company is a single atomic
+INSERT OR IGNORE, so parallel batch workers cannot both bid the same company.
+company.txt is still appended to as a human-readable log and imported
+incrementally (only the bytes added since the last import are parsed; a hash
+of the already-imported prefix detects files that were rewritten in place).
+"""
+import hashlib
+import os
+import sqlite3
+import time
+
+DEFAULT_DB_PATH = os.path.join("input", "company.db")
+DEFAULT_LEGACY_FILE = os.path.join("input", "company.txt")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    added_at REAL NOT NULL,
+    source TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    fingerprint TEXT
+);
+"""
+
+
+def normalize_company(name):
+    """Registry key: trimmed, inner whitespace collapsed, case-folded."""
+    return ' '.join(name.split()).casefold()
+
+
+class CompanyRegistry:
+    """Concurrency-safe set of companies already applied to."""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, legacy_file=DEFAULT_LEGACY_FILE):
+        self.db_path = db_path
+        self.legacy_file = legacy_file
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        # Autocommit; explicit BEGIN IMMEDIATE where several statements must be atomic
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.executescript(SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(imports)")]
+        if 'fingerprint' not in columns:
+            # Databases from before fingerprints: the next import re-reads the whole file
+            self.conn.execute("ALTER TABLE imports ADD COLUMN fingerprint TEXT")
+
+        if legacy_file and os.path.exists(legacy_file):
+            self.import_file(legacy_file)
+
+    def __contains__(self, name):
+        row = self.conn.execute(
+            "SELECT 1 FROM companies WHERE key = ?", (normalize_company(name),)
+        ).fetchone()
+        return row is not None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+
+    def claim(self, name, source='gui'):
+        """Atomically record a company; returns False if it was already there."""
+        key = normalize_company(name)
+        if not key:
+            raise ValueError("Company name is empty")
+
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO companies (key, name, added_at, source) VALUES (?, ?, ?, ?)",
+            (key, name.strip(), time.time(), source)
+        )
+        if cursor.rowcount != 1:
+            return False
+
+        if self.legacy_file:
+            line = name.strip().encode("utf-8") + b"\n"
+            with open(self.legacy_file, "a+b") as f:
+                # A hand-edited file may not end with a newline; never glue onto its last line
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        line = b"\n" + line
+                f.write(line)
+        return True
+
+    def import_names(self, names, source='import'):
+        """Bulk insert names in one transaction; returns how many were new."""
+        now = time.time()
+        rows = [(normalize_company(n), n.strip(), now, source) for n in names if n.strip()]
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO companies (key, name, added_at, source) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            added = self.conn.total_changes - before
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def import_file(self, path):
+        """Import a one-company-per-line file, resuming after the last imported byte."""
+        abs_path = os.path.abspath(path)
+        row = self.conn.execute(
+            "SELECT offset, fingerprint FROM imports WHERE path = ?", (abs_path,)
+        ).fetchone()
+        offset, fingerprint = row if row else (0, None)
+
+        size = os.path.getsize(path)
+        if size < offset or (offset and not fingerprint):
+            # File was truncated (or imported before fingerprints): start over
+            offset = 0
+
+        with open(path, "rb") as f:
+            prefix_hash = hashlib.sha256()
+            remaining = offset
+            while remaining:
+                block = f.read(min(remaining, 1 << 20))
+                if not block:
+                    break
+                prefix_hash.update(block)
+                remaining -= len(block)
+            if offset and prefix_hash.hexdigest() != fingerprint:
+                # Rewritten in place (same size or longer): import it again from the start
+                offset = 0
+                prefix_hash = hashlib.sha256()
+                f.seek(0)
+            if size == offset:
+                return 0
+            chunk = f.read()
+
+        # EOF ends the last line too, but the offset stays before an unterminated
+        # line so it is read again (whole) if it is extended later
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        prefix_hash.update(complete)
+        names = chunk.decode("utf-8", errors="replace").splitlines()
+
+        added = self.import_names(names, source=os.path.basename(path))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO imports (path, offset, fingerprint) VALUES (?, ?, ?)",
+            (abs_path, offset + len(complete), prefix_hash.hexdigest())
+        )
+        if added:
+            print(f"✓ Imported {added} companies from {path}")
+        return added
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
@@ -0,0 +1,140 @@
+"""
+Retry policy and circuit breakers for the PDF conversion backends
+
+Timeouts follow the observed latency of each backend, retries back off
+exponentially with jitter, and a backend that keeps failing is skipped until
+its breaker lets a probe request through again.
+"""
+import random
+import threading
+import time
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Per-backend breaker: closed -> open after repeated failures -> half-open probe."""
+
+    def __init__(self, failure_threshold=3, reset_timeout=60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._state = CLOSED
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """Current state; an open breaker turns half-open once reset_timeout passed."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+        return self._state
+
+    def allow(self):
+        """Return True if a request may be sent (only one probe while half-open)."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        """Close the breaker."""
+        with self._lock:
+            self.failures = 0
+            self._state = CLOSED
+            self._probing = False
+
+    def release(self):
+        """Give back a probe slot that was not used (e.g. the backend is not installed)."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        """Count a failure; open after too many, or right away if the probe failed."""
+        with self._lock:
+            self.failures += 1
+            if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = OPEN
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class RetryPolicy:
+    """Latency-derived timeouts, exponential backoff with jitter, and breakers per backend."""
+
+    def __init__(self, max_attempts=3, default_timeout=30.0, min_timeout=10.0,
+                 max_timeout=120.0, timeout_percentile=95, timeout_multiplier=2.0,
+                 min_samples=5, backoff_base=1.0, backoff_max=15.0,
+                 failure_threshold=3, reset_timeout=60.0, window=50):
+        self.max_attempts = max_attempts
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_percentile = timeout_percentile
+        self.timeout_multiplier = timeout_multiplier
+        self.min_samples = min_samples
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.window = window
+        self._latencies = {}
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, backend):
+        """Return (creating if needed) the breaker of a backend."""
+        with self._lock:
+            if backend not in self._breakers:
+                self._breakers[backend] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[backend]
+
+    def record_latency(self, backend, seconds):
+        """Remember how long a successful conversion took."""
+        with self._lock:
+            self._latencies.setdefault(backend, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, backend, pct):
+        """Latency percentile of a backend, None without samples."""
+        with self._lock:
+            samples = sorted(self._latencies.get(backend, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+    def timeout_for(self, backend):
+        """Timeout from the latency percentile, default until enough samples exist."""
+        with self._lock:
+            sample_count = len(self._latencies.get(backend, ()))
+        if sample_count < self.min_samples:
+            return self.default_timeout
+        observed = self.percentile(backend, self.timeout_percentile) * self.timeout_multiplier
+        return min(self.max_timeout, max(self.min_timeout, observed))
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff before retry number `attempt` (1-based)."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def breaker_states(self):
+        """{backend: state} snapshot for job metrics."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {backend: breaker.state for backend, breaker in breakers.items()}
+
+
+# Shared by every conversion in this process so breakers see all failures
+DEFAULT_POLICY = RetryPolicy()
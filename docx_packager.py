@@ -0,0 +1,245 @@
+"""
+DOCX packager - build a .docx from a template .docx without recompressing unchanged parts
+
+Styles, theme, fonts and media are identical in every generated resume. Their
+local file entries (header + already-compressed data) are copied byte-for-byte
+from the template .docx; only the rendered XML parts are deflated fresh.
+"""
+import io
+import os
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+
+# Local file header / central directory / end of central directory records
+LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+CENTRAL_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+END_RECORD = struct.Struct('<4s4H2LH')
+DATA_DESCRIPTOR_SIG = b'PK\x07\x08'
+
+LOCAL_SIG = b'PK\x03\x04'
+CENTRAL_SIG = b'PK\x01\x02'
+END_SIG = b'PK\x05\x06'
+
+ZIP32_LIMIT = 0xFFFFFFFF
+ENTRY_LIMIT = 0xFFFF
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+
+
+class DocxPackagingError(Exception):
+    """Raised when the template .docx cannot be repackaged."""
+
+
+def _dos_datetime(date_time):
+    """Convert a (Y, M, D, h, m, s) tuple to DOS date and time fields."""
+    year, month, day, hour, minute, second = date_time
+    dos_date = (max(year, 1980) - 1980) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | (second // 2)
+    return dos_date, dos_time
+
+
+def _raw_entry(source, info):
+    """Read the complete local entry (header, data, descriptor) of a source member."""
+    source.seek(info.header_offset)
+    header = source.read(LOCAL_HEADER.size)
+    fields = LOCAL_HEADER.unpack(header)
+    if fields[0] != LOCAL_SIG:
+        raise DocxPackagingError(f"Bad local header for {info.filename}")
+
+    name_length, extra_length = fields[9], fields[10]
+    length = LOCAL_HEADER.size + name_length + extra_length + info.compress_size
+
+    if info.flag_bits & FLAG_DATA_DESCRIPTOR:
+        source.seek(info.header_offset + length)
+        signature = source.read(4)
+        length += 16 if signature == DATA_DESCRIPTOR_SIG else 12
+
+    source.seek(info.header_offset)
+    return source.read(length)
+
+
+def _fresh_entry(name, data, date_time):
+    """Deflate new part data and build its local entry and central directory fields."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+    crc = zlib.crc32(data)
+    encoded_name = name.encode('utf-8')
+    flags = 0 if encoded_name.isascii() else FLAG_UTF8
+    dos_date, dos_time = _dos_datetime(date_time)
+
+    header = LOCAL_HEADER.pack(
+        LOCAL_SIG, 20, flags, zipfile.ZIP_DEFLATED, dos_time, dos_date,
+        crc, len(compressed), len(data), len(encoded_name), 0
+    )
+    central = {
+        'create_version': 20, 'create_system': 0, 'extract_version': 20,
+        'flag_bits': flags, 'compress_type': zipfile.ZIP_DEFLATED,
+        'dos_time': dos_time, 'dos_date': dos_date, 'crc': crc,
+        'compress_size': len(compressed), 'file_size': len(data),
+        'name': encoded_name, 'extra': b'', 'comment': b'',
+        'internal_attr': 0, 'external_attr': 0o600 << 16,
+    }
+    return header + encoded_name + compressed, central
+
+
+def _central_from_info(info):
+    """Central directory fields for a raw-copied member, taken from the source."""
+    encoded_name = info.filename.encode('utf-8' if info.flag_bits & FLAG_UTF8 else 'cp437')
+    dos_date, dos_time = _dos_datetime(info.date_time)
+    return {
+        'create_version': info.create_version, 'create_system': info.create_system,
+        'extract_version': info.extract_version, 'flag_bits': info.flag_bits,
+        'compress_type': info.compress_type, 'dos_time': dos_time, 'dos_date': dos_date,
+        'crc': info.CRC, 'compress_size': info.compress_size, 'file_size': info.file_size,
+        'name': encoded_name, 'extra': info.extra, 'comment': info.comment,
+        'internal_attr': info.internal_attr, 'external_attr': info.external_attr,
+    }
+
+
+def _central_record(central, offset):
+    """Pack one central directory record."""
+    return CENTRAL_HEADER.pack(
+        CENTRAL_SIG, central['create_version'], central['create_system'],
+        central['extract_version'], 0, central['flag_bits'], central['compress_type'],
+        central['dos_time'], central['dos_date'], central['crc'],
+        central['compress_size'], central['file_size'], len(central['name']),
+        len(central['extra']), len(central['comment']), 0,
+        central['internal_attr'], central['external_attr'], offset
+    ) + central['name'] + central['extra'] + central['comment']
+
+
+def _open_source(source_docx):
+    """Binary file object over a template .docx given as a path or as its bytes."""
+    if isinstance(source_docx, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source_docx)
+    return open(source_docx, 'rb')
+
+
+def template_drift(source_docx, files, ignore=()):
+    """Compare a template .docx with the files it was made from (e.g. the extracted folder).
+
+    Args:
+        source_docx: Template .docx (path or bytes)
+        files: {part name: bytes} authoritative template files
+        ignore: part names not to compare (they are rendered anyway)
+
+    Returns:
+        ({part name: bytes} files that differ from or are missing in the .docx,
+         set of .docx members that are not among the files)
+    """
+    with _open_source(source_docx) as source, zipfile.ZipFile(source) as source_zip:
+        members = {info.filename: info for info in source_zip.infolist()}
+
+    changed = {}
+    for name, data in files.items():
+        if name in ignore:
+            continue
+        info = members.get(name)
+        if info is None or info.file_size != len(data) or info.CRC != zlib.crc32(data):
+            changed[name] = bytes(data)
+    removed = {name for name in members if name not in files and name not in ignore}
+    return changed, removed
+
+
+# Mode open() creates files with in this process; found once by _default_mode
+_file_mode = None
+
+
+def _default_mode(directory):
+    """Mode a plain open() would create files with (0666 minus the umask).
+
+    Read from a probe file rather than by setting and restoring os.umask, which
+    would briefly change the mode of files other threads create meanwhile.
+    """
+    global _file_mode
+    if _file_mode is None:
+        fd, probe_path = tempfile.mkstemp(prefix='.umask_', dir=directory)
+        os.close(fd)
+        os.remove(probe_path)
+        # Same name, now created the way open() would create it
+        fd = os.open(probe_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            _file_mode = os.fstat(fd).st_mode & 0o777
+        finally:
+            os.close(fd)
+            os.remove(probe_path)
+    return _file_mode
+
+
+def write_docx(source_docx, output_docx, rendered_parts, omit=()):
+    """Write output_docx from source_docx, replacing only rendered_parts.
+
+    Args:
+        source_docx: Template .docx (path or bytes) whose unchanged entries are copied raw
+        output_docx: Path of the .docx to create (written atomically)
+        rendered_parts: {part name: str or bytes} parts to compress fresh
+        omit: source members to leave out of the output
+
+    Returns:
+        dict with counts and byte totals of copied and compressed entries
+    """
+    stats = {'copied': 0, 'copied_bytes': 0, 'compressed': 0, 'compressed_bytes': 0}
+    now = time.localtime()[:6]
+    pending = dict(rendered_parts)
+    central_records = []
+
+    output_dir = os.path.dirname(os.path.abspath(output_docx))
+    fd, tmp_path = tempfile.mkstemp(prefix='.resume_', suffix='.docx', dir=output_dir)
+    try:
+        # mkstemp creates 0600; give the output the mode any other file would get
+        os.chmod(tmp_path, _default_mode(output_dir))
+        with os.fdopen(fd, 'wb') as out, _open_source(source_docx) as source, \
+                zipfile.ZipFile(source) as source_zip:
+            members = [info for info in source_zip.infolist() if info.filename not in omit]
+            if len(members) + len(pending) > ENTRY_LIMIT:
+                raise DocxPackagingError("Too many entries for a ZIP32 archive")
+
+            for info in members:
+                offset = out.tell()
+                if info.filename in pending:
+                    # Keep the template's timestamp so equal content gives equal bytes
+                    entry, central = _fresh_entry(info.filename, pending.pop(info.filename), info.date_time)
+                    stats['compressed'] += 1
+                    stats['compressed_bytes'] += len(entry)
+                else:
+                    if info.file_size >= ZIP32_LIMIT or info.compress_size >= ZIP32_LIMIT:
+                        raise DocxPackagingError(f"{info.filename} needs ZIP64")
+                    entry = _raw_entry(source, info)
+                    central = _central_from_info(info)
+                    stats['copied'] += 1
+                    stats['copied_bytes'] += len(entry)
+                out.write(entry)
+                central_records.append(_central_record(central, offset))
+
+            # Parts that do not exist in the template yet
+            for name, data in pending.items():
+                offset = out.tell()
+                entry, central = _fresh_entry(name, data, now)
+                out.write(entry)
+                central_records.append(_central_record(central, offset))
+                stats['compressed'] += 1
+                stats['compressed_bytes'] += len(entry)
+
+            directory_offset = out.tell()
+            directory = b''.join(central_records)
+            if directory_offset + len(directory) >= ZIP32_LIMIT:
+                raise DocxPackagingError("Output needs ZIP64")
+            out.write(directory)
+            out.write(END_RECORD.pack(
+                END_SIG, 0, 0, len(central_records), len(central_records),
+                len(directory), directory_offset, 0
+            ))
+
+        os.replace(tmp_path, output_docx)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return stats
@@ -0,0 +1,678 @@
+#!/usr/bin/env python3
+"""
+Golden-output harness - differential check of render implementations
+
+The render step (ResumeProcessor._process_xml: simple tags, the company block,
+the skill block with its last-item template) is string surgery whose exact
+behavior is only defined by the code. LegacyRenderer below is a frozen copy of
+that code; any other renderer is run over the same corpus and its output must
+match it, byte for byte or after canonical XML normalization (--c14n).
+
+A renderer is a callable
+
+    render(xml_content, rendered_parts, parsed_data, base_data) -> (xml_content, rendered_parts)
+
+The default candidate is the current ResumeProcessor; pass --candidate
+module:function to check another one. The corpus is every template in
+input/ (or --template) times the given input files, synthetic resumes (see
+loadtest.py) and edge cases (escaping, one or many skill categories, unicode).
+Without any template in input/ (e.g. a fresh checkout in CI), the built-in
+minimal 'fixture' template is checked instead.
+The first divergence is reported with context, together with the speed ratio.
+
+Usage:
+    python golden.py
+    python golden.py --candidate fast_render:render --repeat 20
+    python golden.py --template fixture
+    python golden.py --template template1 --input input/chatgpt.txt --c14n --json output/golden.json
+"""
+import contextlib
+import copy
+import importlib
+import io
+import json
+import re
+import sys
+import time
+
+# Frozen copy of template_normalizer.TAG_RE
+TAG_RE = re.compile(r'<resume_[a-z0-9_]+>')
+
+COMPANIES = ["Microsoft", "PayPal", "Tagani"]
+# Characters shown around a divergence
+CONTEXT_CHARS = 80
+# Word elements whose whitespace is content (kept by the canonical comparison)
+TEXT_ELEMENTS = ('t', 'instrText', 'delText')
+
+# Smallest template every block finder accepts, used when input/ has no templates
+FIXTURE_TEMPLATE = 'fixture'
+FIXTURE_XML = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    ' xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml"><w:body>'
+    '<w:p w14:paraId="1"><w:r w:rsidR="1"><w:t><resume_person_name></w:t></w:r></w:p>'
+    '<w:p w14:paraId="2"><w:r w:rsidR="1"><w:t><resume_person_location> | <resume_person_email>'
+    ' | <resume_person_linkedin></w:t></w:r></w:p>'
+    '<w:p w14:paraId="3"><w:r w:rsidR="1"><w:t><resume_summary></w:t></w:r></w:p>'
+    '<w:p w14:paraId="4"><w:r w:rsidR="1"><w:t><resume_skill_head></w:t></w:r>'
+    '<w:r w:rsidR="1"><w:t>: <resume_skill_body></w:t></w:r><w:r w:rsidR="1"><w:br/></w:r></w:p>'
+    '<w:p w14:paraId="5"><w:r w:rsidR="1"><w:t><resume_company_name> | <resume_company_role>'
+    ' | <resume_company_dates> | <resume_company_location></w:t></w:r></w:p>'
+    '<w:p w14:paraId="6"><w:r w:rsidR="1"><w:t><resume_company_bullet></w:t></w:r></w:p>'
+    '<w:p w14:paraId="7"><w:r w:rsidR="1"><w:t>EDUCATION</w:t></w:r></w:p>'
+    '<w:p w14:paraId="8"><w:r w:rsidR="1"><w:t><resume_education_name>, <resume_education_location>'
+    ' <resume_education_date></w:t></w:r></w:p>'
+    '</w:body></w:document>'
+)
+FIXTURE_PARTS = {
+    'word/header1.xml': (
+        '<w:hdr xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        '<w:p><w:r><w:t><resume_person_email></w:t></w:r></w:p></w:hdr>'
+    ),
+}
+
+
+def index_tags(xml_text):
+    """Frozen copy of template_normalizer.index_tags."""
+    index = {}
+    for match in TAG_RE.finditer(xml_text):
+        index.setdefault(match.group(0), []).append(match.start())
+    return index
+
+
+class LegacyRenderer:
+    """The render step as it was when this harness was written. Do not optimize this class."""
+
+    XML_ESCAPES = {
+        '&': '&amp;',
+        '<': '&lt;',
+        '>': '&gt;',
+        '"': '&quot;',
+        "'": '&apos;'
+    }
+
+    def __init__(self, xml_content, rendered_parts, parsed_data, base_data):
+        self.xml_content = xml_content
+        self.rendered_parts = dict(rendered_parts)
+        self.parsed_data = parsed_data
+        self.base_data = base_data
+
+    def _process_xml(self):
+        """Process XML content by replacing tags."""
+        self._replace_simple_tags()
+        self._process_company_block()
+        self._process_skill_block()
+        self._check_remaining_tags()
+
+    def _replace_simple_tags(self):
+        """Replace simple one-to-one tags."""
+        replacements = {
+            '<resume_person_name>': self.base_data['personal'].get('name', ''),
+            '<resume_person_location>': self.base_data['personal'].get('location', ''),
+            '<resume_person_email>': self.base_data['personal'].get('email', ''),
+            '<resume_person_linkedin>': self.base_data['personal'].get('linkedin', ''),
+            '<resume_summary>': self.parsed_data.get('summary', ''),
+            '<resume_education_name>': self.base_data['education'].get('university', ''),
+            '<resume_education_location>': self.base_data['education'].get('edu_location', ''),
+            '<resume_education_date>': self.base_data['education'].get('graduation_year', '')
+        }
+        
+        # One indexed scan per part finds every tag, one substitution pass replaces them
+        found_tags = set(index_tags(self.xml_content))
+        for part_xml in self.rendered_parts.values():
+            found_tags.update(index_tags(part_xml))
+
+        for tag in replacements:
+            if tag in found_tags:
+                print(f"✓ Replaced {tag}")
+            else:
+                print(f"⚠ Tag not found: {tag}")
+
+        escaped = {tag: self._escape_xml(value) for tag, value in replacements.items()}
+        self.xml_content = self._substitute_tags(self.xml_content, escaped)
+        for part_name, part_xml in self.rendered_parts.items():
+            self.rendered_parts[part_name] = self._substitute_tags(part_xml, escaped)
+
+    def _substitute_tags(self, xml_text, escaped):
+        """Replace every known tag of a part in a single pass."""
+        return TAG_RE.sub(
+            lambda match: escaped.get(match.group(0), match.group(0)),
+            xml_text
+        )
+
+    def _process_company_block(self):
+        """Find and replace the company block template."""
+        block_info = self._find_company_block()
+        if not block_info:
+            raise ValueError("Could not find company block in template")
+        
+        start_idx, end_idx, block_template = block_info
+        
+        # Generate company blocks
+        company_blocks = [
+            self._create_company_xml(block_template, exp)
+            for exp in self.parsed_data['experiences']
+        ]
+        
+        # Replace in XML
+        self.xml_content = (
+            self.xml_content[:start_idx] +
+            '\n'.join(company_blocks) +
+            self.xml_content[end_idx:]
+        )
+        
+        print(f"✓ Replaced company block with {len(company_blocks)} companies")
+
+    def _find_company_block(self):
+        """Find the company block template in XML."""
+        role_tag = '<resume_company_role>'
+        role_pos = self.xml_content.find(role_tag)
+        
+        if role_pos == -1:
+            return None
+        
+        # Find paragraph start
+        para_start = self.xml_content.rfind('<w:p w14', 0, role_pos)
+        if para_start == -1:
+            return None
+        
+        # Find "EDUCATION" section
+        education_pos = self.xml_content.lower().find('education', role_pos)
+        if education_pos == -1:
+            return None
+        
+        # Find paragraph containing "EDUCATION"
+        education_para_start = self.xml_content.rfind('<w:p w14', 0, education_pos)
+        if education_para_start == -1:
+            return None
+        
+        # Find block end (paragraph before "EDUCATION")
+        block_end = self.xml_content.rfind('</w:p>', 0, education_para_start)
+        if block_end == -1:
+            return None
+        
+        block_end += 6  # Include "</w:p>"
+        
+        return (para_start, block_end, self.xml_content[para_start:block_end])
+
+    def _create_company_xml(self, template, experience):
+        """Create XML for a single company from template."""
+        # Basic replacements
+        replacements = {
+            '<resume_company_name>': experience['company'],
+            '<resume_company_role>': experience['role'],
+            '<resume_company_location>': experience['location'],
+            '<resume_company_dates>': experience['dates']
+        }
+        
+        company_xml = template
+        for tag, value in replacements.items():
+            if tag in company_xml:
+                company_xml = company_xml.replace(tag, self._escape_xml(value))
+        
+        # Handle bullet points
+        bullet_para = self._extract_bullet_paragraph(company_xml)
+        if bullet_para and experience['bullets']:
+            bullet_xmls = [
+                bullet_para.replace('<resume_company_bullet>', self._escape_xml(bullet))
+                for bullet in experience['bullets']
+            ]
+            company_xml = company_xml.replace(bullet_para, '\n'.join(bullet_xmls))
+        
+        return company_xml
+
+    def _extract_bullet_paragraph(self, xml_text):
+        """Extract the paragraph containing bullet tag."""
+        bullet_tag = '<resume_company_bullet>'
+        bullet_pos = xml_text.find(bullet_tag)
+        
+        if bullet_pos == -1:
+            return None
+        
+        # Find paragraph boundaries
+        para_start = xml_text.rfind('<w:p w14', 0, bullet_pos)
+        para_end = xml_text.find('</w:p>', bullet_pos)
+        
+        if para_start == -1 or para_end == -1:
+            return None
+        
+        para_end += 6  # Include "</w:p>"
+        return xml_text[para_start:para_end]
+
+    def _process_skill_block(self):
+        """Find and replace the skill block template."""
+        block_info = self._find_skill_block()
+        if not block_info:
+            raise ValueError("Could not find skill block in template")
+        
+        start_idx, end_idx, block_template = block_info
+
+        start_idx_last, end_idx_last, block_template_last = self._find_skill_block_last()
+        
+        # Generate skill blocks
+        skill_blocks = []
+        skills = self.parsed_data.get('skills', {})
+        length = 0
+        for category, skill_list in skills.items():
+            if length == skills.items().__len__() -1:
+                block_template = block_template_last
+            skill_xml = block_template.replace(
+                '<resume_skill_head>', self._escape_xml(category)
+            ).replace(
+                '<resume_skill_body>', self._escape_xml(skill_list)
+            )
+            skill_blocks.append(skill_xml)
+            length += 1
+        
+        # Replace in XML
+        self.xml_content = (
+            self.xml_content[:start_idx] +
+            '\n'.join(skill_blocks) +
+            self.xml_content[end_idx:]
+        )
+        
+        print(f"✓ Replaced skill block with {len(skill_blocks)} categories")
+
+    def _find_skill_block(self):
+        """Find the skill block template in XML."""
+        head_tag = '<resume_skill_head>'
+        head_pos = self.xml_content.find(head_tag)
+        
+        if head_pos == -1:
+            return None
+        
+        # Find start
+        block_start = self.xml_content.rfind('<w:r w', 0, head_pos)
+        if block_start == -1:
+            return None
+        
+        # Find body tag
+        body_tag = '<resume_skill_body>'
+        body_pos = self.xml_content.find(body_tag, head_pos)
+        if body_pos == -1:
+            return None
+        
+        # Find end
+        para_end = self.xml_content.find('</w:r>', body_pos)
+        if para_end == -1:
+            return None
+        
+        # Move to next closing tag
+        next_para_end = self.xml_content.find('</w:r>', para_end + 1)
+        if next_para_end == -1:
+            return None
+        
+        block_end = next_para_end + 6  # Include "</w:r>"
+        
+        return (block_start, block_end, self.xml_content[block_start:block_end])
+
+    def _find_skill_block_last(self):
+        """Find the skill block template in XML."""
+        head_tag = '<resume_skill_head>'
+        head_pos = self.xml_content.find(head_tag)
+        
+        if head_pos == -1:
+            return None
+        
+        # Find start
+        block_start = self.xml_content.rfind('<w:r w', 0, head_pos)
+        if block_start == -1:
+            return None
+        
+        # Find body tag
+        body_tag = '<resume_skill_body>'
+        body_pos = self.xml_content.find(body_tag, head_pos)
+        if body_pos == -1:
+            return None
+        
+        # Find end
+        para_end = self.xml_content.find('</w:r>', body_pos)
+        if para_end == -1:
+            return None
+        
+        block_end = para_end + 6  # Include "</w:r>"
+        
+        return (block_start, block_end, self.xml_content[block_start:block_end])
+
+    def _escape_xml(self, text):
+        """Escape XML special characters."""
+        if not text:
+            return ""
+        
+        for char, escape in self.XML_ESCAPES.items():
+            text = text.replace(char, escape)
+        
+        return text
+
+    def _check_remaining_tags(self):
+        """Check for any remaining resume tags."""
+        remaining_tags = TAG_RE.findall(self.xml_content)
+        for part_xml in self.rendered_parts.values():
+            remaining_tags.extend(TAG_RE.findall(part_xml))
+        
+        if remaining_tags:
+            print(f"⚠ {len(remaining_tags)} tags not replaced: {remaining_tags}")
+            # Not an optimization but a correctness fix: raw leftovers are unclosed elements
+            escape = lambda xml_text: TAG_RE.sub(lambda m: '&lt;' + m.group(0)[1:-1] + '&gt;', xml_text)
+            self.xml_content = escape(self.xml_content)
+            self.rendered_parts = {name: escape(xml) for name, xml in self.rendered_parts.items()}
+        else:
+            print("✓ All tags replaced successfully")
+
+
+def legacy_render(xml_content, rendered_parts, parsed_data, base_data):
+    """Reference renderer."""
+    renderer = LegacyRenderer(xml_content, rendered_parts, parsed_data, base_data)
+    renderer._process_xml()
+    return renderer.xml_content, renderer.rendered_parts
+
+
+def current_render(xml_content, rendered_parts, parsed_data, base_data):
+    """The renderer ResumeProcessor uses today."""
+    from processor import ResumeProcessor
+
+    processor = ResumeProcessor(None, None, None, config={})
+    processor.xml_content = xml_content
+    processor.rendered_parts = dict(rendered_parts)
+    processor.parsed_data = parsed_data
+    processor.base_data = base_data
+    processor._process_xml()
+    return processor.xml_content, processor.rendered_parts
+
+
+def load_renderer(spec):
+    """'module:function' -> callable."""
+    module_name, _, function_name = spec.partition(':')
+    if not function_name:
+        raise ValueError(f"Invalid renderer '{spec}', expected module:function")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+BASE_DATA = {
+    'personal': {'name': "Jane Roe", 'location': "Austin, TX", 'email': "jane@example.com",
+                 'linkedin': "linkedin.com/in/janeroe"},
+    'company': COMPANIES,
+    'education': {'university': "University of Texas", 'edu_location': "Austin, TX",
+                  'graduation_year': "2016"},
+}
+
+
+def edge_cases():
+    """(name, parsed_data, base_data) inputs that exercise escaping and the block edge cases."""
+    def experience(company, bullets, **fields):
+        return dict({'company': company, 'dates': "2020 - Present", 'role': "Engineer",
+                     'location': "Remote", 'bullets': bullets}, **fields)
+
+    base = copy.deepcopy(BASE_DATA)
+    cases = [
+        ('escaping', {
+            'summary': 'Built <fast> & "safe" systems for AT&T\'s clients',
+            'skills': {'C/C++ & Go': 'a < b > c, "quoted", it\'s'},
+            'experiences': [experience("PayPal", ['Cut p99 < 200ms & cost > 30%', 'Used <b>tags</b>'],
+                                       role='R&D "Lead"')],
+        }, dict(base, personal=dict(base['personal'], name='Anne-Marie O\'Neil & Co'))),
+        ('one_skill_category', {
+            'summary': "Summary", 'skills': {'Technical': "Python"},
+            'experiences': [experience("Microsoft", ["Only bullet"])],
+        }, base),
+        ('many_skill_categories', {
+            'summary': "Summary",
+            'skills': {f"Category {i}": ", ".join(f"skill{j}" for j in range(i + 1)) for i in range(8)},
+            'experiences': [experience(company, [f"Bullet {i} at {company}" for i in range(5)])
+                            for company in COMPANIES],
+        }, base),
+        ('no_bullets', {
+            'summary': "Summary", 'skills': {'Technical': "Python", 'Soft': "Teamwork"},
+            'experiences': [experience("Tagani", []), experience("PayPal", ["One"])],
+        }, base),
+        ('unicode', {
+            'summary': "Ingénieur — systèmes distribués, 日本語, emoji 🚀",
+            'skills': {'Langues': "Français, Español, 中文"},
+            'experiences': [experience("Microsoft", ["Réduit la latence de 40 %", "Führte ein Team"],
+                                       location="Zürich, CH")],
+        }, dict(base, personal=dict(base['personal'], name="Zoë Ørsted"))),
+        ('empty_personal', {
+            'summary': "", 'skills': {'Technical': "Python", 'Soft': "Teamwork"},
+            'experiences': [experience("Microsoft", ["Bullet"])],
+        }, dict(base, personal={}, education={})),
+    ]
+    for name, parsed, base_data in cases:
+        parsed.setdefault('personal', {})
+        parsed.setdefault('education', base_data.get('education', {}))
+        yield name, parsed, base_data
+
+
+def fixture_template():
+    """Template state (as TemplateRegistry holds it) of the built-in fixture."""
+    return {'xml_content': FIXTURE_XML, 'rendered_parts': dict(FIXTURE_PARTS)}
+
+
+def build_corpus(template_names=None, input_files=(), synthetic=20, seed=0):
+    """[(template name, template state)] and [(input name, parsed_data, base_data)]."""
+    from parser import parse_chatgpt_output
+    from template_registry import get_template_registry
+
+    registry = get_template_registry()
+    templates = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name in template_names or registry.names():
+            if name == FIXTURE_TEMPLATE and name not in registry.names():
+                templates.append((name, fixture_template()))
+                continue
+            try:
+                templates.append((name, registry.get(name).state))
+            except Exception as e:
+                print(f"⚠ Skipping template {name}: {e}", file=sys.stderr)
+    if not templates and not template_names:
+        print(f"⚠ No templates in {registry.root}/, checking the built-in '{FIXTURE_TEMPLATE}' template",
+              file=sys.stderr)
+        templates.append((FIXTURE_TEMPLATE, fixture_template()))
+
+    inputs = []
+    for path in input_files:
+        base_data = copy.deepcopy(BASE_DATA)
+        if path.lower().endswith('.json'):
+            from structured_input import load_resume_file, resume_to_parsed
+            parsed = resume_to_parsed(load_resume_file(path), base_data)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                parsed = parse_chatgpt_output(f.read(), base_data)
+        inputs.append((path, parsed, base_data))
+
+    if synthetic:
+        from loadtest import synthetic_inputs
+        for index, text in enumerate(synthetic_inputs(synthetic, seed=seed)):
+            base_data = copy.deepcopy(BASE_DATA)
+            inputs.append((f"synthetic-{index}", parse_chatgpt_output(text, base_data), base_data))
+
+    inputs.extend(edge_cases())
+    return templates, inputs
+
+
+def canonicalize(xml_text):
+    """C14N 2.0 of a part, without the insignificant whitespace between elements."""
+    import xml.etree.ElementTree as ET
+
+    root = ET.fromstring(xml_text.encode('utf-8'))
+    for element in root.iter():
+        local = element.tag.rsplit('}', 1)[-1]
+        if local not in TEXT_ELEMENTS and element.text is not None and not element.text.strip():
+            element.text = None
+        if element.tail is not None and not element.tail.strip():
+            element.tail = None
+    return ET.canonicalize(ET.tostring(root, encoding='unicode'))
+
+
+def first_divergence(expected, actual, context=CONTEXT_CHARS):
+    """None when equal, else offset, paragraph number and both sides around the difference."""
+    if expected == actual:
+        return None
+    offset = next((i for i, (a, b) in enumerate(zip(expected, actual)) if a != b),
+                  min(len(expected), len(actual)))
+    start = max(0, offset - context)
+    return {
+        'offset': offset,
+        'line': expected.count('\n', 0, offset) + 1,
+        'paragraph': expected.count('<w:p ', 0, offset) + expected.count('<w:p>', 0, offset),
+        'expected_length': len(expected),
+        'actual_length': len(actual),
+        'expected': expected[start:offset + context],
+        'actual': actual[start:offset + context],
+        'marker': offset - start,
+    }
+
+
+def _outcome(render, template_state, parsed_data, base_data):
+    """(xml, parts, None) or (None, None, 'ExceptionType: message')."""
+    try:
+        xml, parts = render(template_state['xml_content'], template_state['rendered_parts'],
+                            copy.deepcopy(parsed_data), copy.deepcopy(base_data))
+        return xml, parts, None
+    except Exception as e:
+        return None, None, f"{type(e).__name__}: {e}"
+
+
+def _diff_part(expected, actual, normalize):
+    """first_divergence after normalization; parts that are not well-formed on both sides compare as bytes."""
+    try:
+        expected_normal = normalize(expected)
+    except Exception:
+        expected_normal = None
+    try:
+        actual_normal = normalize(actual)
+    except Exception as e:
+        if expected_normal is not None:
+            return {'error_actual': f"not well-formed: {e}"}
+        return first_divergence(expected, actual)
+    if expected_normal is None:
+        return {'error_actual': "well-formed, but the reference output is not"}
+    return first_divergence(expected_normal, actual_normal)
+
+
+def compare(reference, candidate, templates, inputs, c14n=False):
+    """Run both renderers over every (template, input) pair; returns (checked, divergences)."""
+    normalize = canonicalize if c14n else (lambda text: text)
+    checked = 0
+    divergences = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for template_name, state in templates:
+            for input_name, parsed_data, base_data in inputs:
+                checked += 1
+                expected = _outcome(reference, state, parsed_data, base_data)
+                actual = _outcome(candidate, state, parsed_data, base_data)
+                case = {'template': template_name, 'input': input_name}
+
+                if expected[2] or actual[2]:
+                    # Both must fail the same way (same exception type and message)
+                    if expected[2] != actual[2]:
+                        divergences.append(dict(case, part='(error)', error_expected=expected[2],
+                                                error_actual=actual[2]))
+                    continue
+
+                expected_parts = dict(expected[1], **{'word/document.xml': expected[0]})
+                actual_parts = dict(actual[1], **{'word/document.xml': actual[0]})
+                for part_name in sorted(set(expected_parts) | set(actual_parts)):
+                    if part_name not in expected_parts or part_name not in actual_parts:
+                        divergences.append(dict(case, part=part_name, error_expected='part missing on one side'))
+                        break
+                    diff = _diff_part(expected_parts[part_name], actual_parts[part_name], normalize)
+                    if diff:
+                        divergences.append(dict(case, part=part_name, **diff))
+                        break
+    return checked, divergences
+
+
+def time_renderer(render, templates, inputs, repeat=5):
+    """Best-of-repeat seconds to render the whole corpus once."""
+    best = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _, state in templates:
+                for _, parsed_data, base_data in inputs:
+                    _outcome(render, state, parsed_data, base_data)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+    return best or 0.0
+
+
+def format_divergence(divergence):
+    """Human-readable report of one divergence."""
+    lines = [f"❌ {divergence['template']} × {divergence['input']}: {divergence['part']}"]
+    if 'offset' in divergence:
+        lines.append(f"   first difference at offset {divergence['offset']} (line {divergence['line']}, "
+                     f"paragraph {divergence['paragraph']}); lengths {divergence['expected_length']} "
+                     f"vs {divergence['actual_length']}")
+        pad = ' ' * (len('   expected: ') + divergence['marker'])
+        # One character per character, so the marker lines up
+        lines.append(f"   expected: {divergence['expected'].replace(chr(10), '↵')}")
+        lines.append(f"   actual:   {divergence['actual'].replace(chr(10), '↵')}")
+        lines.append(f"{pad}^")
+    for key in ('error_expected', 'error_actual'):
+        if key in divergence:
+            lines.append(f"   {key.replace('error_', '')}: {divergence[key]}")
+    return '\n'.join(lines)
+
+
+def main():
+    """Command line interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compare a renderer against the frozen legacy renderer')
+    parser.add_argument('--candidate', help='Renderer to check, module:function (default: current processor)')
+    parser.add_argument('--reference', help='Reference renderer, module:function (default: golden:legacy_render)')
+    parser.add_argument('--template', action='append', help='Template name (default: every template in input/)')
+    parser.add_argument('--input', action='append', default=[], help='ChatGPT .txt or structured .json input')
+    parser.add_argument('--synthetic', type=int, default=20, help='Synthetic resumes in the corpus')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic resumes')
+    parser.add_argument('--c14n', action='store_true', help='Compare canonical XML instead of bytes')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (best of)')
+    parser.add_argument('--all', action='store_true', help='Report every divergence, not just the first')
+    parser.add_argument('--json', help='Also write the report to this JSON file')
+    args = parser.parse_args()
+
+    reference = load_renderer(args.reference) if args.reference else legacy_render
+    candidate = load_renderer(args.candidate) if args.candidate else current_render
+
+    templates, inputs = build_corpus(args.template, args.input, args.synthetic, args.seed)
+    if not templates:
+        print(f"❌ No templates found: check the --template names, or use --template {FIXTURE_TEMPLATE}")
+        return 1
+
+    checked, divergences = compare(reference, candidate, templates, inputs, c14n=args.c14n)
+    reference_seconds = time_renderer(reference, templates, inputs, args.repeat)
+    candidate_seconds = time_renderer(candidate, templates, inputs, args.repeat)
+    speedup = reference_seconds / candidate_seconds if candidate_seconds else None
+
+    mode = 'canonical XML' if args.c14n else 'bytes'
+    print(f"🔍 {checked} renders compared ({len(templates)} templates × {len(inputs)} inputs, {mode})")
+    for divergence in (divergences if args.all else divergences[:1]):
+        print(format_divergence(divergence))
+    if len(divergences) > 1 and not args.all:
+        print(f"   ... and {len(divergences) - 1} more (--all to list them)")
+    if not divergences:
+        print("✓ Identical output for every case")
+    print(f"⏱ Reference {reference_seconds * 1000:.1f}ms, candidate {candidate_seconds * 1000:.1f}ms per corpus"
+          + (f", candidate {speedup:.2f}x as fast" if speedup else ""))
+
+    if args.json:
+        report = {
+            'reference': args.reference or 'golden:legacy_render',
+            'candidate': args.candidate or 'golden:current_render',
+            'mode': 'c14n' if args.c14n else 'bytes',
+            'templates': [name for name, _ in templates],
+            'inputs': [name for name, _, _ in inputs],
+            'checked': checked,
+            'divergences': divergences,
+            'reference_seconds': reference_seconds,
+            'candidate_seconds': candidate_seconds,
+            'speedup': speedup,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"✓ Report written: {args.json}")
+
+    return 1 if divergences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
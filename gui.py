@@ -6,16 +6,44 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 import json
 import os
-from pathlib import Path
-import sys
-from pdf_converter import convert_docx_to_pdf
+from parser import IncrementalParser
 import re
 
+
+def preview_rows(data, companies):
+    """Parse preview as [(heading, [child lines])], independent of Tk"""
+    personal = [f"{key}: {data['personal'].get(key, '—')}"
+                for key in ('name', 'location', 'email', 'phone', 'linkedin')]
+    
+    summary = data['summary']
+    summary_text = f"📝 Summary: {len(summary.split())} words" if summary else "📝 Summary: ⚠ not found"
+    
+    skills = []
+    for category, values in data['skills'].items():
+        count = len([v for v in values.split(',') if v.strip()])
+        skills.append(f"{category}: {count} items")
+    
+    experiences = [
+        f"{exp['company']} — {exp['role'] or '?'} | {exp['dates'] or '?'} ({len(exp['bullets'])} bullets)"
+        for exp in data['experiences']
+    ]
+    # Companies from Base Information that the parser did not find
+    found = {exp['company'] for exp in data['experiences']}
+    experiences += [f"⚠ {company}: not found" for company in companies if company not in found]
+    
+    return [
+        ("👤 Personal", personal),
+        (summary_text, []),
+        (f"🛠 Skills ({len(data['skills'])} categories)", skills),
+        (f"💼 Experience ({len(data['experiences'])})", experiences),
+    ]
+
+
 class ResumeBuilderGUI:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Resume Builder")
-        self.root.geometry("700x600")
+        self.root.geometry("1000x650")
         
         # Configure style
         self.setup_styles()
@@ -28,6 +56,11 @@ class ResumeBuilderGUI:
         }
         self.chatgpt_text = ""
         
+        # Live parse preview (debounced, only edited sections are re-parsed)
+        self.preview_parser = IncrementalParser()
+        self.preview_job = None
+        self.preview_delay_ms = 300
+        
         # Create UI
         self.create_widgets()
         
@@ -173,6 +206,35 @@ class ResumeBuilderGUI:
                                foreground='#666')
         folder_help.pack(anchor='w', pady=(2, 0))
         
+        # Trim trailing bullets (by layout estimate) so the resume fits on one page
+        self.auto_fit_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(folder_frame,
+                        text="Auto-fit to one page (drop trailing bullets)",
+                        variable=self.auto_fit_var).pack(anchor='w', pady=(5, 0))
+        
+        # Template style (every extracted template folder in input/)
+        template_row = ttk.Frame(folder_frame)
+        template_row.pack(fill='x', pady=(8, 0))
+        ttk.Label(template_row, text="Template:", style='Field.TLabel').pack(side='left')
+        self.template_var = tk.StringVar(value="template1")
+        self.template_combo = ttk.Combobox(template_row,
+                                           textvariable=self.template_var,
+                                           postcommand=self.refresh_template_list,
+                                           width=30)
+        self.template_combo.pack(side='left', padx=(5, 0))
+        
+        # PDF export preset (image resolution, PDF/A, ...; see pdf_export.py)
+        from pdf_export import PRESETS, DEFAULT_PRESET
+        preset_row = ttk.Frame(folder_frame)
+        preset_row.pack(fill='x', pady=(8, 0))
+        ttk.Label(preset_row, text="PDF preset:", style='Field.TLabel').pack(side='left')
+        self.pdf_preset_var = tk.StringVar(value=DEFAULT_PRESET)
+        ttk.Combobox(preset_row,
+                     textvariable=self.pdf_preset_var,
+                     values=list(PRESETS),
+                     state='readonly',
+                     width=28).pack(side='left', padx=(5, 0))
+        
         # ChatGPT Input Section
         ttk.Separator(frame, orient='horizontal').pack(fill='x', padx=20, pady=10)
         
@@ -181,17 +243,27 @@ class ResumeBuilderGUI:
                                  font=('Segoe UI', 11, 'bold'))
         chatgpt_label.pack(anchor='w', padx=20, pady=(5, 10))
         
-        # Text area
-        self.chatgpt_text_area = scrolledtext.ScrolledText(frame, 
+        # Text area (left) and parse preview (right)
+        panes = ttk.PanedWindow(frame, orient='horizontal')
+        panes.pack(fill='both', expand=True, padx=20, pady=(0, 10))
+        
+        self.chatgpt_text_area = scrolledtext.ScrolledText(panes, 
                                                           wrap=tk.WORD,
                                                           font=('Courier New', 10),
                                                           height=15)
-        self.chatgpt_text_area.pack(fill='both', expand=True, padx=20, pady=(0, 10))
+        panes.add(self.chatgpt_text_area.frame, weight=3)
+        panes.add(self.create_preview_panel(panes), weight=2)
         
         # Add sample text
         sample_text = self.get_sample_chatgpt_output()
         self.chatgpt_text_area.insert('1.0', sample_text)
         
+        # Re-parse while typing; the company list also changes how experiences parse
+        self.chatgpt_text_area.edit_modified(False)
+        self.chatgpt_text_area.bind('<<Modified>>', self.on_chatgpt_modified)
+        self.fields['company']['entry'].bind('<KeyRelease>', lambda e: self.schedule_preview())
+        self.schedule_preview()
+        
         # File buttons frame
         file_frame = ttk.Frame(frame)
         file_frame.pack(padx=20, pady=5)
@@ -204,6 +276,59 @@ class ResumeBuilderGUI:
                   command=self.save_chatgpt_file,
                   width=15).pack(side='left', padx=2)
         
+    def refresh_template_list(self):
+        """Fill the template dropdown from the template registry"""
+        from template_registry import get_template_registry
+        self.template_combo['values'] = get_template_registry().names()
+    
+    def create_preview_panel(self, parent):
+        """Side panel showing what the parser makes of the ChatGPT text"""
+        panel = ttk.Frame(parent)
+        
+        ttk.Label(panel, text="Parsed Preview", font=('Segoe UI', 10, 'bold')).pack(anchor='w', padx=(8, 0))
+        
+        self.preview_tree = ttk.Treeview(panel, show='tree', height=15)
+        self.preview_tree.pack(fill='both', expand=True, padx=(8, 0), pady=(5, 0))
+        
+        self.preview_status = ttk.Label(panel, text="", font=('Segoe UI', 9), foreground='#666')
+        self.preview_status.pack(anchor='w', padx=(8, 0), pady=(2, 0))
+        return panel
+    
+    def on_chatgpt_modified(self, event=None):
+        """Text changed: reset the modified flag and schedule a re-parse"""
+        if self.chatgpt_text_area.edit_modified():
+            self.chatgpt_text_area.edit_modified(False)
+            self.schedule_preview()
+    
+    def schedule_preview(self):
+        """Debounce: re-parse once typing pauses"""
+        if self.preview_job is not None:
+            self.root.after_cancel(self.preview_job)
+        self.preview_job = self.root.after(self.preview_delay_ms, self.refresh_preview)
+    
+    def refresh_preview(self):
+        """Re-parse the ChatGPT text and redraw the preview tree"""
+        self.preview_job = None
+        text = self.chatgpt_text_area.get('1.0', tk.END)
+        value = self.fields['company']['entry'].get()
+        companies = [c.strip() for c in value.split(',') if c.strip()]
+        
+        try:
+            data = self.preview_parser.parse(text, {'company': companies})
+        except Exception as e:
+            self.preview_status.configure(text=f"⚠ Parse error: {e}")
+            return
+        
+        tree = self.preview_tree
+        tree.delete(*tree.get_children())
+        for heading, lines in preview_rows(data, companies):
+            node = tree.insert('', 'end', text=heading, open=bool(lines))
+            for line in lines:
+                tree.insert(node, 'end', text=line)
+        
+        reparsed = ', '.join(self.preview_parser.reparsed) or 'nothing'
+        self.preview_status.configure(text=f"Re-parsed: {reparsed}")
+    
     def create_action_buttons(self):
         """Create action buttons at bottom"""
         button_frame = ttk.Frame(self.root)
@@ -304,6 +429,13 @@ class ResumeBuilderGUI:
                             entry.delete(0, tk.END)
                             entry.insert(0, config[category][field_key])
                 
+                if 'auto_fit' in config:
+                    self.auto_fit_var.set(bool(config['auto_fit']))
+                if config.get('template'):
+                    self.template_var.set(config['template'])
+                if config.get('pdf_preset'):
+                    self.pdf_preset_var.set(config['pdf_preset'])
+                
                 # Load ChatGPT text
                 if 'chatgpt_text' in config:
                     self.chatgpt_text_area.delete('1.0', tk.END)
@@ -343,22 +475,18 @@ class ResumeBuilderGUI:
         company_name = folder_name.split('+', 1)[0].strip()
 
         if company_name:
-            os.makedirs("input", exist_ok=True)
-            company_file_path = os.path.join("input", "company.txt")
-
-            # Read existing companies (if file exists)
-            existing_companies = set()
-            if os.path.exists(company_file_path):
-                with open(company_file_path, "r", encoding="utf-8") as f:
-                    existing_companies = {line.strip() for line in f if line.strip()}
+            # Atomic check-and-insert (also logs to input/company.txt)
+            from company_registry import CompanyRegistry
+            registry = CompanyRegistry()
+            try:
+                claimed = registry.claim(company_name)
+            finally:
+                registry.close()
 
             # Check duplication
-            if company_name in existing_companies:
+            if not claimed:
                 messagebox.showerror("Error", "You've already bid this company. Please choose another one.!")
                 return ""
-            else:
-                with open(company_file_path, "a", encoding="utf-8") as f:
-                    f.write(company_name + "\n")
 
 
         # Remove invalid Windows filename characters
@@ -390,7 +518,10 @@ class ResumeBuilderGUI:
             'education': {},
             'company': [],
             'chatgpt_text': '',
-            'folder_name': self.clean_folder_name(self.folder_name_var.get().strip())
+            'folder_name': self.clean_folder_name(self.folder_name_var.get().strip()),
+            'auto_fit': self.auto_fit_var.get(),
+            'template': self.template_var.get().strip(),
+            'pdf_preset': self.pdf_preset_var.get()
         }
         
         # Collect data from fields
@@ -495,25 +626,25 @@ Software Engineer | Makati, Philippines | October 2016 - September 2021
     def run_resume_processor(self, config):
         """Run the resume processor"""
         try:
-            # Check template folder
-            template_folder = "input/template1"
-            if not os.path.exists(template_folder):
+            # Look up the template (loaded once, reloaded when its files change)
+            from template_registry import get_template_registry
+            template_name = config.get('template') or "template1"
+            try:
+                template = get_template_registry().get(template_name)
+            except (KeyError, FileNotFoundError) as e:
                 messagebox.showerror("Error", 
-                    "Template folder not found.\n"
-                    "Please extract your DOCX to: input/template1/")
+                    f"Template not found: {e}\n"
+                    f"Please extract your DOCX to: input/{template_name}/")
                 return
             
-            # Import processor
-            try:
-                from processor import ResumeProcessor
-            except ImportError:
-                sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-                from processor import ResumeProcessor
+            # Import converter on first use (keeps GUI start-up fast)
+            from pdf_converter import convert_docx_to_pdf
+            from pdf_export import export_from_config
+            from process_limits import limits_from_config
+            from catalog import record_job
             
             # Create and run processor
-            processor = ResumeProcessor(
-                template_doc="input/document.xml",
-                template_folder=template_folder,
+            processor = template.processor(
                 chatgpt_file="input/chatgpt.txt",
                 config=config
             )
@@ -524,7 +655,14 @@ Software Engineer | Makati, Philippines | October 2016 - September 2021
             result = processor.run()
             
             if result:
-                pdf_result = convert_docx_to_pdf(result)
+                pdf_result = convert_docx_to_pdf(result, metrics=processor.metrics,
+                                                 export=export_from_config(config),
+                                                 limits=limits_from_config(config))
+                print(f"📊 Job metrics: {processor.metrics}")
+                try:
+                    record_job(processor, result, pdf_result)
+                except Exception as e:
+                    print(f"⚠ Could not update catalog: {e}")
                 os.startfile(pdf_result)
                 self.on_generation_success(result)
             else:
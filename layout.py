@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Page-fit estimator - predicts line wraps and page count of a rendered resume
+
+Reads page size and margins from the section properties, paragraph spacing,
+indents and font sizes from the paragraphs and styles.xml, and wraps text with
+built-in font advance-width tables. No PDF conversion is needed, so it runs in
+milliseconds and can be used to trim bullets before the single conversion.
+
+The estimate is approximate (no kerning, hyphenation, widow control or
+floating objects), but close enough to tell "fits" from "spills over".
+
+Usage:
+    python layout.py output/Amazon+SDE/resume.docx
+"""
+import functools
+import re
+import sys
+import xml.etree.ElementTree as ET
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# US Letter with 1" margins, used when the document has no sectPr
+DEFAULT_PAGE = {'width': 12240, 'height': 15840, 'top': 1440, 'bottom': 1440, 'left': 1440, 'right': 1440}
+
+TAB_STOP = 720  # Word's default tab interval in twips
+
+# Advance widths (1/1000 em) of ASCII 32..126 from the standard Adobe AFM files
+_HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+_TIMES = (
+    250, 333, 408, 500, 500, 833, 778, 180, 333, 333, 500, 564, 250, 333, 250, 278,
+    500, 500, 500, 500, 500, 500, 500, 500, 500, 500, 278, 278, 564, 564, 564, 444,
+    921, 722, 667, 667, 722, 611, 556, 722, 722, 333, 389, 722, 611, 889, 722, 722,
+    556, 722, 667, 556, 611, 722, 722, 944, 722, 722, 611, 333, 278, 333, 469, 500,
+    333, 444, 500, 444, 500, 444, 333, 500, 500, 278, 278, 500, 278, 778, 500, 500,
+    500, 500, 333, 389, 278, 500, 500, 722, 500, 500, 444, 480, 200, 480, 541,
+)
+_TIMES_BOLD = (
+    250, 333, 555, 500, 500, 1000, 833, 278, 333, 333, 500, 570, 250, 333, 250, 278,
+    500, 500, 500, 500, 500, 500, 500, 500, 500, 500, 333, 333, 570, 570, 570, 500,
+    930, 722, 667, 722, 722, 667, 611, 778, 778, 389, 500, 778, 667, 944, 722, 778,
+    611, 778, 722, 556, 667, 722, 722, 1000, 722, 722, 667, 333, 278, 333, 581, 500,
+    333, 500, 556, 444, 556, 444, 333, 500, 556, 278, 333, 556, 278, 833, 556, 500,
+    556, 556, 444, 389, 333, 556, 500, 722, 500, 500, 444, 394, 220, 394, 520,
+)
+_COURIER = (600,) * 95
+
+_METRICS = {
+    ('sans', False): _HELVETICA,
+    ('sans', True): _HELVETICA_BOLD,
+    ('serif', False): _TIMES,
+    ('serif', True): _TIMES_BOLD,
+    ('mono', False): _COURIER,
+    ('mono', True): _COURIER,
+}
+
+# font name -> (metric family, width scale, line height as a multiple of the font size)
+FONT_FAMILIES = {
+    'arial': ('sans', 1.0, 1.15),
+    'helvetica': ('sans', 1.0, 1.15),
+    'liberation sans': ('sans', 1.0, 1.15),
+    'calibri': ('sans', 0.89, 1.22),
+    'carlito': ('sans', 0.89, 1.22),
+    'verdana': ('sans', 1.13, 1.22),
+    'tahoma': ('sans', 0.98, 1.21),
+    'segoe ui': ('sans', 0.98, 1.33),
+    'times new roman': ('serif', 1.0, 1.15),
+    'liberation serif': ('serif', 1.0, 1.15),
+    'cambria': ('serif', 1.08, 1.17),
+    'georgia': ('serif', 1.12, 1.14),
+    'garamond': ('serif', 0.95, 1.12),
+    'courier new': ('mono', 1.0, 1.13),
+}
+DEFAULT_FAMILY = ('sans', 1.0, 1.15)
+
+WORD_RE = re.compile(r'\S+|\s+')
+
+
+def _family(font):
+    return FONT_FAMILIES.get((font or '').lower(), DEFAULT_FAMILY)
+
+
+@functools.lru_cache(maxsize=None)
+def width_table(font, bold):
+    """{char: advance width in 1/1000 em} for a font, plus the fallback width."""
+    family, scale, _ = _family(font)
+    widths = _METRICS[(family, bold)]
+    table = {chr(32 + i): w * scale for i, w in enumerate(widths)}
+    # Unknown characters (bullets, accents, CJK ...) get the average lowercase width
+    fallback = sum(table[c] for c in 'abcdefghijklmnopqrstuvwxyz') / 26
+    return table, fallback
+
+
+@functools.lru_cache(maxsize=65536)
+def text_width(text, font, bold):
+    """Advance width of text in 1/1000 em."""
+    table, fallback = width_table(font, bold)
+    return sum(table.get(char, fallback) for char in text)
+
+
+def _val(element, tag, attr='val', default=None):
+    child = element.find(W + tag) if element is not None else None
+    if child is None:
+        return default
+    return child.get(W + attr, default)
+
+
+def _int(value, default=0):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _paragraph_props(ppr):
+    """Spacing / indent / break settings present in a w:pPr."""
+    props = {}
+    if ppr is None:
+        return props
+    spacing = ppr.find(W + 'spacing')
+    if spacing is not None:
+        for attr, key in (('before', 'before'), ('after', 'after'), ('line', 'line'), ('lineRule', 'line_rule')):
+            value = spacing.get(W + attr)
+            if value is not None:
+                props[key] = value if key == 'line_rule' else _int(value)
+    ind = ppr.find(W + 'ind')
+    if ind is not None:
+        for attrs, key in ((('left', 'start'), 'ind_left'), (('right', 'end'), 'ind_right')):
+            for attr in attrs:
+                if ind.get(W + attr) is not None:
+                    props[key] = _int(ind.get(W + attr))
+        if ind.get(W + 'hanging') is not None:
+            props['first_line'] = -_int(ind.get(W + 'hanging'))
+        elif ind.get(W + 'firstLine') is not None:
+            props['first_line'] = _int(ind.get(W + 'firstLine'))
+    if ppr.find(W + 'pageBreakBefore') is not None:
+        props['page_break_before'] = _val(ppr, 'pageBreakBefore', default='1') not in ('0', 'false')
+    return props
+
+
+def _run_props(rpr):
+    """Font, size and bold settings present in a w:rPr."""
+    props = {}
+    if rpr is None:
+        return props
+    fonts = rpr.find(W + 'rFonts')
+    if fonts is not None and fonts.get(W + 'ascii'):
+        props['font'] = fonts.get(W + 'ascii')
+    size = _val(rpr, 'sz')
+    if size is not None:
+        props['size'] = _int(size, 22)
+    if rpr.find(W + 'b') is not None:
+        props['bold'] = _val(rpr, 'b', default='1') not in ('0', 'false')
+    return props
+
+
+class Styles:
+    """Document defaults and paragraph/character styles from styles.xml."""
+
+    def __init__(self, styles_xml=None):
+        self.para_defaults = {'before': 0, 'after': 0, 'line': 240, 'line_rule': 'auto',
+                              'ind_left': 0, 'ind_right': 0, 'first_line': 0}
+        self.run_defaults = {'font': None, 'size': 20, 'bold': False}
+        self._styles = {}
+        self.default_para_style = None
+        if styles_xml:
+            self._load(ET.fromstring(styles_xml))
+        self._resolved = {}
+
+    def _load(self, root):
+        defaults = root.find(W + 'docDefaults')
+        if defaults is not None:
+            self.para_defaults.update(_paragraph_props(defaults.find(f'{W}pPrDefault/{W}pPr')))
+            self.run_defaults.update(_run_props(defaults.find(f'{W}rPrDefault/{W}rPr')))
+
+        for style in root.iter(W + 'style'):
+            style_id = style.get(W + 'styleId')
+            if not style_id:
+                continue
+            self._styles[style_id] = (
+                _val(style, 'basedOn'),
+                _paragraph_props(style.find(W + 'pPr')),
+                _run_props(style.find(W + 'rPr')),
+            )
+            if style.get(W + 'type') == 'paragraph' and style.get(W + 'default') in ('1', 'true'):
+                self.default_para_style = style_id
+
+    def resolve(self, style_id):
+        """(paragraph props, run props) of a style with its basedOn chain applied."""
+        key = style_id or self.default_para_style
+        if key in self._resolved:
+            return self._resolved[key]
+
+        chain = []
+        seen = set()
+        style_id = key
+        while style_id in self._styles and style_id not in seen:
+            seen.add(style_id)
+            chain.append(self._styles[style_id])
+            style_id = self._styles[style_id][0]
+
+        para, run = dict(self.para_defaults), dict(self.run_defaults)
+        for _, para_props, run_props in reversed(chain):
+            para.update(para_props)
+            run.update(run_props)
+        self._resolved[key] = (para, run)
+        return para, run
+
+
+@functools.lru_cache(maxsize=8)
+def parse_styles(styles_xml):
+    """Parsed Styles, cached per styles.xml text (templates rarely change)."""
+    return Styles(styles_xml)
+
+
+def _page_setup(body):
+    """Page size and margins (twips) from the body's section properties."""
+    page = dict(DEFAULT_PAGE)
+    sect = body.find(W + 'sectPr') if body is not None else None
+    if sect is None:
+        return page
+    size = sect.find(W + 'pgSz')
+    if size is not None:
+        page['width'] = _int(size.get(W + 'w'), page['width'])
+        page['height'] = _int(size.get(W + 'h'), page['height'])
+        if size.get(W + 'orient') == 'landscape' and page['height'] > page['width']:
+            page['width'], page['height'] = page['height'], page['width']
+    margins = sect.find(W + 'pgMar')
+    if margins is not None:
+        for side in ('top', 'bottom', 'left', 'right'):
+            page[side] = abs(_int(margins.get(W + side), page[side]))
+    return page
+
+
+def _line_height(natural, para):
+    """Height of one line in twips under the paragraph's line rule."""
+    rule = para.get('line_rule', 'auto')
+    line = para.get('line', 240)
+    if rule == 'exact':
+        return line
+    if rule == 'atLeast':
+        return max(natural, line)
+    return natural * line / 240
+
+
+def measure_paragraph(p, styles, width):
+    """Lay out one w:p in a column `width` twips wide.
+
+    Returns:
+        (list of line heights, space before, space after, page break before, page breaks inside)
+    """
+    ppr = p.find(W + 'pPr')
+    para, base_run = styles.resolve(_val(ppr, 'pStyle'))
+    para = dict(para, **_paragraph_props(ppr))
+
+    available = max(width - para.get('ind_left', 0) - para.get('ind_right', 0), TAB_STOP)
+    first_line = para.get('first_line', 0)
+
+    lines = []
+    x = 0
+    line_natural = 0
+    breaks = 0
+
+    def new_line():
+        nonlocal x, line_natural
+        lines.append(line_natural)
+        x, line_natural = 0, 0
+
+    for run in p.iter(W + 'r'):
+        run_props = dict(base_run, **_run_props(run.find(W + 'rPr')))
+        font, bold, size = run_props.get('font'), run_props.get('bold', False), run_props.get('size', 20)
+        natural = size * 10 * _family(font)[2]  # half-points -> twips, times line factor
+        line_natural = max(line_natural, natural)
+
+        for child in run:
+            tag = child.tag
+            if tag == W + 't':
+                for token in WORD_RE.findall(child.text or ''):
+                    token_width = text_width(token, font, bold) * size / 100
+                    if token.isspace():
+                        x += token_width  # trailing spaces may hang past the margin
+                        continue
+                    limit = available - (first_line if not lines else 0)
+                    if x > 0 and x + token_width > limit:
+                        new_line()
+                        line_natural = natural
+                    # A word longer than the line is broken by characters
+                    while token_width > available:
+                        lines.append(line_natural)
+                        token_width -= available
+                    x += token_width
+            elif tag == W + 'tab':
+                x = (int(x // TAB_STOP) + 1) * TAB_STOP
+            elif tag in (W + 'br', W + 'cr'):
+                if child.get(W + 'type') == 'page':
+                    breaks += 1
+                new_line()
+                line_natural = natural
+
+    if not line_natural:
+        # Empty paragraph: one line at the paragraph mark's size
+        mark = dict(base_run, **_run_props(ppr.find(W + 'rPr') if ppr is not None else None))
+        line_natural = mark.get('size', 20) * 10 * _family(mark.get('font'))[2]
+    lines.append(line_natural)
+
+    heights = [_line_height(h, para) for h in lines]
+    return heights, para.get('before', 0), para.get('after', 0), para.get('page_break_before', False), breaks
+
+
+def _measure_table(table, styles, width):
+    """Height of each table row (a row is kept together).
+
+    Only the table's own rows and cells are walked; a nested table is
+    measured once, as part of the cell that contains it.
+    """
+    rows = []
+    for row in table.findall(W + 'tr'):
+        cells = row.findall(W + 'tc')
+        row_height = 0
+        for cell in cells:
+            cell_width = _int(_val(cell.find(W + 'tcPr'), 'tcW', 'w'), 0) or width // max(len(cells), 1)
+            height = 0
+            for block in cell:
+                if block.tag == W + 'p':
+                    heights, before, after, _, _ = measure_paragraph(block, styles, cell_width)
+                    height += before + sum(heights) + after
+                elif block.tag == W + 'tbl':
+                    height += sum(_measure_table(block, styles, cell_width))
+            row_height = max(row_height, height)
+        rows.append(row_height)
+    return rows
+
+
+def estimate_layout(document_xml, styles_xml=None):
+    """Estimate how a rendered document.xml paginates.
+
+    Returns:
+        dict with pages, last_page_fill (0..1 of the last page's body height),
+        lines, paragraphs and the page setup used
+    """
+    if isinstance(document_xml, str):
+        document_xml = document_xml.encode('utf-8')
+    root = ET.fromstring(document_xml)
+    body = root.find(W + 'body')
+    styles = parse_styles(styles_xml) if styles_xml else Styles()
+    page = _page_setup(body)
+
+    width = page['width'] - page['left'] - page['right']
+    body_height = page['height'] - page['top'] - page['bottom']
+
+    pages, y = 1, 0
+    line_count = paragraph_count = 0
+
+    def place(height):
+        nonlocal pages, y
+        if y > 0 and y + height > body_height:
+            pages += 1
+            y = 0
+        y += height
+
+    for block in (body if body is not None else []):
+        if block.tag == W + 'p':
+            heights, before, after, break_before, breaks = measure_paragraph(block, styles, width)
+            if break_before and y > 0:
+                pages, y = pages + 1, 0
+            y += before
+            for height in heights:
+                place(height)
+            # Space after is dropped at the bottom of a page
+            y = min(y + after, body_height)
+            if breaks:
+                pages, y = pages + breaks, 0
+            line_count += len(heights)
+            paragraph_count += 1
+        elif block.tag == W + 'tbl':
+            for row_height in _measure_table(block, styles, width):
+                place(row_height)
+
+    return {
+        'pages': pages,
+        'last_page_fill': round(y / body_height, 3) if body_height else 0.0,
+        'lines': line_count,
+        'paragraphs': paragraph_count,
+        'page': page,
+    }
+
+
+def trim_one_bullet(experiences, min_bullets=1):
+    """Drop the last bullet of the experience with the most bullets (later ones first on ties).
+
+    Returns:
+        (company, dropped bullet), or None if every experience is at min_bullets
+    """
+    candidates = [
+        (len(exp['bullets']), index) for index, exp in enumerate(experiences)
+        if len(exp['bullets']) > min_bullets
+    ]
+    if not candidates:
+        return None
+    _, index = max(candidates)
+    experience = experiences[index]
+    return experience['company'], experience['bullets'].pop()
+
+
+def estimate_docx(docx_path):
+    """Estimate the layout of a packaged .docx."""
+    import zipfile
+
+    with zipfile.ZipFile(docx_path) as z:
+        document_xml = z.read('word/document.xml')
+        styles_xml = z.read('word/styles.xml') if 'word/styles.xml' in z.namelist() else None
+    return estimate_layout(document_xml, styles_xml)
+
+
+def main():
+    """Command line interface"""
+    if len(sys.argv) < 2:
+        print("Usage: python layout.py <resume.docx> [...]")
+        return 1
+    for path in sys.argv[1:]:
+        estimate = estimate_docx(path)
+        print(f"📐 {path}: {estimate['pages']} page(s), last page {estimate['last_page_fill']:.0%} full, "
+              f"{estimate['lines']} lines in {estimate['paragraphs']} paragraphs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
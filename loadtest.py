@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Load test - sustained throughput and per-stage latency of the pipeline
+
+Drives the generation pipeline in-process with synthetic inputs (the GUI
+sample resume in the layout the parser expects, with a random number of
+bullets per company) in one of two modes:
+
+  * fixed concurrency (closed loop): N jobs in flight, a new one starts when
+    one finishes. Latency = service time.
+  * fixed arrival rate (open loop): jobs arrive every 1/rate seconds whether
+    or not earlier ones are done. Latency is measured from the scheduled
+    arrival, so time spent queued behind busy workers is included.
+
+--sweep runs several levels and reports the saturation point: the level after
+which throughput stops growing (concurrency) or can no longer keep up with
+the offered rate (arrival rate). Results are printed as a table and can be
+written as JSON.
+
+Usage:
+    python loadtest.py --concurrency 4 --jobs 200
+    python loadtest.py --rate 2 --duration 60 --no-pdf
+    python loadtest.py --sweep 1,2,4,8 --jobs 100 --json output/loadtest.json
+    python loadtest.py --sweep 1,2,4 --rate 1 --workers process
+"""
+import itertools
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import time
+
+DEFAULT_TEMPLATE_FOLDER = "input/template1"
+DEFAULT_TEMPLATE_DOC = "input/document.xml"
+# Generated resumes go below output/<OUTPUT_FOLDER>/ and are removed afterwards
+OUTPUT_FOLDER = "_loadtest"
+
+COMPANIES = ["Microsoft", "PayPal", "Tagani"]
+PERCENTILES = (50, 95, 99)
+# A concurrency level saturates when the next one adds less than this much throughput
+MIN_SCALING_GAIN = 0.10
+# An arrival rate saturates when less than this fraction of it is achieved
+MIN_RATE_FRACTION = 0.95
+
+# Content of the GUI sample (gui.get_sample_chatgpt_output)
+SAMPLE_SUMMARY = ("Experienced software engineer with 5+ years in backend development, "
+                  "specializing in microservices architecture and cloud technologies.")
+SAMPLE_SKILLS = (
+    "Technical: Python, Java, Spring Boot, AWS, Docker, Kubernetes, React, Node.js",
+    "Soft: Leadership, Communication, Agile Methodology",
+)
+SAMPLE_EXPERIENCES = (
+    ("Microsoft", "November 2023 - Present", "Senior Software Engineer", "Redmond, WA"),
+    ("PayPal", "November 2021 - September 2023", "Software Engineer II", "San Jose, CA"),
+    ("Tagani", "October 2016 - September 2021", "Software Engineer", "Makati, Philippines"),
+)
+# Bullets must be longer than 30 characters: shorter lines end the experience section
+BULLET_VERBS = ("Built", "Led", "Designed", "Optimized", "Migrated", "Automated", "Implemented", "Reduced")
+BULLET_OBJECTS = (
+    "the payment reconciliation service", "a team of 5 engineers across time zones",
+    "CI/CD pipelines on Kubernetes", "API latency of the checkout flow by 40%",
+    "the legacy monolith to microservices", "fraud detection models for card payments",
+    "on-call runbooks and alerting", "a React dashboard for the operations team",
+)
+
+
+def synthetic_inputs(count=None, seed=0, bullets=(2, 8)):
+    """Yield ChatGPT answers built from the sample, with random bullets per company (endless without count)."""
+    rng = random.Random(seed)
+    header = (f"Load Test | Austin, TX | load@example.com | 555-0100\n\n"
+              f"PROFESSIONAL SUMMARY\n{SAMPLE_SUMMARY}\n\nSKILLS\n" + '\n'.join(SAMPLE_SKILLS))
+
+    for _ in (range(count) if count is not None else itertools.count()):
+        blocks = []
+        for company, dates, role, location in SAMPLE_EXPERIENCES:
+            bullet_lines = [
+                f"• {rng.choice(BULLET_VERBS)} {rng.choice(BULLET_OBJECTS)}"
+                for _ in range(rng.randint(*bullets))
+            ]
+            blocks.append('\n'.join([f"{company} | {dates} | {role} | {location}", *bullet_lines]))
+        # The parser keeps the last company once the next section heading is reached
+        yield f"{header}\n\nPROFESSIONAL EXPERIENCE\n" + '\n\n'.join(blocks) + "\n\nEDUCATION\n"
+
+
+_template = None
+
+
+def _init_worker(template_folder, template_doc, quiet):
+    """Load the template once per worker process (or once for all threads)."""
+    global _template
+    from template_registry import TemplateRegistry
+
+    if quiet:
+        # The pipeline prints every stage; at load that is noise (and contention)
+        sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+    registry = TemplateRegistry()
+    registry.register('loadtest', template_folder, template_doc)
+    _template = registry.get('loadtest')
+
+
+def run_one(index, text, convert, scheduled=None):
+    """Generate (and convert) one resume; returns a sample dict.
+
+    scheduled: monotonic arrival time in open-loop mode; the wait until the
+    job started is reported as the 'queue' stage.
+    """
+    started = time.monotonic()
+    sample = {'ok': False, 'error': None, 'stages': {}, 'started': started}
+    if scheduled is not None:
+        sample['stages']['queue'] = max(0.0, started - scheduled)
+
+    config = {
+        'personal': {'name': f"Load Test {index}", 'email': f"load{index}@example.com",
+                     'phone': "555-0100", 'location': "Austin, TX"},
+        'company': COMPANIES,
+        'chatgpt_text': text,
+        'folder_name': f"{OUTPUT_FOLDER}/{index:06d}",
+    }
+    try:
+        processor = _template.processor(config=config)
+        docx_path = processor.run()
+        if not docx_path:
+            sample['error'] = 'generation failed'
+        elif convert:
+            from pdf_converter import convert_docx_to_pdf
+            if convert_docx_to_pdf(docx_path, metrics=processor.metrics):
+                sample['ok'] = True
+            else:
+                sample['error'] = 'PDF conversion failed'
+        else:
+            sample['ok'] = True
+        sample['stages'].update(processor.timings)
+        if 'parse' in processor.metrics:
+            sample['stages']['parse'] = processor.metrics['parse']['seconds']
+    except Exception as e:
+        sample['error'] = f"{type(e).__name__}: {e}"
+
+    finished = time.monotonic()
+    sample['finished'] = finished
+    sample['service'] = finished - started
+    sample['latency'] = finished - (scheduled if scheduled is not None else started)
+    return sample
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of values (p in 0..100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _distribution(values):
+    stats = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+    stats['mean'] = sum(values) / len(values) if values else None
+    stats['max'] = max(values) if values else None
+    return stats
+
+
+def summarize(samples, wall_seconds, level):
+    """Throughput, error rate and latency percentiles of one level."""
+    completed = [s for s in samples if s['ok']]
+    errors = {}
+    for sample in samples:
+        if not sample['ok']:
+            errors[sample['error']] = errors.get(sample['error'], 0) + 1
+
+    stage_values = {}
+    for sample in completed:
+        for stage, seconds in sample['stages'].items():
+            stage_values.setdefault(stage, []).append(seconds)
+
+    return dict(level, **{
+        'jobs': len(samples),
+        'completed': len(completed),
+        'errors': len(samples) - len(completed),
+        'error_rate': round((len(samples) - len(completed)) / len(samples), 4) if samples else 0.0,
+        'errors_by_type': errors,
+        'wall_seconds': round(wall_seconds, 3),
+        'throughput_per_min': round(len(completed) / wall_seconds * 60, 2) if wall_seconds else 0.0,
+        'latency': _distribution([s['latency'] for s in completed]),
+        'service': _distribution([s['service'] for s in completed]),
+        'stages': {stage: _distribution(values) for stage, values in stage_values.items()},
+    })
+
+
+class LoadTest:
+    """Runs levels against one template with one worker model."""
+
+    def __init__(self, template_folder=DEFAULT_TEMPLATE_FOLDER, template_doc=DEFAULT_TEMPLATE_DOC,
+                 workers='thread', convert=True, quiet=True, seed=0, bullets=(2, 8)):
+        self.template_folder = template_folder
+        self.template_doc = template_doc
+        self.workers = workers
+        self.convert = convert
+        self.quiet = quiet
+        self.seed = seed
+        self.bullets = bullets
+        self._next_index = 0
+
+    def _executor(self, size):
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        init_args = (self.template_folder, self.template_doc, self.quiet)
+        if self.workers == 'process':
+            return ProcessPoolExecutor(max_workers=size, initializer=_init_worker, initargs=init_args)
+        # Threads share this process: load the template once, silence stdout for the run
+        if _template is None:
+            _init_worker(self.template_folder, self.template_doc, False)
+        return ThreadPoolExecutor(max_workers=size)
+
+    def _inputs(self, count=None):
+        """(job index, text) pairs; indexes keep increasing across levels so outputs never collide."""
+        texts = synthetic_inputs(count, seed=self.seed + self._next_index, bullets=self.bullets)
+        for text in texts:
+            index = self._next_index
+            self._next_index += 1
+            yield index, text
+
+    def run_concurrency(self, concurrency, jobs=None, duration=None, warmup=None):
+        """Closed loop: keep `concurrency` jobs in flight until jobs/duration is reached."""
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        jobs = jobs if jobs is not None else (None if duration else 50)
+        warmup = concurrency if warmup is None else warmup
+        samples = []
+        with self._executor(concurrency) as executor, _quiet(self.quiet and self.workers == 'thread'):
+            self._warmup(executor, warmup)
+            inputs = self._inputs(jobs)
+            started = time.monotonic()
+            deadline = started + duration if duration else None
+
+            def submit():
+                if deadline and time.monotonic() >= deadline:
+                    return None
+                item = next(inputs, None)
+                if item is None:
+                    return None
+                return executor.submit(run_one, item[0], item[1], self.convert)
+
+            pending = {f for f in (submit() for _ in range(concurrency)) if f}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    samples.append(future.result())
+                    following = submit()
+                    if following:
+                        pending.add(following)
+            wall = time.monotonic() - started
+
+        return summarize(samples, wall, {'mode': 'concurrency', 'concurrency': concurrency})
+
+    def run_rate(self, rate, jobs=None, duration=None, max_workers=32, poisson=False, warmup=None):
+        """Open loop: start a job every 1/rate seconds (exponential gaps with poisson)."""
+        jobs = jobs if jobs is not None else int(rate * (duration or 30))
+        warmup = min(max_workers, 2) if warmup is None else warmup
+        rng = random.Random(self.seed)
+        samples = []
+        with self._executor(max_workers) as executor, _quiet(self.quiet and self.workers == 'thread'):
+            self._warmup(executor, warmup)
+            futures = []
+            arrivals = []
+            started = time.monotonic()
+            arrival = started
+            for index, text in self._inputs(jobs):
+                if duration and arrival - started >= duration:
+                    break
+                delay = arrival - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(executor.submit(run_one, index, text, self.convert, arrival))
+                arrivals.append(arrival)
+                arrival += rng.expovariate(rate) if poisson else 1.0 / rate
+            samples = [future.result() for future in futures]
+            wall = max(s['finished'] for s in samples) - started if samples else 0.0
+
+        level = {'mode': 'rate', 'rate_per_s': rate, 'max_workers': max_workers,
+                 'arrivals': 'poisson' if poisson else 'uniform'}
+        result = summarize(samples, wall, level)
+
+        # Rates between the first and last arrival / completion: the last job's latency
+        # and the randomness of Poisson gaps must not read as falling behind
+        finishes = sorted(s['finished'] for s in samples if s['ok'])
+        if len(arrivals) > 1:
+            result['offered_per_min'] = round((len(arrivals) - 1) / (arrivals[-1] - arrivals[0]) * 60, 2)
+        if len(finishes) > 1 and finishes[-1] > finishes[0]:
+            result['throughput_per_min'] = round((len(finishes) - 1) / (finishes[-1] - finishes[0]) * 60, 2)
+        return result
+
+    def _warmup(self, executor, count):
+        """Untimed jobs so first-use costs (imports, template load) stay out of the numbers."""
+        futures = [executor.submit(run_one, index, text, self.convert) for index, text in self._inputs(count)]
+        for future in futures:
+            future.result()
+
+
+class _quiet:
+    """Send stdout to devnull while threads run the (chatty) pipeline."""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self._stdout = None
+
+    def __enter__(self):
+        if self.enabled:
+            self._stdout = sys.stdout
+            sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+        return self
+
+    def __exit__(self, *exc):
+        if self._stdout is not None:
+            sys.stdout.close()
+            sys.stdout = self._stdout
+        return False
+
+
+def find_saturation(levels):
+    """Last level before scaling stops (concurrency) or the first level that falls behind (rate)."""
+    if not levels:
+        return None
+    if levels[0]['mode'] == 'rate':
+        for level in levels:
+            achieved = level['throughput_per_min'] / 60
+            offered = level.get('offered_per_min', level['rate_per_s'] * 60) / 60
+            if achieved < offered * MIN_RATE_FRACTION:
+                return {'rate_per_s': level['rate_per_s'], 'achieved_per_s': round(achieved, 3),
+                        'reason': f"completes {achieved:.2f}/s of {offered:.2f}/s offered"}
+        return None
+
+    for current, following in zip(levels, levels[1:]):
+        gain = (following['throughput_per_min'] / current['throughput_per_min'] - 1
+                if current['throughput_per_min'] else 0.0)
+        if gain < MIN_SCALING_GAIN:
+            return {'concurrency': current['concurrency'], 'throughput_per_min': current['throughput_per_min'],
+                    'reason': f"concurrency {following['concurrency']} adds {gain:+.0%} throughput"}
+    return None
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.1f}" if seconds is not None else "-"
+
+
+def format_table(levels, saturation=None):
+    """Text table: one row per level, then per-stage percentiles of each level."""
+    header = (f"{'level':>10} {'jobs':>6} {'err%':>6} {'per min':>9} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    lines = [header, '-' * len(header)]
+    for level in levels:
+        name = (f"c={level['concurrency']}" if level['mode'] == 'concurrency'
+                else f"r={level['rate_per_s']:g}/s")
+        latency = level['latency']
+        lines.append(f"{name:>10} {level['jobs']:>6} {level['error_rate'] * 100:>5.1f}% "
+                     f"{level['throughput_per_min']:>9.1f} {_ms(latency['p50']):>8} "
+                     f"{_ms(latency['p95']):>8} {_ms(latency['p99']):>8}")
+
+    for level in levels:
+        name = (f"concurrency {level['concurrency']}" if level['mode'] == 'concurrency'
+                else f"rate {level['rate_per_s']:g}/s")
+        lines.append(f"\nStages at {name} (ms, p50 / p95 / p99):")
+        for stage, stats in level['stages'].items():
+            lines.append(f"  {stage:<12} {_ms(stats['p50']):>7} / {_ms(stats['p95']):>7} / {_ms(stats['p99']):>7}")
+        for error, count in level['errors_by_type'].items():
+            lines.append(f"  ❌ {count} × {error}")
+
+    if saturation:
+        point = (f"concurrency {saturation['concurrency']}" if 'concurrency' in saturation
+                 else f"{saturation['rate_per_s']:g} jobs/s")
+        lines.append(f"\n📈 Saturation at {point} ({saturation['reason']})")
+    elif len(levels) > 1:
+        lines.append("\n📈 No saturation within the tested levels")
+    return '\n'.join(lines)
+
+
+def main():
+    """Command line interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Load test the resume generation pipeline')
+    parser.add_argument('--concurrency', type=int, default=1, help='Jobs in flight (closed loop)')
+    parser.add_argument('--rate', type=float, help='Arrivals per second (open loop) instead of fixed concurrency')
+    parser.add_argument('--poisson', action='store_true', help='Exponential gaps between arrivals')
+    parser.add_argument('--max-workers', type=int, default=32, help='Worker pool size in rate mode')
+    parser.add_argument('--sweep', help='Comma-separated levels (concurrencies, or rates with --rate)')
+    parser.add_argument('--jobs', type=int, help='Jobs per level (default 50, or rate x duration)')
+    parser.add_argument('--duration', type=float, help='Seconds per level instead of a job count')
+    parser.add_argument('--warmup', type=int, help='Untimed jobs per level (default: one per worker)')
+    parser.add_argument('--workers', choices=['thread', 'process'], default='thread',
+                        help='Run jobs on threads of this process or on worker processes')
+    parser.add_argument('--template-folder', default=DEFAULT_TEMPLATE_FOLDER, help='Extracted template folder')
+    parser.add_argument('--template-doc', default=DEFAULT_TEMPLATE_DOC, help='Tagged document.xml')
+    parser.add_argument('--bullets', default='2-8', help='Bullets per company, min-max')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic inputs')
+    parser.add_argument('--no-pdf', action='store_true', help='Skip PDF conversion')
+    parser.add_argument('--json', help='Also write the report to this JSON file')
+    parser.add_argument('--verbose', action='store_true', help='Keep the pipeline output')
+    parser.add_argument('--keep-output', action='store_true', help=f'Keep output/{OUTPUT_FOLDER}/')
+    args = parser.parse_args()
+
+    low, high = (int(part) for part in args.bullets.split('-'))
+    load_test = LoadTest(args.template_folder, args.template_doc, workers=args.workers,
+                         convert=not args.no_pdf, quiet=not args.verbose, seed=args.seed, bullets=(low, high))
+
+    if args.sweep:
+        values = [float(v) if args.rate else int(v) for v in args.sweep.split(',')]
+    else:
+        values = [args.rate if args.rate else args.concurrency]
+
+    levels = []
+    try:
+        for value in values:
+            mode = f"{value:g} jobs/s" if args.rate else f"concurrency {value}"
+            print(f"⏱ Running {mode} ...")
+            if args.rate:
+                level = load_test.run_rate(value, args.jobs, args.duration, args.max_workers,
+                                           args.poisson, args.warmup)
+            else:
+                level = load_test.run_concurrency(value, args.jobs, args.duration, args.warmup)
+            levels.append(level)
+            print(f"   {level['completed']}/{level['jobs']} ok, {level['throughput_per_min']:.1f}/min, "
+                  f"p95 {_ms(level['latency']['p95'])}ms")
+    finally:
+        if not args.keep_output:
+            shutil.rmtree(os.path.join("output", OUTPUT_FOLDER), ignore_errors=True)
+
+    saturation = find_saturation(levels) if len(levels) > 1 else None
+    print()
+    print(format_table(levels, saturation))
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        report = {
+            'created_at': time.time(),
+            'workers': args.workers,
+            'convert': not args.no_pdf,
+            'template': args.template_folder,
+            'cpu_count': os.cpu_count(),
+            'levels': levels,
+            'saturation': saturation,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written: {args.json}")
+
+    return 1 if any(level['errors'] for level in levels) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,39 @@
 #!/usr/bin/env python3
 """
 Resume Builder - GUI Launcher
-Usage: python main.py
+Usage:
+    python main.py                       # launch the GUI
+    python main.py --watch               # regenerate on every input/template change
+    python main.py --watch --no-pdf --folder draft
+    python main.py --watch --metrics-port 9464   # Prometheus metrics while watching
 """
 import sys
 import os
 
+def parse_args(argv=None):
+    """Command line options"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Resume Builder')
+    parser.add_argument('--watch', action='store_true',
+                        help='Watch input files and the template and regenerate on change')
+    parser.add_argument('--folder', default='watch', help='Output folder name in watch mode')
+    parser.add_argument('--template-folder', default='input/template1', help='Extracted template folder')
+    parser.add_argument('--template-doc', default='input/document.xml', help='Template document.xml')
+    parser.add_argument('--interval', type=float, default=0.5, help='Poll interval in seconds')
+    parser.add_argument('--debounce', type=float, default=1.0,
+                        help='Seconds without changes before regenerating')
+    parser.add_argument('--no-pdf', action='store_true', help='Skip PDF conversion in watch mode')
+    parser.add_argument('--metrics-port', type=int,
+                        help='Serve Prometheus metrics on 127.0.0.1:PORT/metrics in watch mode')
+    parser.add_argument('--metrics-file',
+                        help='Write Prometheus metrics to this file after every regeneration')
+    return parser.parse_args(argv)
+
+
 def main():
-    """Launch the Resume Builder GUI"""
+    """Launch the Resume Builder GUI (or watch mode)"""
+    args = parse_args()
     try:
         # Check if input directory exists
         if not os.path.exists("input"):
@@ -16,6 +42,29 @@ def main():
             print("✅ Created: input/")
             print("💡 Please extract your DOCX template to: input/template1/")
         
+        # Remove working folders left behind by crashed runs
+        from workspace import get_workspace_manager
+        get_workspace_manager()
+        
+        if args.watch:
+            from watch import WatchSession
+            metrics = None
+            if args.metrics_port is not None or args.metrics_file:
+                import metrics
+                if args.metrics_port is not None:
+                    metrics.serve(args.metrics_port)
+            WatchSession(
+                template_doc=args.template_doc,
+                template_folder=args.template_folder,
+                folder_name=args.folder,
+                convert=not args.no_pdf,
+                interval=args.interval,
+                debounce=args.debounce,
+                metrics=metrics,
+                metrics_file=args.metrics_file,
+            ).run()
+            return 0
+        
         # Launch GUI
         print("🚀 Launching Resume Builder GUI...")
         from gui import ResumeBuilderGUI
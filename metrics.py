@@ -0,0 +1,351 @@
+"""
+Prometheus metrics for long-running generation (batch, watch mode)
+
+A small, dependency-free registry of counters, gauges and histograms that
+renders the Prometheus text exposition format (version 0.0.4). Metrics are
+exposed either on a local HTTP endpoint (serve) or written to a file for the
+node_exporter textfile collector (write_textfile).
+
+Jobs are recorded from their per-job metrics dict (processor.metrics) with
+observe_job, so the pipeline itself does not depend on this module. Cache
+counters are read from the cache objects when the metrics are rendered.
+"""
+import math
+import os
+import threading
+import time
+
+# Latency buckets (seconds): sub-millisecond parses up to multi-minute conversions
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# Child process peak RSS buckets (bytes): 32 MB .. 4 GB
+RSS_BUCKETS = tuple(2 ** power * 1024 * 1024 for power in range(5, 13))
+# PDF size buckets (bytes): 16 KB .. 16 MB
+PDF_SIZE_BUCKETS = tuple(2 ** power * 1024 for power in range(4, 15))
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    """Escape a label value."""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class _Metric:
+    """Base class: one metric family with a fixed set of label names."""
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            # Unlabeled metrics are exported (as zero) before their first update
+            self._values[()] = self._zero()
+
+    def _zero(self):
+        return 0
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        """[(suffix, [(label, value) ...], value)] of this family."""
+        with self._lock:
+            return [('', list(zip(self.labelnames, key)), value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError(f"{self.name}: counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed buckets."""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=STAGE_BUCKETS):
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        super().__init__(name, documentation, labelnames)
+
+    def _zero(self):
+        return [[0] * len(self.buckets), 0.0, 0]
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = self._zero()
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                labels = list(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    samples.append(('_bucket', labels + [('le', _format_value(float(bound)))], cumulative))
+                samples.append(('_sum', labels, total))
+                samples.append(('_count', labels, count))
+        return samples
+
+
+class MetricsRegistry:
+    """Named metric families plus collectors that are read at render time."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=STAGE_BUCKETS):
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, key, collect):
+        """Call collect() on every render; it returns metric families (e.g. from cache stats).
+
+        Registering again under the same key replaces the previous collector.
+        """
+        with self._lock:
+            self._collectors[key] = collect
+
+    def unregister_collector(self, key):
+        with self._lock:
+            self._collectors.pop(key, None)
+
+    def render(self):
+        """All metrics in the Prometheus text format."""
+        with self._lock:
+            families = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+        for collect in collectors:
+            try:
+                families.extend(collect())
+            except Exception as e:
+                print(f"⚠ Metrics collector failed: {e}")
+
+        lines = []
+        for family in families:
+            lines.extend(family.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+JOBS = REGISTRY.counter('resume_jobs_total', 'Generation jobs by outcome.', ['outcome'])
+JOBS_IN_PROGRESS = REGISTRY.gauge('resume_jobs_in_progress', 'Jobs currently being generated.')
+QUEUE_DEPTH = REGISTRY.gauge('resume_queue_depth', 'Jobs waiting to be generated.')
+STAGE_SECONDS = REGISTRY.histogram(
+    'resume_stage_duration_seconds', 'Wall time of each pipeline stage.', ['stage'])
+PARSES = REGISTRY.counter(
+    'resume_parses_total', 'Parsed inputs by source (text, cache or structured).', ['source'])
+CONVERSIONS = REGISTRY.counter(
+    'resume_conversions_total', 'PDF conversion attempts by backend and outcome.', ['backend', 'outcome'])
+CONVERSION_RETRIES = REGISTRY.counter('resume_conversion_retries_total', 'Retried conversion attempts.')
+CONVERSION_TIMEOUTS = REGISTRY.counter(
+    'resume_conversion_timeouts_total', 'Conversion child processes killed on timeout.', ['backend'])
+BACKEND_SKIPPED = REGISTRY.counter(
+    'resume_conversion_backend_skipped_total', 'Backends skipped because their circuit breaker was open.',
+    ['backend'])
+CHILD_RSS = REGISTRY.histogram(
+    'resume_child_peak_rss_bytes', 'Peak RSS of conversion child processes.', ['backend'], RSS_BUCKETS)
+CHILD_CPU_SECONDS = REGISTRY.counter(
+    'resume_child_cpu_seconds_total', 'CPU time of conversion child processes.', ['backend'])
+CONVERSION_SECONDS = REGISTRY.histogram(
+    'resume_conversion_duration_seconds', 'PDF conversion time by export preset.', ['preset'])
+PDF_BYTES = REGISTRY.histogram(
+    'resume_pdf_size_bytes', 'Size of generated PDFs by export preset.', ['preset'], PDF_SIZE_BUCKETS)
+PRESET_IGNORED = REGISTRY.counter(
+    'resume_pdf_preset_ignored_total', 'PDFs converted by a backend that ignored the export preset.',
+    ['backend', 'preset'])
+LAST_JOB = REGISTRY.gauge('resume_last_job_timestamp_seconds', 'Unix time the last job finished.')
+
+
+def observe_job(job_metrics, outcome):
+    """Record one finished job from its processor.metrics dict ('done' or 'failed')."""
+    JOBS.inc(outcome=outcome)
+    LAST_JOB.set(time.time())
+    if not job_metrics:
+        return
+
+    for stage, seconds in job_metrics.get('timings', {}).items():
+        STAGE_SECONDS.observe(seconds, stage=stage)
+
+    parse = job_metrics.get('parse')
+    if parse:
+        STAGE_SECONDS.observe(parse['seconds'], stage='parse')
+        PARSES.inc(source=parse['source'])
+
+    conversion = job_metrics.get('conversion')
+    if not conversion:
+        return
+    if conversion.get('backend'):
+        CONVERSIONS.inc(backend=conversion['backend'], outcome='success')
+        preset = conversion.get('preset', 'default')
+        if 'convert' in job_metrics.get('timings', {}):
+            CONVERSION_SECONDS.observe(job_metrics['timings']['convert'], preset=preset)
+        if conversion.get('pdf_bytes') is not None:
+            PDF_BYTES.observe(conversion['pdf_bytes'], preset=preset)
+        if conversion.get('preset_ignored'):
+            PRESET_IGNORED.inc(backend=conversion['backend'], preset=preset)
+    for backend, count in conversion.get('failures', {}).items():
+        CONVERSIONS.inc(count, backend=backend, outcome='failure')
+    if conversion.get('retries'):
+        CONVERSION_RETRIES.inc(conversion['retries'])
+    for backend in conversion.get('skipped', []):
+        BACKEND_SKIPPED.inc(backend=backend)
+    for child in conversion.get('children', []):
+        if child.get('timed_out'):
+            CONVERSION_TIMEOUTS.inc(backend=child['backend'])
+        if child.get('peak_rss_kb') is not None:
+            CHILD_RSS.observe(child['peak_rss_kb'] * 1024, backend=child['backend'])
+        if child.get('cpu_seconds') is not None:
+            CHILD_CPU_SECONDS.inc(child['cpu_seconds'], backend=child['backend'])
+
+
+def parse_cache_collector(parse_cache):
+    """Collector exposing a ParseCache's counters (see parse_cache.py).
+
+    Only the in-memory counters are read: scrapes run on the server thread and
+    the cache's SQLite connection belongs to the thread that opened it.
+    """
+    def collect():
+        hits, misses = parse_cache.hits, parse_cache.misses
+        lookups = Counter('resume_parse_cache_lookups_total', 'Parse cache lookups by result.', ['result'])
+        lookups.inc(hits, result='hit')
+        lookups.inc(misses, result='miss')
+        evictions = Counter('resume_parse_cache_evictions_total', 'Parse cache entries evicted.')
+        evictions.inc(parse_cache.evictions)
+        ratio = Gauge('resume_parse_cache_hit_ratio', 'Parse cache hits / lookups in this process.')
+        ratio.set(hits / (hits + misses) if hits + misses else 0.0)
+        return [lookups, evictions, ratio]
+    return collect
+
+
+def template_registry_collector(templates):
+    """Collector exposing a TemplateRegistry's counters (see template_registry.py)."""
+    def collect():
+        stats = templates.stats()
+        loads = Counter('resume_template_loads_total', 'Templates loaded, by reason.', ['reason'])
+        loads.inc(stats['loads'] - stats['reloads'], reason='first_use')
+        loads.inc(stats['reloads'], reason='changed')
+        evictions = Counter('resume_template_cache_evictions_total', 'Templates evicted from the cache.')
+        evictions.inc(stats['evictions'])
+        cached = Gauge('resume_template_cache_bytes', 'Memory held by cached templates.')
+        cached.set(stats['bytes'])
+        return [loads, evictions, cached]
+    return collect
+
+
+def write_textfile(path, registry=REGISTRY):
+    """Write the metrics for the node_exporter textfile collector (atomically)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(registry.render())
+    # The collector must never read a half-written file
+    os.replace(temp_path, path)
+
+
+def serve(port, address='127.0.0.1', registry=REGISTRY):
+    """Serve GET /metrics on a background thread; returns the server (call .shutdown() to stop)."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Scrapes every few seconds would flood the console
+            pass
+
+    server = ThreadingHTTPServer((address, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    print(f"📈 Metrics on http://{address}:{server.server_address[1]}/metrics")
+    return server
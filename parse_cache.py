@@ -0,0 +1,185 @@
+"""
+Parse cache - parse results on disk, keyed by input text and company list
+
+Reruns and variant fan-outs parse the same ChatGPT text again and again. The
+result depends on the text, the configured company list (order matters: the
+first matching company wins) and the parser itself, so the key is a SHA-256 of
+(PARSER_VERSION, text, companies). Values are compressed ParsedResume records
+(see records.py) in SQLite; the least recently used entries are evicted once
+the cache grows past its size limit. The total size is kept up to date by
+triggers, so checking it is a single-row read however large the cache gets.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+from parser import PARSER_VERSION, parse_chatgpt_output
+from records import ParsedResume
+
+DEFAULT_DB_PATH = os.path.join("output", "parse_cache.db")
+DEFAULT_MAX_MB = int(os.environ.get('RESUME_PARSE_CACHE_MB', '64'))
+
+# Evict down to this fraction of the limit, so eviction does not run on every put
+EVICT_TO = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parses (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS parses_last_used ON parses (last_used, size);
+CREATE TABLE IF NOT EXISTS cache_size (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+"""
+
+# Keep cache_size.bytes equal to SUM(parses.size), whichever process writes
+SIZE_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS parses_size_insert AFTER INSERT ON parses BEGIN
+        UPDATE cache_size SET bytes = bytes + NEW.size WHERE id = 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS parses_size_update AFTER UPDATE OF size ON parses BEGIN
+        UPDATE cache_size SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS parses_size_delete AFTER DELETE ON parses BEGIN
+        UPDATE cache_size SET bytes = bytes - OLD.size WHERE id = 0;
+    END""",
+)
+
+
+def cache_key(text, companies):
+    """Cache key for one parse."""
+    digest = hashlib.sha256()
+    digest.update(f"parser-v{PARSER_VERSION}\0".encode('utf-8'))
+    digest.update(json.dumps(list(companies), ensure_ascii=False).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Size-bounded SQLite cache in front of parse_chatgpt_output."""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, max_mb=DEFAULT_MAX_MB):
+        self.db_path = db_path
+        self.max_bytes = max_mb * 1024 * 1024
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # Caches created before the running total get it (summed once) with the triggers
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO cache_size (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM parses"
+            )
+            for statement in SIZE_TRIGGERS:
+                self.conn.execute(statement)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, text, input_data=None):
+        """Cached parse of text as a parse_chatgpt_output dict, or None."""
+        key = cache_key(text, self._companies(input_data))
+        row = self.conn.execute("SELECT value FROM parses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.conn.execute("UPDATE parses SET last_used = ? WHERE key = ?", (time.time(), key))
+        data = ParsedResume.loads(zlib.decompress(row[0])).to_dict()
+        # Education is copied from the input data, not parsed, so it is not part of the key
+        data['education'] = input_data.get('education', {}) if input_data else {}
+        return data
+
+    def put(self, text, input_data, parsed):
+        """Store a parse result."""
+        key = cache_key(text, self._companies(input_data))
+        record = ParsedResume.from_dict(dict(parsed, education={}))
+        value = zlib.compress(record.dumps())
+        now = time.time()
+        # An upsert, not INSERT OR REPLACE: REPLACE deletes do not fire the size triggers
+        self.conn.execute(
+            "INSERT INTO parses (key, value, size, created_at, last_used) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+            "last_used = excluded.last_used",
+            (key, value, len(value), now, now)
+        )
+        self._evict()
+
+    def parse(self, text, input_data=None):
+        """parse_chatgpt_output, answered from the cache when possible."""
+        data = self.get(text, input_data)
+        if data is None:
+            data = parse_chatgpt_output(text, input_data)
+            self.put(text, input_data, data)
+        return data
+
+    def _companies(self, input_data):
+        return input_data.get('company', []) if input_data else []
+
+    def _evict(self):
+        """Drop least recently used entries while the cache is over its limit."""
+        total = self.size()
+        if total <= self.max_bytes:
+            return
+
+        target = total - int(self.max_bytes * EVICT_TO)
+        freed = 0
+        victims = []
+        for key, size in self.conn.execute("SELECT key, size FROM parses ORDER BY last_used"):
+            victims.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        self.conn.executemany("DELETE FROM parses WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def size(self):
+        """Total size of the stored values in bytes."""
+        return self.conn.execute("SELECT bytes FROM cache_size WHERE id = 0").fetchone()[0]
+
+    def stats(self):
+        """Hit/miss counters of this process plus what is on disk."""
+        entries = self.conn.execute("SELECT COUNT(*) FROM parses").fetchone()[0]
+        size = self.size()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': size,
+        }
+
+    def clear(self):
+        """Remove every entry."""
+        self.conn.execute("DELETE FROM parses")
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+
+def format_stats(stats):
+    """One-line summary for run reports."""
+    return (f"🗃 Parse cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%}), {stats['evictions']} evicted, "
+            f"{stats['entries']} entries / {stats['bytes'] / 1024:.0f} KB")
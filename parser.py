@@ -1,30 +1,30 @@
 """
 Parse ChatGPT output into structured data
+
+Each section (personal line, summary, skills, experience) is parsed by its own
+function that also reports how many lines it read. IncrementalParser uses that
+to re-parse only the sections whose lines changed since the previous call.
 """
 
+import copy
 import json
 
+# Bump when parsing rules change (invalidates cached parse results, see parse_cache.py)
+PARSER_VERSION = 1
 
-def parse_chatgpt_output(text, input_data=None):
-    
-    lines = [line.strip() for line in text.strip().split('\n')]
-    
-    # Initialize data structure
-    data = {
-        'personal': {},
-        'summary': '',
-        'skills': {},
-        'experiences': [],
-        'education': {}
-    }
 
-    data['education'] = input_data.get('education', {}) if input_data else {}
-    
-    # Parse personal info (pipe-separated format)
+def _parse_personal(lines):
+    """Personal info from the pipe-separated lines before the first empty line.
+
+    Returns:
+        (personal info dict, number of lines read)
+    """
     # Collect all pipe-separated values from initial lines until we hit empty lines
     personal_parts = []
-    for line in lines:
+    examined = len(lines)
+    for i, line in enumerate(lines):
         if not line:  # Stop at first empty line
+            examined = i + 1
             break
         personal_parts.extend([p.strip() for p in line.split('|')])
     
@@ -52,54 +52,146 @@ def parse_chatgpt_output(text, input_data=None):
     if len(remaining_parts) >= 2:
         personal_info['location'] = remaining_parts[1]
     
-    data['personal'] = personal_info
+    return personal_info, examined
+
+
+def _parse_summary(lines):
+    """Summary from the lines after the PROFESSIONAL SUMMARY header."""
+    # Find where summary ends (next section)
+    summary_lines = []
+    started = False
+    examined = len(lines)
+    for i, line in enumerate(lines):
+        # Skip empty lines until we find actual content
+        if not line:
+            if started:
+                examined = i + 1
+                break
+            continue
+        # Stop at next section header
+        summary_lines.append(line)
+        started = True
+        if 'SKILLS' in line.upper():
+            examined = i + 1
+            break
+    return ' '.join(summary_lines), examined
+
+
+def _parse_skills(lines):
+    """{category: skills} from the lines after the SKILLS header."""
+    skills = {}
+    examined = len(lines)
+    # Parse all skill lines until next section
+    for i, line in enumerate(lines):
+        if not line:
+            continue
+        if 'PROFESSIONAL EXPERIENCE' in line.upper() or 'EXPERIENCE' in line.upper():
+            examined = i + 1
+            break
+        if ':' in line:
+            parts = line.split(':', 1)
+            category = parts[0].strip()
+            skills_list = parts[1].strip()
+            if len(skills_list) < 5:
+                continue
+            skills[category] = skills_list
+    return skills, examined
+
+
+def _parse_experiences(lines, companies_to_extract):
+    """Experiences from the lines after the PROFESSIONAL EXPERIENCE header."""
+    experiences = []
+    current_exp = None
+    current_company = None
+    empty_line_count = 0
+    examined = len(lines)
     
-    # Find summary section
+    for i, line in enumerate(lines):
+        # Check if we've reached the Education section
+        if 5 <= len(line.strip()) <= 30:
+            # End of experience section
+            if current_exp and current_exp['bullets']:
+                experiences.append(current_exp)
+            examined = i + 1
+            break
+        
+        # Track consecutive empty lines
+        if not line:
+            empty_line_count += 1
+            continue
+        
+        # Check if line contains a company name from our list
+        is_company_line = False
+        for company in companies_to_extract:
+            if company.lower() in line.lower():
+                if current_exp != None:
+                    if current_exp['company'] == company:
+                        is_company_line = False
+                    else:
+                        is_company_line = True
+                        current_company = company
+                        break
+                else:
+                    is_company_line = True
+                    current_company = company
+                    break
+        
+        # If we found a company name, save previous experience and start new one
+        if is_company_line:
+            if current_exp and current_exp['bullets']:
+                experiences.append(current_exp)
+            
+            # Parse the company line: Company | Dates | Role | Location
+            parts = [p.strip() for p in line.split('|')]
+            current_exp = {
+                'company': current_company,
+                'dates': parts[1] if len(parts) > 1 else '',
+                'role': parts[2] if len(parts) > 2 else '',
+                'location': parts[3] if len(parts) > 3 else '',
+                'bullets': []
+            }
+            empty_line_count = 0
+        
+        # Check if we're transitioning to a new section (multiple empty lines before non-company, non-bullet line)
+        elif empty_line_count > 1 and current_exp and line and not line[0].isalpha() and not any(company.lower() in line.lower() for company in companies_to_extract):
+            # This might be end of experiences section, save and stop
+            if current_exp['bullets']:
+                experiences.append(current_exp)
+                current_exp = None
+            examined = i + 1
+            break
+        
+        # Add any non-empty, non-company line as a bullet point
+        elif current_exp and line:
+            # Remove leading bullet character if it exists (•, -, *, +, etc.)
+            # If no symbol, use the line as-is
+            bullet_text = line.strip()
+            if bullet_text and bullet_text[0] in '•-*+':
+                bullet_text = bullet_text[1:].strip()
+            
+            # Add as bullet point (works with or without symbols)
+            if bullet_text:
+                current_exp['bullets'].append(bullet_text)
+            
+            empty_line_count = 0
+    
+    return experiences, examined
+
+
+def _section_starts(lines):
+    """First line index of the summary, skills and experience sections (-1 if missing)."""
     summary_start = -1
     for i, line in enumerate(lines):
         if 'PROFESSIONAL SUMMARY' in line.upper():
             summary_start = i + 1
             break
     
-    if summary_start != -1:
-        # Find where summary ends (next section)
-        summary_lines = []
-        started = False
-        for line in lines[summary_start:]:
-            # Skip empty lines until we find actual content
-            if not line:
-                if started:
-                    break
-                continue
-            # Stop at next section header
-            summary_lines.append(line)
-            started = True
-            if 'SKILLS' in line.upper():
-                break
-        data['summary'] = ' '.join(summary_lines)
-    
-    # Find skills section
     skills_start = -1
     for i, line in enumerate(lines):
         if 'SKILLS' in line.upper():
             skills_start = i + 1
             break
     
-    if skills_start != -1:
-        # Parse all skill lines until next section
-        for line in lines[skills_start:]:
-            if not line:
-                continue
-            if 'PROFESSIONAL EXPERIENCE' in line.upper() or 'EXPERIENCE' in line.upper():
-                break
-            if ':' in line:
-                parts = line.split(':', 1)
-                category = parts[0].strip()
-                skills_list = parts[1].strip()
-                if len(skills_list) < 5:
-                    continue
-                data['skills'][category] = skills_list
-    
     # Find experiences (search after skills section)
     experience_start = -1
     search_start = skills_start if skills_start != -1 else 0
@@ -108,80 +200,105 @@ def parse_chatgpt_output(text, input_data=None):
             experience_start = i + 1
             break
     
+    return summary_start, skills_start, experience_start
+
+
+def _split_lines(text):
+    return [line.strip() for line in text.strip().split('\n')]
+
+
+def parse_chatgpt_output(text, input_data=None):
+    
+    lines = _split_lines(text)
+    
+    # Initialize data structure
+    data = {
+        'personal': {},
+        'summary': '',
+        'skills': {},
+        'experiences': [],
+        'education': {}
+    }
+
+    data['education'] = input_data.get('education', {}) if input_data else {}
+    
+    # Parse personal info (pipe-separated format)
+    data['personal'], _ = _parse_personal(lines)
+    
+    summary_start, skills_start, experience_start = _section_starts(lines)
+    
+    if summary_start != -1:
+        data['summary'], _ = _parse_summary(lines[summary_start:])
+    
+    if skills_start != -1:
+        data['skills'], _ = _parse_skills(lines[skills_start:])
+    
     if experience_start != -1:
         # Get company list from input_data if provided
-        companies_to_extract = []
         companies_to_extract = input_data.get('company', []) if input_data else []
+        data['experiences'], _ = _parse_experiences(lines[experience_start:], companies_to_extract)
+    
+    return data
+
+
+class IncrementalParser:
+    """parse_chatgpt_output for text that is edited a little at a time (e.g. while typing).
+
+    Each section remembers the lines it read on the last parse; if those lines
+    (and the company list, for experiences) are unchanged the previous result is
+    reused. The result is always equal to parse_chatgpt_output(text, input_data).
+    """
+
+    SECTIONS = ('personal', 'summary', 'skills', 'experiences')
+
+    def __init__(self):
+        # section -> (lines read, read to the end, extra key, result)
+        self._cache = {}
+        # Sections actually re-parsed by the last call
+        self.reparsed = []
+
+    def _section(self, name, lines, key, parse):
+        cached = self._cache.get(name)
+        if cached is not None:
+            read, to_end, cached_key, result = cached
+            # A section that ran to the end of the text also depends on where the text ends
+            if (cached_key == key and lines[:len(read)] == read
+                    and (not to_end or len(lines) == len(read))):
+                return copy.deepcopy(result)
+
+        result, examined = parse(lines)
+        self._cache[name] = (lines[:examined], examined == len(lines), key, result)
+        self.reparsed.append(name)
+        return copy.deepcopy(result)
+
+    def parse(self, text, input_data=None):
+        """Parse text, reusing the sections that did not change."""
+        self.reparsed = []
+        lines = _split_lines(text)
+        companies = list(input_data.get('company', [])) if input_data else []
         
-        current_exp = None
-        current_company = None
-        empty_line_count = 0
+        data = {
+            'personal': {},
+            'summary': '',
+            'skills': {},
+            'experiences': [],
+            'education': input_data.get('education', {}) if input_data else {}
+        }
         
-        for line in lines[experience_start:]:
-            # Check if we've reached the Education section
-            if 5 <= len(line.strip()) <= 30:
-                # End of experience section
-                if current_exp and current_exp['bullets']:
-                    data['experiences'].append(current_exp)
-                break
-            
-            # Track consecutive empty lines
-            if not line:
-                empty_line_count += 1
-                continue
-            
-            # Check if line contains a company name from our list
-            is_company_line = False
-            for company in companies_to_extract:
-                if company.lower() in line.lower():
-                    if current_exp != None:
-                        if current_exp['company'] == company:
-                            is_company_line = False
-                        else:
-                            is_company_line = True
-                            current_company = company
-                            break
-                    else:
-                        is_company_line = True
-                        current_company = company
-                        break
-            
-            # If we found a company name, save previous experience and start new one
-            if is_company_line:
-                if current_exp and current_exp['bullets']:
-                    data['experiences'].append(current_exp)
-                
-                # Parse the company line: Company | Dates | Role | Location
-                parts = [p.strip() for p in line.split('|')]
-                current_exp = {
-                    'company': current_company,
-                    'dates': parts[1] if len(parts) > 1 else '',
-                    'role': parts[2] if len(parts) > 2 else '',
-                    'location': parts[3] if len(parts) > 3 else '',
-                    'bullets': []
-                }
-                empty_line_count = 0
-            
-            # Check if we're transitioning to a new section (multiple empty lines before non-company, non-bullet line)
-            elif empty_line_count > 1 and current_exp and line and not line[0].isalpha() and not any(company.lower() in line.lower() for company in companies_to_extract):
-                # This might be end of experiences section, save and stop
-                if current_exp['bullets']:
-                    data['experiences'].append(current_exp)
-                    current_exp = None
-                break
-            
-            # Add any non-empty, non-company line as a bullet point
-            elif current_exp and line:
-                # Remove leading bullet character if it exists (•, -, *, +, etc.)
-                # If no symbol, use the line as-is
-                bullet_text = line.strip()
-                if bullet_text and bullet_text[0] in '•-*+':
-                    bullet_text = bullet_text[1:].strip()
-                
-                # Add as bullet point (works with or without symbols)
-                if bullet_text:
-                    current_exp['bullets'].append(bullet_text)
-                
-                empty_line_count = 0
-    
-    return data
\ No newline at end of file
+        data['personal'] = self._section('personal', lines, None, _parse_personal)
+        
+        summary_start, skills_start, experience_start = _section_starts(lines)
+        
+        if summary_start != -1:
+            data['summary'] = self._section('summary', lines[summary_start:], None, _parse_summary)
+        
+        if skills_start != -1:
+            data['skills'] = self._section('skills', lines[skills_start:], None, _parse_skills)
+        
+        if experience_start != -1:
+            data['experiences'] = self._section(
+                'experiences', lines[experience_start:], companies,
+                lambda section: _parse_experiences(section, companies)
+            )
+        
+        return data
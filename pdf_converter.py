@@ -7,15 +7,26 @@ import os
 import sys
 import subprocess
 import time
+import json
 from pathlib import Path
+from conversion_policy import DEFAULT_POLICY
+from process_limits import run_limited, validate_limits
+from pdf_export import PRESETS, convert_to_arg, resolve_export
 
-def convert_docx_to_pdf(docx_path, pdf_path=None):
+# Returned by a backend that is not installed; not a conversion failure
+BACKEND_UNAVAILABLE = 'unavailable'
+
+def convert_docx_to_pdf(docx_path, pdf_path=None, metrics=None, policy=None, export=None, limits=None):
     """
     Convert DOCX to PDF using LibreOffice (recommended) or fallback methods
     
     Args:
         docx_path: Path to input DOCX file
         pdf_path: Optional output PDF path (default: same name as DOCX with .pdf)
+        metrics: Optional dict; filled with backend, retry and breaker details
+        policy: Optional RetryPolicy (default: the process-wide DEFAULT_POLICY)
+        export: Optional PDF preset name or settings dict (see pdf_export.py)
+        limits: Optional rlimits of the soffice child (see process_limits.py)
     
     Returns:
         Path to created PDF file, or None if failed
@@ -32,43 +43,90 @@ def convert_docx_to_pdf(docx_path, pdf_path=None):
     else:
         pdf_path = Path(pdf_path)
     
+    preset, export_settings = resolve_export(export)
     print(f"📄 Converting: {docx_path.name}")
     print(f"📄 Output PDF: {pdf_path.name}")
+    if export_settings:
+        print(f"📄 PDF preset: {preset}")
+    
+    policy = policy or DEFAULT_POLICY
+    job_metrics = {'backend': None, 'attempts': 0, 'retries': 0, 'timeouts': {}, 'skipped': [],
+                   'unavailable': [], 'failures': {}, 'children': [], 'preset': preset}
+    started = time.perf_counter()
+    
+    def libreoffice(docx_path, pdf_path, timeout, children):
+        return _convert_with_libreoffice(docx_path, pdf_path, timeout, children, export_settings, limits)
     
     # Try methods in order of reliability
     conversion_methods = [
-        _convert_with_libreoffice,
-        _convert_with_pypandoc,
-        _convert_with_docx2pdf,
+        ('libreoffice', libreoffice),
+        ('pypandoc', _convert_with_pypandoc),
+        ('docx2pdf', _convert_with_docx2pdf),
     ]
     
-    for method in conversion_methods:
-        result = method(docx_path, pdf_path)
-        if result:
-            return result
-    
-    for method in conversion_methods:
-        result = method(docx_path, pdf_path)
-        if result:
-            return result
+    result = None
+    for attempt in range(1, policy.max_attempts + 1):
+        if attempt > 1:
+            delay = policy.backoff(attempt - 1)
+            print(f"🔁 Retry {attempt - 1}/{policy.max_attempts - 1} in {delay:.1f}s")
+            time.sleep(delay)
+            job_metrics['retries'] += 1
         
-    for method in conversion_methods:
-        result = method(docx_path, pdf_path)
-        if result:
-            return result
+        tried = False
+        for name, method in conversion_methods:
+            if name in job_metrics['unavailable']:
+                continue
+            breaker = policy.breaker(name)
+            if not breaker.allow():
+                print(f"  ⏭ {name} skipped (circuit {breaker.state})")
+                job_metrics['skipped'].append(name)
+                continue
+            
+            timeout = policy.timeout_for(name)
+            method_started = time.perf_counter()
+            result = method(docx_path, pdf_path, timeout, job_metrics['children'])
+            if result == BACKEND_UNAVAILABLE:
+                # Not installed says nothing about the backend's health
+                breaker.release()
+                job_metrics['unavailable'].append(name)
+                result = None
+                continue
+            
+            tried = True
+            job_metrics['attempts'] += 1
+            job_metrics['timeouts'][name] = timeout
+            if result:
+                breaker.record_success()
+                policy.record_latency(name, time.perf_counter() - method_started)
+                job_metrics['backend'] = name
+                break
+            # One bad document counts once per backend, however often it is retried
+            if name not in job_metrics['failures']:
+                breaker.record_failure()
+            job_metrics['failures'][name] = job_metrics['failures'].get(name, 0) + 1
+        
+        # Stop early when no backend could be tried (breakers open, none installed)
+        if result or not tried:
+            break
+    
+    job_metrics['breakers'] = policy.breaker_states()
+    if result:
+        job_metrics['pdf_bytes'] = os.path.getsize(result)
+        if export_settings and job_metrics['backend'] != 'libreoffice':
+            job_metrics['preset_ignored'] = True
+            print(f"⚠ PDF preset '{preset}' only applies to LibreOffice, {job_metrics['backend']} ignored it")
+    if metrics is not None:
+        metrics['conversion'] = job_metrics
+        metrics.setdefault('timings', {})['convert'] = time.perf_counter() - started
+    
+    if result:
+        return result
     
     print("❌ All conversion methods failed")
     return None
 
-def _convert_with_libreoffice(docx_path, pdf_path):
-    """
-    Method 1: Use LibreOffice (most reliable, cross-platform)
-    Requires: LibreOffice installed
-    """
-    print("  Trying LibreOffice conversion...")
-    
-    # Check if LibreOffice is available
-    libreoffice_cmd = None
+def _find_libreoffice():
+    """Return the soffice command, or None if LibreOffice is not installed"""
     if sys.platform == "win32":
         # Windows paths
         possible_paths = [
@@ -77,16 +135,30 @@ def _convert_with_libreoffice(docx_path, pdf_path):
         ]
         for path in possible_paths:
             if os.path.exists(path):
-                libreoffice_cmd = path
-                break
+                return path
     else:
         # Linux/Mac - check if soffice is in PATH
         if subprocess.run(["which", "soffice"], capture_output=True).returncode == 0:
-            libreoffice_cmd = "soffice"
+            return "soffice"
+    return None
+
+def _convert_with_libreoffice(docx_path, pdf_path, timeout=30, children=None, export_settings=None,
+                              limits=None):
+    """
+    Method 1: Use LibreOffice (most reliable, cross-platform)
+    Requires: LibreOffice installed
+    The soffice child runs with rlimits in its own process group; its
+    resource usage is appended to `children` when given; `limits` overrides
+    the default rlimits.
+    export_settings are passed to the PDF export filter (see pdf_export.py)
+    """
+    print("  Trying LibreOffice conversion...")
     
+    # Check if LibreOffice is available
+    libreoffice_cmd = _find_libreoffice()
     if not libreoffice_cmd:
         print("  ⚠ LibreOffice not found")
-        return None
+        return BACKEND_UNAVAILABLE
     
     try:
         # Create output directory if needed
@@ -96,7 +168,7 @@ def _convert_with_libreoffice(docx_path, pdf_path):
         cmd = [
             libreoffice_cmd,
             "--headless",  # Run without GUI
-            "--convert-to", "pdf",
+            "--convert-to", convert_to_arg(export_settings),
             "--outdir", str(pdf_path.parent),
             str(docx_path)
         ]
@@ -104,14 +176,12 @@ def _convert_with_libreoffice(docx_path, pdf_path):
         print(f"  Running: {' '.join(cmd)}")
         
         # Run conversion
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=30  # 30 second timeout
-        )
+        result = run_limited(cmd, timeout, limits)
+        _record_child('libreoffice', result, children)
         
-        if result.returncode == 0:
+        if result['timed_out']:
+            print("  ❌ LibreOffice timeout")
+        elif result['returncode'] == 0:
             # Check if PDF was created
             if pdf_path.exists():
                 file_size = pdf_path.stat().st_size / 1024
@@ -125,18 +195,32 @@ def _convert_with_libreoffice(docx_path, pdf_path):
                     print(f"  ✅ LibreOffice success (renamed)")
                     return str(pdf_path)
         else:
-            print(f"  ❌ LibreOffice failed: {result.stderr}")
+            print(f"  ❌ LibreOffice failed: {result['stderr']}")
             
-    except subprocess.TimeoutExpired:
-        print("  ❌ LibreOffice timeout")
     except Exception as e:
         print(f"  ❌ LibreOffice error: {e}")
     
     return None
 
-def _convert_with_pypandoc(docx_path, pdf_path):
+def _record_child(backend, result, children):
+    """Keep a child's resource usage for the job metrics"""
+    if result['peak_rss_kb'] is not None:
+        print(f"  📈 {backend} child: peak RSS {result['peak_rss_kb'] / 1024:.1f} MB, "
+              f"CPU {result['cpu_seconds']:.2f}s, wall {result['wall_seconds']:.2f}s")
+    if children is not None:
+        children.append({
+            'backend': backend,
+            'returncode': result['returncode'],
+            'timed_out': result['timed_out'],
+            'wall_seconds': result['wall_seconds'],
+            'peak_rss_kb': result['peak_rss_kb'],
+            'cpu_seconds': result['cpu_seconds'],
+        })
+
+def _convert_with_pypandoc(docx_path, pdf_path, timeout=None, children=None):
     """
     Method 2: Use PyPandoc (requires pandoc + LaTeX)
+    The timeout cannot be enforced for this backend
     """
     print("  Trying PyPandoc conversion...")
     
@@ -161,14 +245,16 @@ def _convert_with_pypandoc(docx_path, pdf_path):
             
     except ImportError:
         print("  ⚠ PyPandoc not installed (pip install pypandoc)")
+        return BACKEND_UNAVAILABLE
     except Exception as e:
         print(f"  ❌ PyPandoc error: {e}")
     
     return None
 
-def _convert_with_docx2pdf(docx_path, pdf_path):
+def _convert_with_docx2pdf(docx_path, pdf_path, timeout=None, children=None):
     """
     Method 3: Use docx2pdf library (Windows-only, requires Word)
+    The timeout cannot be enforced for this backend
     """
     print("  Trying docx2pdf conversion...")
     
@@ -188,48 +274,343 @@ def _convert_with_docx2pdf(docx_path, pdf_path):
             
     except ImportError:
         print("  ⚠ docx2pdf not installed (pip install docx2pdf)")
+        return BACKEND_UNAVAILABLE
     except Exception as e:
         print(f"  ❌ docx2pdf error: {e}")
     
     return None
 
-def batch_convert_folder(folder_path, output_folder=None):
+MANIFEST_NAME = ".convert_manifest.json"
+
+
+def _iter_docx_files(folder_path, recursive=False, skip_dirs=()):
+    """Lazily walk a folder with os.scandir, yielding DOCX DirEntry objects"""
+    skip_dirs = {os.path.abspath(d) for d in skip_dirs}
+    pending = [str(folder_path)]
+    
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and os.path.abspath(entry.path) not in skip_dirs:
+                            pending.append(entry.path)
+                    elif entry.name.endswith('.docx') and entry.is_file():
+                        yield entry
+        except OSError as e:
+            print(f"⚠ Cannot read {current}: {e}")
+
+def _file_hash(path):
+    """SHA-256 of a file, read in chunks"""
+    import hashlib
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _load_manifest(output_folder):
+    """Load the conversion manifest ({relative docx path: stat + hash})"""
+    manifest_path = output_folder / MANIFEST_NAME
+    if manifest_path.exists():
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Ignoring unreadable manifest: {e}")
+    return {}
+
+def _save_manifest(output_folder, manifest):
+    """Write the conversion manifest atomically"""
+    manifest_path = output_folder / MANIFEST_NAME
+    tmp_path = manifest_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+def _is_up_to_date(entry, rel_key, pdf_path, manifest, use_hash, preset='default'):
+    """
+    Make-style staleness check.
+    mtime mode: PDF exists and is newer than the DOCX.
+    hash mode: the DOCX content hash matches the manifest (the hash is only
+    recomputed when size/mtime changed since the last run).
+    Either way a PDF exported with another preset is stale.
+    """
+    if not pdf_path.exists():
+        return False
+    
+    record = manifest.get(rel_key)
+    # Entries written before presets existed were plain exports
+    if record and record.get('preset', 'default') != preset:
+        return False
+    
+    stat = entry.stat()
+    if not use_hash:
+        return pdf_path.stat().st_mtime_ns >= stat.st_mtime_ns
+    
+    if not record:
+        return False
+    if record.get('size') == stat.st_size and record.get('mtime_ns') == stat.st_mtime_ns:
+        return True
+    
+    digest = _file_hash(entry.path)
+    if digest == record.get('sha256'):
+        record['mtime_ns'] = stat.st_mtime_ns
+        return True
+    return False
+
+def _manifest_record(docx_path, preset='default'):
+    """Manifest entry for a converted DOCX"""
+    stat = os.stat(docx_path)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': _file_hash(docx_path),
+        'preset': preset,
+    }
+
+class _ChunkPlanner:
+    """
+    Sizes multi-file LibreOffice chunks.
+    Chunks are bounded by file count and total bytes; the count grows after
+    fast chunks and halves after a timeout, and the timeout follows the
+    observed seconds-per-MB conversion rate.
+    """
+    
+    def __init__(self, max_files=8, max_bytes=20 * 1024 * 1024,
+                 base_timeout=30, file_limit=32):
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.base_timeout = base_timeout
+        self.file_limit = file_limit
+        self.seconds_per_mb = None
+    
+    def chunks(self, jobs):
+        """Yield lists of jobs, re-reading the limits before each chunk"""
+        jobs = list(jobs)
+        while jobs:
+            chunk = [jobs.pop(0)]
+            chunk_bytes = chunk[0]['size']
+            while jobs and len(chunk) < self.max_files and chunk_bytes + jobs[0]['size'] <= self.max_bytes:
+                chunk_bytes += jobs[0]['size']
+                chunk.append(jobs.pop(0))
+            yield chunk
+    
+    def timeout_for(self, chunk):
+        """Timeout for one soffice call over this chunk"""
+        if self.seconds_per_mb is None:
+            return self.base_timeout * len(chunk)
+        megabytes = sum(job['size'] for job in chunk) / (1024 * 1024)
+        predicted = self.seconds_per_mb * megabytes + 2 * len(chunk)
+        return max(self.base_timeout, 3 * predicted)
+    
+    def record_success(self, chunk, elapsed):
+        """Learn the conversion rate and grow the chunk size"""
+        megabytes = max(sum(job['size'] for job in chunk) / (1024 * 1024), 0.01)
+        rate = elapsed / megabytes
+        if self.seconds_per_mb is None:
+            self.seconds_per_mb = rate
+        else:
+            self.seconds_per_mb = 0.7 * self.seconds_per_mb + 0.3 * rate
+        self.max_files = min(self.file_limit, self.max_files + max(1, self.max_files // 2))
+    
+    def record_timeout(self):
+        """Back off after a timed-out chunk"""
+        self.max_files = max(1, self.max_files // 2)
+
+def _convert_chunk_with_libreoffice(libreoffice_cmd, chunk, outdir, timeout, export_settings=None,
+                                    limits=None):
+    """
+    Convert several DOCX files with a single soffice invocation.
+    Returns (converted jobs, failed jobs, timed_out)
+    """
+    outdir.mkdir(parents=True, exist_ok=True)
+    cmd = [
+        libreoffice_cmd,
+        "--headless",
+        "--convert-to", convert_to_arg(export_settings),
+        "--outdir", str(outdir),
+    ] + [str(job['docx']) for job in chunk]
+    
+    print(f"\n--- Converting {len(chunk)} files in one LibreOffice call (timeout {timeout:.0f}s) ---")
+    started = time.time()
+    timed_out = False
+    try:
+        result = run_limited(cmd, timeout, limits)
+        _record_child('libreoffice', result, None)
+        timed_out = result['timed_out']
+        if timed_out:
+            print("  ❌ LibreOffice timeout")
+        elif result['returncode'] != 0:
+            print(f"  ❌ LibreOffice failed: {result['stderr']}")
+    except Exception as e:
+        print(f"  ❌ LibreOffice error: {e}")
+    
+    # Check every file on its own: a chunk can partially succeed
+    converted, failed = [], []
+    for job in chunk:
+        pdf_path = job['pdf']
+        if pdf_path.exists() and pdf_path.stat().st_mtime >= started - 1:
+            converted.append(job)
+            print(f"  ✅ {job['key']}")
+        else:
+            failed.append(job)
+    return converted, failed, timed_out
+
+def _convert_jobs_combined(jobs, planner, export=None, limits=None):
+    """
+    Convert jobs with multi-file soffice calls, grouped by output folder.
+    Returns (converted jobs, failed jobs); failed jobs are retried one by one.
+    """
+    libreoffice_cmd = _find_libreoffice()
+    breaker = DEFAULT_POLICY.breaker('libreoffice')
+    if not libreoffice_cmd or len(jobs) < 2 or not breaker.allow():
+        return _convert_jobs_individually(jobs, export, limits)
+    _, export_settings = resolve_export(export)
+    
+    by_outdir = {}
+    for job in jobs:
+        by_outdir.setdefault(job['pdf'].parent, []).append(job)
+    
+    converted, retry = [], []
+    for outdir, outdir_jobs in by_outdir.items():
+        for chunk in planner.chunks(outdir_jobs):
+            if len(chunk) == 1:
+                retry.extend(chunk)
+                continue
+            started = time.time()
+            chunk_done, chunk_failed, timed_out = _convert_chunk_with_libreoffice(
+                libreoffice_cmd, chunk, outdir, planner.timeout_for(chunk), export_settings, limits
+            )
+            if timed_out:
+                planner.record_timeout()
+            elif not chunk_failed:
+                planner.record_success(chunk, time.time() - started)
+            if chunk_done:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+            converted.extend(chunk_done)
+            retry.extend(chunk_failed)
+    
+    if retry:
+        print(f"\n🔁 Converting {len(retry)} files individually")
+        retried, failed = _convert_jobs_individually(retry, export, limits)
+        converted.extend(retried)
+        return converted, failed
+    return converted, []
+
+def _convert_jobs_individually(jobs, export=None, limits=None):
+    """Convert jobs one at a time with the full fallback chain"""
+    converted, failed = [], []
+    for job in jobs:
+        print(f"\n--- Converting {job['key']} ---")
+        if convert_docx_to_pdf(job['docx'], job['pdf'], export=export, limits=limits):
+            converted.append(job)
+        else:
+            failed.append(job)
+    return converted, failed
+
+def batch_convert_folder(folder_path, output_folder=None, incremental=False,
+                         recursive=False, use_hash=False, combine=True, export=None, limits=None):
     """
     Convert all DOCX files in a folder to PDF
+    
+    Args:
+        incremental: Skip DOCX files whose PDF is up to date
+        recursive: Walk subfolders (output mirrors the folder structure)
+        use_hash: In incremental mode, compare content hashes kept in a
+                  manifest instead of mtimes
+        combine: Convert pending files in multi-file LibreOffice calls
+        export: PDF preset name or settings dict (see pdf_export.py)
+        limits: rlimits of the soffice children (see process_limits.py)
     """
     folder_path = Path(folder_path)
+    # Fails on an unknown preset or limit before anything is converted
+    preset, _ = resolve_export(export)
+    if limits:
+        validate_limits(limits)
     
     if not folder_path.exists():
         print(f"❌ Folder not found: {folder_path}")
         return []
     
-    # Get all DOCX files
-    docx_files = list(folder_path.glob("*.docx"))
-    
-    if not docx_files:
-        print(f"ℹ️ No DOCX files found in {folder_path}")
-        return []
-    
-    print(f"🔍 Found {len(docx_files)} DOCX files to convert")
-    
     # Set output folder
     if output_folder is None:
         output_folder = folder_path / "pdf_output"
     output_folder = Path(output_folder)
     output_folder.mkdir(parents=True, exist_ok=True)
     
-    # Convert each file
-    successful = []
-    for docx_file in docx_files:
-        print(f"\n--- Converting {docx_file.name} ---")
-        pdf_path = output_folder / docx_file.with_suffix('.pdf').name
-        result = convert_docx_to_pdf(docx_file, pdf_path)
-        if result:
-            successful.append(result)
+    manifest = _load_manifest(output_folder) if incremental else {}
+    
+    # Collect the files that need converting
+    pending = []
+    skipped = 0
+    for entry in _iter_docx_files(folder_path, recursive, skip_dirs=[output_folder]):
+        docx_file = Path(entry.path)
+        rel_path = docx_file.relative_to(folder_path)
+        rel_key = rel_path.as_posix()
+        pdf_path = output_folder / rel_path.with_suffix('.pdf')
+        
+        if incremental and _is_up_to_date(entry, rel_key, pdf_path, manifest, use_hash, preset):
+            skipped += 1
+            continue
+        
+        pending.append({'docx': docx_file, 'pdf': pdf_path, 'key': rel_key,
+                        'size': entry.stat().st_size})
+    
+    # Convert
+    if combine:
+        converted, failed_jobs = _convert_jobs_combined(pending, _ChunkPlanner(), export, limits)
+    else:
+        converted, failed_jobs = _convert_jobs_individually(pending, export, limits)
+    
+    successful = [str(job['pdf']) for job in converted]
+    failed = len(failed_jobs)
+    
+    if incremental:
+        for job in converted:
+            manifest[job['key']] = _manifest_record(job['docx'], preset)
+        _save_manifest(output_folder, manifest)
+    
+    total = len(successful) + skipped + failed
+    if total == 0:
+        print(f"ℹ️ No DOCX files found in {folder_path}")
+        return []
     
-    print(f"\n🎉 Conversion complete: {len(successful)}/{len(docx_files)} successful")
+    print(f"\n🎉 Conversion complete: {len(successful)} converted, "
+          f"{skipped} skipped (up to date), {failed} failed, {total} total")
     return successful
 
+def compare_presets(docx_path, output_folder=None, presets=None):
+    """
+    Convert one DOCX with several presets (default: all) and report size and time
+    PDFs are written to <output_folder>/<preset>/ (default: next to the DOCX)
+    Returns a list of {preset, pdf, bytes, seconds, backend}
+    """
+    docx_path = Path(docx_path)
+    output_folder = Path(output_folder) if output_folder else docx_path.parent / "pdf_presets"
+    
+    results = []
+    for preset in presets or list(PRESETS):
+        metrics = {}
+        pdf_path = output_folder / preset / docx_path.with_suffix('.pdf').name
+        result = convert_docx_to_pdf(docx_path, pdf_path, metrics=metrics, export=preset)
+        results.append({
+            'preset': preset,
+            'pdf': result,
+            'bytes': metrics['conversion'].get('pdf_bytes'),
+            'seconds': metrics['timings']['convert'],
+            'backend': metrics['conversion']['backend'],
+        })
+    
+    print(f"\n{'preset':<14} {'size':>10} {'time':>8}  backend")
+    for row in results:
+        size = f"{row['bytes'] / 1024:.1f} KB" if row['bytes'] is not None else "failed"
+        print(f"{row['preset']:<14} {size:>10} {row['seconds']:7.2f}s  {row['backend'] or '-'}")
+    return results
+
 def main():
     """Command line interface"""
     import argparse
@@ -239,19 +620,39 @@ def main():
     parser.add_argument('-o', '--output', help='Output PDF file or folder')
     parser.add_argument('-b', '--batch', action='store_true', 
                        help='Batch convert all DOCX files in folder')
+    parser.add_argument('-i', '--incremental', action='store_true',
+                       help='Batch: only convert DOCX files whose PDF is missing or stale')
+    parser.add_argument('-r', '--recursive', action='store_true',
+                       help='Batch: include subfolders')
+    parser.add_argument('--hash', action='store_true',
+                       help='Batch: detect changes by content hash instead of mtime')
+    parser.add_argument('--no-combine', action='store_true',
+                       help='Batch: start LibreOffice once per file')
+    parser.add_argument('--preset', choices=list(PRESETS), default='default',
+                       help='PDF export preset (see pdf_export.py)')
+    parser.add_argument('--compare-presets', action='store_true',
+                       help='Convert one file with every preset and compare size and time')
     
     args = parser.parse_args()
     
-    if args.batch:
+    if args.compare_presets:
+        results = compare_presets(args.input, args.output)
+        sys.exit(0 if all(row['pdf'] for row in results) else 1)
+    elif args.batch:
         # Batch convert folder
-        results = batch_convert_folder(args.input, args.output)
+        results = batch_convert_folder(args.input, args.output,
+                                       incremental=args.incremental,
+                                       recursive=args.recursive,
+                                       use_hash=args.hash,
+                                       combine=not args.no_combine,
+                                       export=args.preset)
         if results:
             print("\n✅ Converted files:")
             for pdf in results:
                 print(f"  • {Path(pdf).name}")
     else:
         # Single file conversion
-        result = convert_docx_to_pdf(args.input, args.output)
+        result = convert_docx_to_pdf(args.input, args.output, export=args.preset)
         if result:
             print(f"\n✅ Successfully converted to: {result}")
         else:
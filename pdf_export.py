@@ -0,0 +1,130 @@
+"""
+PDF export settings - named presets for LibreOffice's PDF filter
+
+By default soffice converts with `--convert-to pdf`: full-resolution images,
+lossless compression, no PDF/A. Export settings are passed to the
+writer_pdf_Export filter as JSON filter options (LibreOffice 7.4 or later):
+
+    soffice --convert-to 'pdf:writer_pdf_Export:{"Quality":{"type":"long","value":"75"}}'
+
+Settings:
+    max_image_dpi         downsample images to 75, 150, 300, 600 or 1200 DPI
+    jpeg_quality          JPEG quality 1-100 (used when images are not lossless)
+    lossless_images       keep images lossless (PNG-style) instead of JPEG
+    embed_standard_fonts  also embed the 14 standard PDF fonts
+    pdfa                  PDF/A-1b, -2b or -3b (1, 2, 3; 0 = plain PDF)
+    tagged                tagged (accessible) PDF
+
+LibreOffice always subsets the fonts it embeds; there is no filter option to
+embed full fonts, so subsetting is not a setting. PDF/A embeds every font.
+
+A job picks a preset with config 'pdf_preset' and can override single
+settings with config 'pdf_export' (a dict of the settings above).
+"""
+import json
+
+PRESETS = {
+    # Plain `--convert-to pdf`, the behavior before presets existed
+    'default': {},
+    # Attachments: small images, lossy JPEG, no standard fonts
+    'email-small': {
+        'max_image_dpi': 150,
+        'jpeg_quality': 75,
+        'lossless_images': False,
+        'embed_standard_fonts': False,
+    },
+    'print': {
+        'max_image_dpi': 300,
+        'lossless_images': True,
+        'embed_standard_fonts': True,
+    },
+    # Long-term storage and applicant tracking systems
+    'archive': {
+        'pdfa': 2,
+        'tagged': True,
+        'embed_standard_fonts': True,
+    },
+}
+DEFAULT_PRESET = 'default'
+
+IMAGE_DPI_VALUES = (75, 150, 300, 600, 1200)
+PDFA_VERSIONS = (0, 1, 2, 3)
+BOOLEAN_SETTINGS = ('lossless_images', 'embed_standard_fonts', 'tagged')
+
+
+def validate_settings(settings):
+    """Raise ValueError for unknown settings or values LibreOffice would not accept."""
+    for key, value in settings.items():
+        if key == 'max_image_dpi':
+            if value not in IMAGE_DPI_VALUES:
+                raise ValueError(f"max_image_dpi must be one of {IMAGE_DPI_VALUES}, got {value!r}")
+        elif key == 'jpeg_quality':
+            if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= 100:
+                raise ValueError(f"jpeg_quality must be an integer from 1 to 100, got {value!r}")
+        elif key == 'pdfa':
+            if value not in PDFA_VERSIONS:
+                raise ValueError(f"pdfa must be one of {PDFA_VERSIONS}, got {value!r}")
+        elif key in BOOLEAN_SETTINGS:
+            if not isinstance(value, bool):
+                raise ValueError(f"{key} must be true or false, got {value!r}")
+        else:
+            raise ValueError(f"Unknown PDF export setting: {key}")
+
+
+def resolve_export(export=None):
+    """Preset name, settings dict or None -> (name, settings).
+
+    A dict may name its base preset under 'preset'; its other keys override it.
+    """
+    if export is None:
+        export = DEFAULT_PRESET
+    if isinstance(export, str):
+        if export not in PRESETS:
+            raise ValueError(f"Unknown PDF preset '{export}' (available: {', '.join(PRESETS)})")
+        return export, dict(PRESETS[export])
+
+    overrides = dict(export)
+    base = overrides.pop('preset', DEFAULT_PRESET)
+    name, settings = resolve_export(base)
+    validate_settings(overrides)
+    settings.update(overrides)
+    return (f"{name}+custom" if overrides else name), settings
+
+
+def export_from_config(config):
+    """Export of a job config ('pdf_preset' plus 'pdf_export' overrides), for convert_docx_to_pdf."""
+    config = config or {}
+    return dict(config.get('pdf_export') or {}, preset=config.get('pdf_preset') or DEFAULT_PRESET)
+
+
+def filter_options(settings):
+    """Settings -> writer_pdf_Export filter properties."""
+    options = {}
+
+    def put(name, kind, value):
+        if kind == 'boolean':
+            value = 'true' if value else 'false'
+        options[name] = {'type': kind, 'value': str(value)}
+
+    if settings.get('max_image_dpi'):
+        put('ReduceImageResolution', 'boolean', True)
+        put('MaxImageResolution', 'long', settings['max_image_dpi'])
+    if settings.get('jpeg_quality') is not None:
+        put('Quality', 'long', settings['jpeg_quality'])
+    if settings.get('lossless_images') is not None:
+        put('UseLosslessCompression', 'boolean', settings['lossless_images'])
+    if settings.get('embed_standard_fonts') is not None:
+        put('EmbedStandardFonts', 'boolean', settings['embed_standard_fonts'])
+    if settings.get('pdfa'):
+        put('SelectPdfVersion', 'long', settings['pdfa'])
+    if settings.get('tagged') is not None:
+        put('UseTaggedPDF', 'boolean', settings['tagged'])
+    return options
+
+
+def convert_to_arg(settings):
+    """Value for soffice --convert-to: plain 'pdf' without settings."""
+    options = filter_options(settings or {})
+    if not options:
+        return 'pdf'
+    return 'pdf:writer_pdf_Export:' + json.dumps(options, separators=(',', ':'))
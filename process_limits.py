@@ -0,0 +1,212 @@
+"""
+Resource-limited child processes for the conversion backends
+
+Children run in their own process group (so a timeout kills soffice and
+everything it spawned) with rlimits on address space, CPU time and open files.
+On POSIX the child is reaped with os.wait4 so its peak RSS and CPU time can be
+reported in the job metrics.
+
+The rlimits are set by a small Python shim that then execs the command, not by
+a preexec_fn: conversions run from thread pools (batch, load tests), and
+running Python code between fork and exec in a threaded parent can deadlock.
+
+Limits can be set per job with config 'child_limits', e.g.
+{"cpu_seconds": 60, "address_space_mb": 4096}.
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+# Address space is virtual memory; soffice maps far more than it touches, so keep it generous
+DEFAULT_LIMITS = {
+    'address_space_mb': 8192,
+    'cpu_seconds': 300,
+    'open_files': 1024,
+}
+
+# Environment overrides, e.g. RESUME_CHILD_CPU_SECONDS=60 (0 disables a limit)
+ENV_PREFIX = 'RESUME_CHILD_'
+
+KILL_GRACE_SECONDS = 2.0
+
+
+# limit -> (resource module constant, scale to the rlimit unit)
+RLIMITS = {
+    'address_space_mb': ('RLIMIT_AS', 1024 * 1024),
+    'cpu_seconds': ('RLIMIT_CPU', 1),
+    'open_files': ('RLIMIT_NOFILE', 1),
+}
+
+# argv: [json list of (RLIMIT_ name, soft value)] command... ; lowers the soft limits, then execs
+LIMIT_SHIM = """
+import json, os, resource, sys
+for name, soft in json.loads(sys.argv[1]):
+    which = getattr(resource, name)
+    _, hard = resource.getrlimit(which)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(which, (soft, hard))
+try:
+    os.execvp(sys.argv[2], sys.argv[2:])
+except OSError as e:
+    sys.stderr.write(f"Cannot run {sys.argv[2]}: {e}\\n")
+    sys.exit(127)
+"""
+
+
+def validate_limits(limits):
+    """Raise ValueError for unknown limits or values that are not non-negative integers."""
+    for key, value in limits.items():
+        if key not in DEFAULT_LIMITS:
+            raise ValueError(f"Unknown child limit: {key} (available: {', '.join(DEFAULT_LIMITS)})")
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"{key} must be a non-negative integer, got {value!r}")
+
+
+def limits_from_config(config):
+    """Per-job limits of a job config ('child_limits'), for run_limited; None without any."""
+    limits = (config or {}).get('child_limits') or None
+    if limits:
+        validate_limits(limits)
+    return limits
+
+
+def get_limits(overrides=None):
+    """Effective limits: defaults, then environment, then explicit (per-job) overrides."""
+    limits = dict(DEFAULT_LIMITS)
+    for key in limits:
+        value = os.environ.get(ENV_PREFIX + key.upper())
+        if value is not None:
+            try:
+                limits[key] = int(value)
+            except ValueError:
+                print(f"⚠ Ignoring invalid {ENV_PREFIX + key.upper()}={value!r}")
+    if overrides:
+        validate_limits(overrides)
+        limits.update(overrides)
+    return limits
+
+
+def limited_command(cmd, limits):
+    """Wrap cmd in the shim that applies the rlimits and execs it (same pid)."""
+    settings = [(RLIMITS[key][0], value * RLIMITS[key][1]) for key, value in limits.items() if value]
+    if not settings:
+        return list(cmd)
+    return [sys.executable, '-S', '-c', LIMIT_SHIM, json.dumps(settings)] + list(cmd)
+
+
+def _exit_code(status):
+    """Convert a wait status into a Popen-style return code."""
+    if hasattr(os, 'waitstatus_to_exitcode'):
+        return os.waitstatus_to_exitcode(status)
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _kill_group(pgid, sig):
+    """Signal a whole process group, ignoring groups that are already gone."""
+    try:
+        os.killpg(pgid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_limited(cmd, timeout, limits=None):
+    """Run cmd with rlimits and a wall-clock timeout.
+
+    limits: per-job overrides of the default / environment limits
+
+    Returns:
+        dict with returncode, stdout, stderr, timed_out, wall_seconds,
+        peak_rss_kb and cpu_seconds (the last two are None on Windows)
+    """
+    if sys.platform == "win32":
+        return _run_windows(cmd, timeout)
+
+    limits = get_limits(limits)
+    started = time.monotonic()
+    timed_out = False
+
+    # Files instead of pipes: we poll with wait4, so nobody drains a pipe meanwhile
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        # start_new_session is done by the C fork helper, unlike a preexec_fn
+        proc = subprocess.Popen(
+            limited_command(cmd, limits), stdout=out, stderr=err,
+            start_new_session=True,
+        )
+
+        deadline = started + timeout
+        delay = 0.01
+        while True:
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            if time.monotonic() >= deadline:
+                timed_out = True
+                _kill_group(proc.pid, signal.SIGTERM)
+                kill_deadline = time.monotonic() + KILL_GRACE_SECONDS
+                while time.monotonic() < kill_deadline:
+                    pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+                    if pid:
+                        break
+                    time.sleep(0.05)
+                if not pid:
+                    _kill_group(proc.pid, signal.SIGKILL)
+                    pid, status, usage = os.wait4(proc.pid, 0)
+                # Grandchildren (e.g. soffice.bin) may outlive the launcher
+                _kill_group(proc.pid, signal.SIGKILL)
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+
+        # Tell Popen the child is already reaped
+        proc.returncode = _exit_code(status)
+
+        out.seek(0)
+        err.seek(0)
+        stdout = out.read().decode('utf-8', errors='replace')
+        stderr = err.read().decode('utf-8', errors='replace')
+
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak_rss_kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+
+    return {
+        'returncode': proc.returncode,
+        'stdout': stdout,
+        'stderr': stderr,
+        'timed_out': timed_out,
+        'wall_seconds': time.monotonic() - started,
+        'peak_rss_kb': peak_rss_kb,
+        'cpu_seconds': usage.ru_utime + usage.ru_stime,
+    }
+
+
+def _run_windows(cmd, timeout):
+    """Windows: new process group and tree kill on timeout; no rlimits or rusage."""
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
+    )
+    timed_out = False
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        subprocess.run(["taskkill", "/T", "/F", "/PID", str(proc.pid)], capture_output=True)
+        stdout, stderr = proc.communicate()
+
+    return {
+        'returncode': proc.returncode,
+        'stdout': stdout,
+        'stderr': stderr,
+        'timed_out': timed_out,
+        'wall_seconds': time.monotonic() - started,
+        'peak_rss_kb': None,
+        'cpu_seconds': None,
+    }
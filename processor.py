@@ -1,13 +1,29 @@
 """
 Core resume processor - Cleaned Version
 """
-import subprocess
+import contextlib
+import copy
+import io
 import os
 import shutil
-import re
-import tempfile
-from datetime import datetime
+import time
+import uuid
+import zlib
+import hashlib
+import posixpath
+import xml.etree.ElementTree as ET
+from xml.parsers import expat
 from parser import parse_chatgpt_output
+from template_pack import DOCUMENT_PART, collect_template_files
+from template_normalizer import normalize_template, index_tags, escape_tags, TAG_RE
+from docx_packager import template_drift, write_docx
+from workspace import get_workspace_manager, folder_size
+from layout import estimate_layout, trim_one_bullet
+from records import ParsedResume
+from structured_input import load_resume_file, resume_to_parsed
+
+# (template .docx, template folder) -> (signature of both, (changed parts, removed members))
+_template_drift_cache = {}
 
 
 class ResumeProcessor:
@@ -28,39 +44,147 @@ class ResumeProcessor:
         r"C:\Program Files (x86)\WinRAR\WinRAR.exe",
     ]
 
-    def __init__(self, template_doc, template_folder, chatgpt_file, config=None):
-        """Initialize the resume processor."""
+    def __init__(self, template_doc, template_folder, chatgpt_file, config=None, template_pack=None,
+                 parse_cache=None, template_docx_data=None):
+        """Initialize the resume processor.
+
+        template_pack: optional TemplatePack (see template_pack.py) shared between
+        workers; when given, template parts are read from it instead of disk.
+        parse_cache: optional ParseCache (see parse_cache.py) consulted before parsing.
+        template_docx_data: optional bytes of the template .docx; when given,
+        packaging copies entries from it instead of re-reading the file.
+        """
         self.template_doc = template_doc
         self.template_folder = template_folder
+        self.template_pack = template_pack
+        self.parse_cache = parse_cache
+        self.template_docx_data = template_docx_data
+        self.template_docx = self._find_template_docx(template_folder, config)
+        if template_docx_data is not None and not self.template_docx:
+            # Snapshot of a .docx that has been removed since
+            self.template_docx = template_folder.rstrip('/\\') + '.docx'
         self.chatgpt_file = chatgpt_file
         self.xml_content = ''
         self.parsed_data = {}
         self.config = config
         self.temp_working_folder = None
         self.base_data = {}
+        self.job_id = uuid.uuid4().hex
+        self.template_hash = None
+        self.timings = {}
+        # Per-job metrics; later stages (e.g. PDF conversion) add their own sections
+        self.metrics = {'timings': self.timings}
+        # Other XML parts (headers, footers, ...) holding tags
+        self.rendered_parts = {}
+        self._template_loaded = None
+        self._input_loaded = None
 
     def run(self):
         """Main processing pipeline."""
         try:
-            self._load_files()
-            self._validate_data()
-            self._process_xml()
-            self._save_output()
-            self._create_working_copy()
-            return self._create_docx_from_folder()
+            self._timed('load', self._load_files)
+            self._timed('validate', self._validate_data)
+            self._timed('render', self._process_xml)
+            self._timed('check_xml', self._check_all_well_formed)
+            self._timed('layout', self._fit_layout)
+            if self.template_docx:
+                return self._timed('package', self._create_docx_from_template)
+            self._timed('working_copy', self._create_working_copy)
+            self._timed('save', self._save_output)
+            return self._timed('package', self._create_docx_from_folder)
         except Exception as e:
             print(f"❌ Error: {e}")
             return None
+        finally:
+            self._release_working_copy()
+            self._print_timings()
+
+    def _timed(self, stage, func):
+        """Run one pipeline stage and record its wall time."""
+        start = time.perf_counter()
+        try:
+            return func()
+        finally:
+            self.timings[stage] = time.perf_counter() - start
+
+    def _print_timings(self):
+        """Print per-stage timings of the last run."""
+        if not self.timings:
+            return
+        total = sum(self.timings.values())
+        stages = ", ".join(f"{stage} {seconds * 1000:.1f}ms" for stage, seconds in self.timings.items())
+        print(f"⏱ Timings: {stages} (total {total * 1000:.1f}ms)")
 
     def _load_files(self):
-        """Load input files and parse data."""
+        """Load input files and parse data (stages restored via use_*_state are skipped)."""
+        if not self._template_loaded:
+            self._load_template()
+        if not self._input_loaded:
+            self._load_input()
+        print("✓ Files loaded and parsed successfully")
+
+    def load_template_state(self):
+        """Load and normalize only the template and return its state (see template_registry.py)."""
+        if not self._template_loaded:
+            self._load_template()
+        return self._template_loaded
+
+    def template_state(self):
+        """Template as loaded (normalized, parts discovered, not yet rendered), for reuse."""
+        return self._template_loaded
+
+    def use_template_state(self, state):
+        """Reuse a template loaded earlier instead of reading it again."""
+        self.xml_content = state['xml_content']
+        self.rendered_parts = dict(state['rendered_parts'])
+        self.template_hash = state['template_hash']
+        self._template_loaded = state
+
+    def input_state(self):
+        """Parsed input as loaded (parsed_data as a ParsedResume record), for reuse."""
+        return self._input_loaded
+
+    def use_input_state(self, state):
+        """Reuse input parsed earlier instead of parsing it again."""
+        self.base_data = copy.deepcopy(state['base_data'])
+        self.parsed_data = state['parsed_data'].to_dict()
+        self._input_loaded = state
+
+    def _load_template(self):
+        """Load and normalize the template document and its tagged parts."""
         # Load XML template
-        with open(self.template_doc, 'r', encoding='utf-8') as f:
-            self.xml_content = f.read()
-        
+        if self.template_pack is not None:
+            self.xml_content = self.template_pack.read_text(DOCUMENT_PART)
+        else:
+            with open(self.template_doc, 'r', encoding='utf-8') as f:
+                self.xml_content = f.read()
+
+        # Repair split / escaped tags once so every lookup is a plain scan
+        self.xml_content, fixups = normalize_template(self.xml_content)
+        for fixup in fixups:
+            print(f"🔧 {fixup}")
+
+        self._discover_parts()
+        self.template_hash = self._hash_template()
+        self._template_loaded = {
+            'xml_content': self.xml_content,
+            'rendered_parts': dict(self.rendered_parts),
+            'template_hash': self.template_hash,
+        }
+
+    def _load_input(self):
+        """Load and parse the ChatGPT output (structured resumes are used as is)."""
+        structured = self._structured_resume()
+
         # Load and parse ChatGPT output
-        with open(self.chatgpt_file, 'r', encoding='utf-8') as f:
-            chatgpt_text = f.read()
+        if structured is not None:
+            chatgpt_text = ''
+        elif self.chatgpt_file:
+            with open(self.chatgpt_file, 'r', encoding='utf-8') as f:
+                chatgpt_text = f.read()
+        else:
+            # Batch jobs carry the text in the config instead of a file
+            chatgpt_text = self.config.get('chatgpt_text', '')
         
         # Prepare base data structure
         self.base_data = {
@@ -75,15 +199,117 @@ class ResumeProcessor:
         self.base_data['company'] = self.config.get('company', ["Microsoft", "PayPal", "Tagani"])
         personal_info = {}
 
-        self.base_data['personal'] = self.config.get('personal', [])
+        self.base_data['personal'] = self.config.get('personal', {})
 
-        self.base_data['education'] = self.config.get('education', [])
+        self.base_data['education'] = self.config.get('education', {})
 
         # Parse data
-        self.parsed_data = parse_chatgpt_output(chatgpt_text, self.base_data)
+        parse_started = time.perf_counter()
+        if structured is not None:
+            # Already structured: validate and render, no heuristic parsing
+            self.parsed_data = resume_to_parsed(structured, self.base_data)
+            # The document's contact and education details are the ones rendered;
+            # whatever it leaves out (even all of 'personal') comes from the config
+            self.base_data['personal'] = dict(self.base_data['personal'], **self.parsed_data['personal'])
+            self.base_data['education'] = dict(self.base_data['education'], **self.parsed_data['education'])
+            self.parsed_data['personal'] = dict(self.base_data['personal'])
+            print("✓ Using structured resume input (parsing skipped)")
+            source = 'structured'
+        elif self.parse_cache is not None:
+            hits = self.parse_cache.hits
+            self.parsed_data = self.parse_cache.parse(chatgpt_text, self.base_data)
+            source = 'cache' if self.parse_cache.hits > hits else 'text'
+        else:
+            self.parsed_data = parse_chatgpt_output(chatgpt_text, self.base_data)
+            source = 'text'
+        # Part of the load stage; kept separately so parsing can be told apart from file I/O
+        self.metrics['parse'] = {'seconds': time.perf_counter() - parse_started, 'source': source}
         
         print(self.parsed_data)
-        print("✓ Files loaded and parsed successfully")
+        self._input_loaded = {
+            'base_data': copy.deepcopy(self.base_data),
+            'parsed_data': ParsedResume.from_dict(self.parsed_data),
+        }
+
+    def _structured_resume(self):
+        """Structured resume from config 'resume' or a .json input file, else None."""
+        if self.config and isinstance(self.config.get('resume'), dict):
+            return self.config['resume']
+        if self.chatgpt_file and self.chatgpt_file.lower().endswith('.json'):
+            return load_resume_file(self.chatgpt_file)
+        return None
+
+    # Word content types whose parts can carry visible text
+    TEXT_PART_TYPES = ('header+xml', 'footer+xml', 'footnotes+xml', 'endnotes+xml', 'comments+xml')
+
+    def _read_template_part(self, part_name):
+        """Read a part of the template folder (or pack) as text, None if missing."""
+        if self.template_pack is not None:
+            if part_name not in self.template_pack:
+                return None
+            return self.template_pack.read_text(part_name)
+
+        path = os.path.join(self.template_folder, *part_name.split('/'))
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def _list_xml_parts(self):
+        """List the XML parts referenced by [Content_Types].xml and the document rels."""
+        parts = set()
+
+        content_types = self._read_template_part('[Content_Types].xml')
+        if content_types:
+            for element in ET.fromstring(content_types):
+                part_name = element.get('PartName', '').lstrip('/')
+                content_type = element.get('ContentType', '')
+                if part_name and content_type.endswith(self.TEXT_PART_TYPES):
+                    parts.add(part_name)
+
+        rels = self._read_template_part('word/_rels/document.xml.rels')
+        if rels:
+            for element in ET.fromstring(rels):
+                target = element.get('Target', '')
+                if element.get('TargetMode') == 'External' or not target.endswith('.xml'):
+                    continue
+                if target.startswith('/'):
+                    parts.add(target.lstrip('/'))
+                else:
+                    parts.add(posixpath.normpath(posixpath.join('word', target)))
+
+        parts.discard(DOCUMENT_PART)
+        return sorted(parts)
+
+    def _discover_parts(self):
+        """Find every non-document XML part holding resume tags.
+
+        Tagged parts are normalized and kept for rendering. Packaging copies
+        every other part untouched (raw ZIP entries, or the working-copy file),
+        so nothing needs to be remembered about them.
+        """
+        self.rendered_parts = {}
+
+        for part_name in self._list_xml_parts():
+            part_xml = self._read_template_part(part_name)
+            if part_xml is None:
+                continue
+            part_xml, fixups = normalize_template(part_xml)
+            if index_tags(part_xml):
+                for fixup in fixups:
+                    print(f"🔧 {part_name}: {fixup}")
+                self.rendered_parts[part_name] = part_xml
+
+        if self.rendered_parts:
+            print(f"✓ Tagged parts: {', '.join(self.rendered_parts)}")
+
+    def _hash_template(self):
+        """SHA-256 over the normalized template document and its tagged parts."""
+        digest = hashlib.sha256(self.xml_content.encode('utf-8'))
+        for part_name in sorted(self.rendered_parts):
+            digest.update(part_name.encode('utf-8'))
+            digest.update(self.rendered_parts[part_name].encode('utf-8'))
+        return digest.hexdigest()
 
     def _validate_data(self):
         """Validate parsed data."""
@@ -106,6 +332,57 @@ class ResumeProcessor:
         self._process_skill_block()
         self._check_remaining_tags()
 
+    def _fit_layout(self):
+        """Estimate the page count; with config 'auto_fit', drop trailing bullets until it fits.
+
+        Only the estimate is used, so a resume that spilled over no longer needs
+        a second PDF conversion after trimming. Without auto_fit the estimate is
+        advisory: if it fails, generation goes on with a warning.
+        """
+        config = self.config or {}
+        max_pages = int(config.get('max_pages', 1))
+        styles_xml = self._read_template_part('word/styles.xml')
+        try:
+            estimate = estimate_layout(self.xml_content, styles_xml)
+        except Exception as e:
+            if config.get('auto_fit'):
+                raise
+            print(f"⚠ Could not estimate the page count: {e}")
+            self.metrics['layout'] = {'error': str(e)}
+            return
+
+        trimmed = []
+        while config.get('auto_fit') and estimate['pages'] > max_pages:
+            dropped = trim_one_bullet(self.parsed_data['experiences'])
+            if dropped is None:
+                break
+            trimmed.append(dropped)
+            self._rerender()
+            estimate = estimate_layout(self.xml_content, styles_xml)
+
+        for company, bullet in trimmed:
+            print(f"✂ Dropped bullet from {company}: {bullet[:60]}")
+        if trimmed:
+            # The re-rendered parts replace the ones check_xml passed
+            self._check_all_well_formed()
+        fits = estimate['pages'] <= max_pages
+        print(f"{'📐' if fits else '⚠'} Estimated {estimate['pages']} page(s), "
+              f"last page {estimate['last_page_fill']:.0%} full")
+
+        self.metrics['layout'] = {
+            'pages': estimate['pages'],
+            'last_page_fill': estimate['last_page_fill'],
+            'fits': fits,
+            'trimmed_bullets': len(trimmed),
+        }
+
+    def _rerender(self):
+        """Render again from the loaded template (quietly) after the data changed."""
+        self.xml_content = self._template_loaded['xml_content']
+        self.rendered_parts = dict(self._template_loaded['rendered_parts'])
+        with contextlib.redirect_stdout(io.StringIO()):
+            self._process_xml()
+
     def _replace_simple_tags(self):
         """Replace simple one-to-one tags."""
         replacements = {
@@ -119,13 +396,29 @@ class ResumeProcessor:
             '<resume_education_date>': self.base_data['education'].get('graduation_year', '')
         }
         
-        for tag, value in replacements.items():
-            if tag in self.xml_content:
-                self.xml_content = self.xml_content.replace(tag, self._escape_xml(value))
+        # One indexed scan per part finds every tag, one substitution pass replaces them
+        found_tags = set(index_tags(self.xml_content))
+        for part_xml in self.rendered_parts.values():
+            found_tags.update(index_tags(part_xml))
+
+        for tag in replacements:
+            if tag in found_tags:
                 print(f"✓ Replaced {tag}")
             else:
                 print(f"⚠ Tag not found: {tag}")
 
+        escaped = {tag: self._escape_xml(value) for tag, value in replacements.items()}
+        self.xml_content = self._substitute_tags(self.xml_content, escaped)
+        for part_name, part_xml in self.rendered_parts.items():
+            self.rendered_parts[part_name] = self._substitute_tags(part_xml, escaped)
+
+    def _substitute_tags(self, xml_text, escaped):
+        """Replace every known tag of a part in a single pass."""
+        return TAG_RE.sub(
+            lambda match: escaped.get(match.group(0), match.group(0)),
+            xml_text
+        )
+
     def _process_company_block(self):
         """Find and replace the company block template."""
         block_info = self._find_company_block()
@@ -332,36 +625,84 @@ class ResumeProcessor:
         return text
 
     def _check_remaining_tags(self):
-        """Check for any remaining resume tags."""
-        remaining_tags = re.findall(r'<resume_[^>]+>', self.xml_content)
+        """Check for any remaining resume tags and escape them back to literal text."""
+        remaining_tags = TAG_RE.findall(self.xml_content)
+        for part_xml in self.rendered_parts.values():
+            remaining_tags.extend(TAG_RE.findall(part_xml))
         
         if remaining_tags:
             print(f"⚠ {len(remaining_tags)} tags not replaced: {remaining_tags}")
+            # A raw <resume_x> is an unclosed element; as text it is harmless
+            self.xml_content = escape_tags(self.xml_content)
+            for part_name, part_xml in self.rendered_parts.items():
+                self.rendered_parts[part_name] = escape_tags(part_xml)
         else:
             print("✓ All tags replaced successfully")
 
+    def _check_all_well_formed(self):
+        """Fail fast if any rendered part is not well-formed."""
+        self._check_well_formed(DOCUMENT_PART, self.xml_content)
+        for part_name, part_xml in self.rendered_parts.items():
+            self._check_well_formed(part_name, part_xml)
+
+        print("✓ Rendered XML is well-formed")
+
+    def _check_well_formed(self, part_name, xml_text):
+        """Check one rendered part with a streaming expat pass.
+
+        This is far cheaper than finding out after packaging and a
+        LibreOffice conversion attempt.
+        """
+        parser = expat.ParserCreate()
+        try:
+            parser.Parse(xml_text.encode('utf-8'), True)
+        except expat.ExpatError as e:
+            # expat may report the line after a trailing newline
+            lines = xml_text.split('\n')
+            line = lines[e.lineno - 1] if 0 < e.lineno <= len(lines) else ''
+            # expat counts the column in characters (not UTF-8 bytes), so it indexes the str
+            context = line[max(0, e.offset - 60):e.offset + 60]
+            raise ValueError(
+                f"Rendered {part_name} is not well-formed: "
+                f"{expat.errors.messages[e.code]} at line {e.lineno}, column {e.offset + 1}\n"
+                f"  near: {context}"
+            )
+
     def _save_output(self):
-        """Save processed XML to file."""
-        output_path = os.path.join(self.template_folder, "word", "document.xml")
+        """Save processed XML into the working copy."""
+        output_path = os.path.join(self.temp_working_folder, "word", "document.xml")
         
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(self.xml_content)
         
         file_size = os.path.getsize(output_path)
         print(f"✓ Output saved: {output_path} ({file_size:,} bytes)")
+
+        for part_name, part_xml in self.rendered_parts.items():
+            part_path = os.path.join(self.temp_working_folder, *part_name.split('/'))
+            with open(part_path, 'w', encoding='utf-8') as f:
+                f.write(part_xml)
+            print(f"✓ Part saved: {part_name}")
         
         return output_path
 
     def _create_working_copy(self):
         """Create a working copy of the template folder."""
-        self.temp_working_folder = tempfile.mkdtemp(prefix="resume_")
+        if self.template_pack is not None:
+            expected_bytes = self.template_pack.size
+        else:
+            expected_bytes = folder_size(self.template_folder)
+        self.temp_working_folder = get_workspace_manager().acquire(expected_bytes)
         
         print(f"📁 Creating working copy: {self.temp_working_folder}")
-        shutil.copytree(
-            self.template_folder,
-            self.temp_working_folder,
-            dirs_exist_ok=True
-        )
+        if self.template_pack is not None:
+            self.template_pack.extract_to(self.temp_working_folder)
+        else:
+            shutil.copytree(
+                self.template_folder,
+                self.temp_working_folder,
+                dirs_exist_ok=True
+            )
         
         # Verify document.xml exists
         doc_xml_path = os.path.join(self.temp_working_folder, "word", "document.xml")
@@ -371,22 +712,118 @@ class ResumeProcessor:
         file_count = self._count_files()
         print(f"✓ Created working copy with {file_count} files")
 
+    def _release_working_copy(self):
+        """Delete the working copy (the DOCX has been written or the job failed)."""
+        if self.temp_working_folder:
+            get_workspace_manager().release(self.temp_working_folder)
+            self.temp_working_folder = None
+
     def _count_files(self):
         """Count files in working folder."""
         return sum(len(files) for _, _, files in os.walk(self.temp_working_folder))
 
+    @staticmethod
+    def _find_template_docx(template_folder, config):
+        """Locate the template .docx (config 'template_docx' or <template_folder>.docx)."""
+        template_docx = config.get('template_docx') if config else None
+        if not template_docx and template_folder:
+            template_docx = template_folder.rstrip('/\\') + '.docx'
+        if template_docx and os.path.exists(template_docx):
+            return template_docx
+        return None
+
+    @staticmethod
+    def _folder_signature(folder):
+        """Paths, sizes and mtimes of a template folder's files (what collect_template_files reads)."""
+        entries = []
+        for dirpath, _, filenames in os.walk(folder):
+            for filename in filenames:
+                if filename.endswith('.backup'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                stat = os.stat(path)
+                entries.append((path, stat.st_size, stat.st_mtime_ns))
+        return tuple(sorted(entries))
+
+    def _template_docx_source(self):
+        """Template .docx to package from: its snapshot bytes if given, else the path."""
+        if self.template_docx_data is not None:
+            return self.template_docx_data
+        return self.template_docx
+
+    def _template_docx_drift(self):
+        """Template files that differ from the template .docx: (changed parts, removed members).
+
+        The extracted folder (or the pack built from it) is what gets edited, so
+        it wins: only .docx entries identical to it are raw-copied. The result
+        is cached until the folder, pack generation or .docx changes.
+        """
+        if self.template_pack is not None:
+            signature = ('pack', self.template_pack.generation)
+            read_files = lambda: {name: self.template_pack.get(name) for name in self.template_pack.names()}
+        elif self.template_folder and os.path.isdir(self.template_folder):
+            signature = self._folder_signature(self.template_folder)
+            read_files = lambda: collect_template_files(self.template_folder)
+        else:
+            # Only the .docx exists
+            return {}, set()
+
+        if self.template_docx_data is not None:
+            signature = (signature, 'data', len(self.template_docx_data), zlib.crc32(self.template_docx_data))
+        else:
+            docx_stat = os.stat(self.template_docx)
+            signature = (signature, docx_stat.st_size, docx_stat.st_mtime_ns)
+        key = (os.path.abspath(self.template_docx), self.template_folder)
+        cached = _template_drift_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        changed, removed = template_drift(self._template_docx_source(), read_files(), ignore={DOCUMENT_PART})
+        if changed or removed:
+            print(f"🔧 {self.template_folder} differs from {self.template_docx} "
+                  f"({len(changed)} changed, {len(removed)} removed parts); using the folder's version")
+        _template_drift_cache[key] = (signature, (changed, removed))
+        return changed, removed
+
+    def _output_docx_path(self):
+        """Return output/<folder_name>/resume.docx, or None without a folder name."""
+        output_folder_name = self.config.get('folder_name', '').strip() if self.config else ''
+        if not output_folder_name:
+            return None
+
+        output_dir = os.path.join("output", output_folder_name)
+        os.makedirs(output_dir, exist_ok=True)
+        return os.path.join(output_dir, "resume.docx")
+
+    def _create_docx_from_template(self):
+        """Create DOCX by raw-copying unchanged entries of the template .docx.
+
+        Only the rendered XML parts (and template files edited since the
+        .docx was saved) are compressed; styles, fonts and media are copied
+        byte-for-byte without decompression.
+        """
+        print(f"\n📦 Creating DOCX file from {self.template_docx}...")
+
+        output_docx = self._output_docx_path()
+        if output_docx:
+            changed, removed = self._template_docx_drift()
+            rendered = dict(changed)
+            rendered[DOCUMENT_PART] = self.xml_content
+            rendered.update(self.rendered_parts)
+            stats = write_docx(self._template_docx_source(), output_docx, rendered, omit=removed)
+
+            print(f"✓ Copied {stats['copied']} unchanged parts ({stats['copied_bytes']:,} bytes), "
+                  f"compressed {stats['compressed']} rendered parts")
+            print(f"✓ DOCX created: {output_docx}")
+            return output_docx
+
     def _create_docx_from_folder(self):
         """Create DOCX file from the working folder."""
         print("\n📦 Creating DOCX file...")
         
-        output_folder_name = self.config.get('folder_name', '').strip() if self.config else ''
+        output_docx = self._output_docx_path()
 
-        if output_folder_name:
-            # Use custom folder name
-            output_dir = os.path.join("output", output_folder_name)
-            os.makedirs(output_dir, exist_ok=True)
-            output_docx = os.path.join(output_dir, "resume.docx")
-        
+        if output_docx:
             # Find WinRAR executable
             winrar_path = self._find_winrar()
             if not winrar_path:
@@ -404,7 +841,8 @@ class ResumeProcessor:
                 os.path.join(self.temp_working_folder, "*"),
             ]
             
-            # Execute command
+            # Execute command (subprocess is only needed on this fallback path)
+            import subprocess
             result = subprocess.run(
                 cmd,
                 stdout=subprocess.PIPE,
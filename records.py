@@ -0,0 +1,187 @@
+"""
+Compact typed records for parsed resumes
+
+parse_chatgpt_output returns nested dicts; holding tens of thousands of those
+(batch fan-out, caches) costs a dict per experience and per resume. These
+frozen, slotted records use tuples instead, intern repeated short strings
+(company, role, dates, ...), hash their content stably and serialize to
+compact JSON. Records also answer the old dict lookups (record['company'],
+record.get('bullets')), and to_dict() gives back the exact dict shape.
+"""
+import hashlib
+import json
+import sys
+from dataclasses import dataclass
+
+# Bumped when the serialized layout changes
+RECORD_VERSION = 1
+
+
+def _intern(value):
+    """Intern short repeated strings (company names, dates, roles ...)."""
+    return sys.intern(value) if isinstance(value, str) and len(value) <= 64 else value
+
+
+class _Record:
+    """Dict-style read access and pickling for the frozen, slotted records."""
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.__slots__
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __reduce__(self):
+        # Frozen + __slots__ cannot use the default setattr-based unpickling
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
+
+@dataclass(frozen=True)
+class Personal(_Record):
+    """Contact line of a resume (empty string = not found)."""
+    __slots__ = ('name', 'location', 'email', 'phone', 'linkedin')
+    name: str
+    location: str
+    email: str
+    phone: str
+    linkedin: str
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(*(_intern(data.get(name, '')) for name in cls.__slots__))
+
+    def to_dict(self):
+        # The parser only sets the keys it found
+        return {name: getattr(self, name) for name in self.__slots__ if getattr(self, name)}
+
+    def __getitem__(self, key):
+        value = _Record.__getitem__(self, key)
+        if not value:
+            raise KeyError(key)
+        return value
+
+
+@dataclass(frozen=True)
+class Experience(_Record):
+    """One company block."""
+    __slots__ = ('company', 'dates', 'role', 'location', 'bullets')
+    company: str
+    dates: str
+    role: str
+    location: str
+    bullets: tuple
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            _intern(data.get('company', '')), _intern(data.get('dates', '')),
+            _intern(data.get('role', '')), _intern(data.get('location', '')),
+            tuple(data.get('bullets', ())),
+        )
+
+    def to_dict(self):
+        return {
+            'company': self.company, 'dates': self.dates, 'role': self.role,
+            'location': self.location, 'bullets': list(self.bullets),
+        }
+
+
+@dataclass(frozen=True)
+class SkillCategory(_Record):
+    """One skills line, e.g. 'Technical': 'Python, Java, AWS'."""
+    __slots__ = ('name', 'skills')
+    name: str
+    skills: str
+
+
+@dataclass(frozen=True)
+class ParsedResume(_Record):
+    """Everything parse_chatgpt_output extracts from one ChatGPT answer."""
+    __slots__ = ('personal', 'summary', 'skills', 'experiences', 'education')
+    personal: Personal
+    summary: str
+    skills: tuple
+    experiences: tuple
+    education: tuple  # (key, value) pairs copied from the base data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Record from the dict returned by parse_chatgpt_output."""
+        return cls(
+            Personal.from_dict(data.get('personal', {})),
+            data.get('summary', ''),
+            tuple(SkillCategory(_intern(name), skills) for name, skills in data.get('skills', {}).items()),
+            tuple(Experience.from_dict(exp) for exp in data.get('experiences', [])),
+            tuple((_intern(key), value) for key, value in (data.get('education') or {}).items()),
+        )
+
+    def to_dict(self):
+        """Fresh, mutable dict in the parse_chatgpt_output shape."""
+        return {
+            'personal': self.personal.to_dict(),
+            'summary': self.summary,
+            'skills': {skill.name: skill.skills for skill in self.skills},
+            'experiences': [exp.to_dict() for exp in self.experiences],
+            'education': dict(self.education),
+        }
+
+    def __getitem__(self, key):
+        # Old dict shape for the keys callers read as dicts
+        if key == 'personal':
+            return self.personal.to_dict()
+        if key == 'skills':
+            return {skill.name: skill.skills for skill in self.skills}
+        if key == 'education':
+            return dict(self.education)
+        return _Record.__getitem__(self, key)
+
+    def to_tuple(self):
+        """Nested tuples without field names (the serialized form)."""
+        return (
+            RECORD_VERSION,
+            tuple(getattr(self.personal, name) for name in Personal.__slots__),
+            self.summary,
+            tuple((skill.name, skill.skills) for skill in self.skills),
+            tuple((exp.company, exp.dates, exp.role, exp.location, exp.bullets) for exp in self.experiences),
+            self.education,
+        )
+
+    @classmethod
+    def from_tuple(cls, data):
+        version, personal, summary, skills, experiences, education = data
+        if version != RECORD_VERSION:
+            raise ValueError(f"Unsupported record version {version}")
+        return cls(
+            Personal(*(_intern(value) for value in personal)),
+            summary,
+            tuple(SkillCategory(_intern(name), value) for name, value in skills),
+            tuple(
+                Experience(_intern(c), _intern(d), _intern(r), _intern(l), tuple(bullets))
+                for c, d, r, l, bullets in experiences
+            ),
+            tuple((_intern(key), value) for key, value in education),
+        )
+
+    def dumps(self):
+        """Compact JSON bytes (no field names, no whitespace)."""
+        return json.dumps(self.to_tuple(), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    @classmethod
+    def loads(cls, data):
+        return cls.from_tuple(json.loads(data))
+
+    def content_hash(self):
+        """SHA-256 of the serialized form; stable across processes and runs."""
+        return hashlib.sha256(self.dumps()).hexdigest()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark - import time of the entry modules, with a budget
+
+Each module is imported in a fresh interpreter with `-X importtime`; the
+median cumulative time over several runs is compared against its budget.
+Headless modules must also not pull in tkinter or an optional PDF backend.
+Exits non-zero when a budget is exceeded, so it can gate CI.
+
+Usage:
+    python startup_bench.py                 # default budgets
+    python startup_bench.py --runs 9 --top 8
+    RESUME_STARTUP_BUDGET_MS=60 python startup_bench.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+# module -> budget in ms (cumulative import time, median of the runs)
+DEFAULT_BUDGETS_MS = {
+    'parser': 25,
+    'processor': 80,
+    'pdf_converter': 60,
+    'batch': 40,
+    'watch': 30,
+    'gui': 150,
+}
+
+# Modules a headless import must not load
+HEAVY_MODULES = ('tkinter', 'pypandoc', 'docx2pdf')
+HEADLESS = ('parser', 'processor', 'pdf_converter', 'batch', 'watch')
+
+
+def measure(module, cwd=None):
+    """One cold import of module.
+
+    Returns:
+        (cumulative ms, {imported module: self ms}, heavy modules that were loaded)
+    """
+    check = (
+        f"import {module}, sys; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', check],
+        capture_output=True, text=True, cwd=cwd,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip()}")
+
+    total_us = None
+    self_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name.rstrip()
+        self_times[name.strip()] = int(self_us) / 1000
+        if name == f' {module}':
+            total_us = int(cumulative_us)
+
+    heavy = [m for m in result.stdout.strip().split(',') if m]
+    return (total_us or 0) / 1000, self_times, heavy
+
+
+def run_benchmark(budgets, runs=5, top=5):
+    """Measure every module; returns a list of failure messages."""
+    failures = []
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    print(f"{'module':<16} {'median':>9} {'budget':>8}  heaviest imports")
+    for module, budget in budgets.items():
+        samples = []
+        heaviest = {}
+        for _ in range(runs):
+            total, self_times, heavy = measure(module, cwd=here)
+            samples.append(total)
+            for name, ms in self_times.items():
+                heaviest[name] = max(heaviest.get(name, 0), ms)
+
+        median = statistics.median(samples)
+        top_imports = sorted(heaviest.items(), key=lambda item: -item[1])[:top]
+        status = '✓' if median <= budget else '❌'
+        print(f"{status} {module:<14} {median:8.1f}ms {budget:6.0f}ms  "
+              + ', '.join(f"{name.strip()} {ms:.1f}" for name, ms in top_imports))
+
+        if median > budget:
+            failures.append(f"{module}: {median:.1f}ms over budget of {budget}ms")
+        if module in HEADLESS and heavy:
+            failures.append(f"{module}: headless import loaded {', '.join(heavy)}")
+
+    return failures
+
+
+def main():
+    """Command line interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Measure import time of the entry modules')
+    parser.add_argument('modules', nargs='*', help='Modules to measure (default: all)')
+    parser.add_argument('--runs', type=int, default=5, help='Cold imports per module')
+    parser.add_argument('--top', type=int, default=5, help='Heaviest imports to list')
+    parser.add_argument('--budget', type=float, help='One budget (ms) for every module')
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    if args.modules:
+        budgets = {m: budgets.get(m, DEFAULT_BUDGETS_MS['processor']) for m in args.modules}
+    override = args.budget or os.environ.get('RESUME_STARTUP_BUDGET_MS')
+    if override:
+        budgets = {m: float(override) for m in budgets}
+
+    failures = run_benchmark(budgets, runs=args.runs, top=args.top)
+    if failures:
+        print("\n❌ Startup budget exceeded:")
+        for failure in failures:
+            print(f"   • {failure}")
+        return 1
+
+    print("\n✓ All modules within their startup budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
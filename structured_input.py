@@ -0,0 +1,152 @@
+"""
+Structured resume input - JSON documents that skip heuristic text parsing
+
+Jobs from our own tooling already have the data parse_chatgpt_output would
+re-derive from text. They can pass a JSON document instead:
+
+    {
+      "personal": {"name": "Jane Roe", "location": "Austin, TX", "email": "...", "phone": "...", "linkedin": "..."},
+      "summary": "Engineer with ...",
+      "skills": {"Technical": "Python, Java, AWS", "Soft": "Leadership"},
+      "experiences": [
+        {"company": "Microsoft", "role": "Senior Engineer", "dates": "2023 - Present",
+         "location": "Redmond, WA", "bullets": ["Built ...", "Led ..."]}
+      ],
+      "education": {"university": "...", "edu_location": "...", "graduation_year": "2020"}
+    }
+
+The schema is compiled into a validator once; documents are then checked in
+a single pass and converted to the parse_chatgpt_output dict shape.
+"""
+import json
+
+STRING = {'type': 'string'}
+
+RESUME_SCHEMA = {
+    'type': 'object',
+    'required': ['experiences'],
+    'properties': {
+        'personal': {
+            'type': 'object',
+            'properties': {key: STRING for key in ('name', 'location', 'email', 'phone', 'linkedin')},
+        },
+        'summary': STRING,
+        'skills': {'type': 'object', 'values': STRING},
+        'experiences': {
+            'type': 'array',
+            'min_items': 1,
+            'items': {
+                'type': 'object',
+                'required': ['company'],
+                'properties': {
+                    'company': STRING,
+                    'role': STRING,
+                    'dates': STRING,
+                    'location': STRING,
+                    'bullets': {'type': 'array', 'items': STRING},
+                },
+            },
+        },
+        'education': {
+            'type': 'object',
+            'properties': {key: STRING for key in ('university', 'edu_location', 'graduation_year')},
+        },
+    },
+}
+
+
+class InvalidResumeError(ValueError):
+    """Raised when a structured resume does not match the schema."""
+
+
+def compile_schema(schema):
+    """Turn a schema into a validate(value, path) function.
+
+    Supports 'string', 'array' (items, min_items) and 'object' (properties,
+    required, values); objects with 'properties' reject unknown keys, which
+    catches typos like "bulets" that would otherwise silently render nothing.
+    """
+    kind = schema['type']
+
+    if kind == 'string':
+        def validate(value, path):
+            if not isinstance(value, str):
+                raise InvalidResumeError(f"{path}: expected a string, got {type(value).__name__}")
+        return validate
+
+    if kind == 'array':
+        item_validator = compile_schema(schema['items'])
+        min_items = schema.get('min_items', 0)
+
+        def validate(value, path):
+            if not isinstance(value, list):
+                raise InvalidResumeError(f"{path}: expected a list, got {type(value).__name__}")
+            if len(value) < min_items:
+                raise InvalidResumeError(f"{path}: needs at least {min_items} item(s)")
+            for index, item in enumerate(value):
+                item_validator(item, f"{path}[{index}]")
+        return validate
+
+    if kind == 'object':
+        properties = {key: compile_schema(sub) for key, sub in schema.get('properties', {}).items()}
+        values = compile_schema(schema['values']) if 'values' in schema else None
+        required = tuple(schema.get('required', ()))
+
+        def validate(value, path):
+            if not isinstance(value, dict):
+                raise InvalidResumeError(f"{path}: expected an object, got {type(value).__name__}")
+            for key in required:
+                if key not in value:
+                    raise InvalidResumeError(f"{path}: missing required key '{key}'")
+            for key, item in value.items():
+                if values is not None:
+                    values(item, f"{path}.{key}")
+                elif key in properties:
+                    properties[key](item, f"{path}.{key}")
+                else:
+                    raise InvalidResumeError(f"{path}: unknown key '{key}'")
+        return validate
+
+    raise ValueError(f"Unsupported schema type: {kind}")
+
+
+_validator = None
+
+
+def validate_resume(document):
+    """Validate a structured resume (the schema is compiled on first use only)."""
+    global _validator
+    if _validator is None:
+        _validator = compile_schema(RESUME_SCHEMA)
+    _validator(document, '$')
+
+
+def load_resume_file(path):
+    """Read a structured resume from a .json file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError as e:
+            raise InvalidResumeError(f"{path}: not valid JSON ({e})")
+
+
+def resume_to_parsed(document, input_data=None):
+    """Validated document -> the dict shape parse_chatgpt_output returns."""
+    validate_resume(document)
+    return {
+        # Like the parser, only the personal fields that are present
+        'personal': {key: value for key, value in document.get('personal', {}).items() if value},
+        'summary': document.get('summary', ''),
+        'skills': dict(document.get('skills', {})),
+        'experiences': [
+            {
+                'company': exp['company'],
+                'dates': exp.get('dates', ''),
+                'role': exp.get('role', ''),
+                'location': exp.get('location', ''),
+                'bullets': list(exp.get('bullets', [])),
+            }
+            for exp in document['experiences']
+        ],
+        'education': dict(document.get('education') or (input_data or {}).get('education', {})),
+    }
@@ -0,0 +1,152 @@
+"""
+Template normalizer - repair Word's split and escaped resume tags once at load time
+
+Word often stores a tag such as <resume_company_bullet> as several <w:r> runs
+(spell-check and revision ids split the text) and always escapes it as
+&lt;resume_company_bullet&gt;. The processor only looks for the literal tag,
+so the template is normalized before any lookup:
+
+1. adjacent runs with identical formatting that together spell a tag are merged
+2. escaped / oddly spelled tags are rewritten to the canonical <resume_x> form
+
+Only the tags in KNOWN_TAGS are rewritten. Any other &lt;resume_x&gt; stays
+escaped text: as raw markup it would be an unclosed element.
+"""
+import re
+
+# Canonical tag, as searched for by ResumeProcessor
+TAG_RE = re.compile(r'<resume_[a-z0-9_]+>')
+
+# Tags ResumeProcessor replaces; only these are canonicalized
+KNOWN_TAGS = frozenset({
+    'resume_person_name', 'resume_person_location', 'resume_person_email', 'resume_person_linkedin',
+    'resume_summary',
+    'resume_education_name', 'resume_education_location', 'resume_education_date',
+    'resume_company_name', 'resume_company_role', 'resume_company_location',
+    'resume_company_dates', 'resume_company_bullet',
+    'resume_skill_head', 'resume_skill_body',
+})
+
+# Any spelling of a tag: escaped brackets, inner spaces, mixed case
+LOOSE_TAG_RE = re.compile(r'(?:<|&lt;)\s*(resume_[A-Za-z0-9_]+)\s*(?:>|&gt;)', re.IGNORECASE)
+
+# One run, and the pieces of a "simple" run: optional rPr plus a single w:t
+RUN_RE = re.compile(r'<w:r(?:\s[^>]*)?>.*?</w:r>', re.DOTALL)
+SIMPLE_RUN_RE = re.compile(
+    r'(<w:r(?:\s[^>]*)?>)\s*(<w:rPr>.*?</w:rPr>)?\s*<w:t(?:\s[^>]*)?>((?:(?!</?w:t\b).)*)</w:t>\s*</w:r>$',
+    re.DOTALL
+)
+
+# Markup Word puts between the runs of a split word; dropped when merging
+IGNORABLE_GAP_RE = re.compile(r'^(?:\s|<w:proofErr\b[^>]*/>)*$')
+
+TAG_PREFIX = 'resume_'
+
+
+def _ends_inside_tag(text):
+    """Return True if text ends with an unfinished (possibly escaped) tag."""
+    if re.search(r'&(?:l(?:t)?)?$', text):
+        return True
+
+    canonical = text.replace('&lt;', '<').replace('&gt;', '>')
+    start = canonical.rfind('<')
+    if start == -1 or '>' in canonical[start:]:
+        return False
+
+    fragment = canonical[start + 1:].lstrip().lower()
+    return TAG_PREFIX.startswith(fragment) or fragment.startswith(TAG_PREFIX)
+
+
+def _merge_split_runs(xml_text, fixups):
+    """Merge runs that only together spell a tag."""
+    runs = list(RUN_RE.finditer(xml_text))
+    output = []
+    last_end = 0
+    i = 0
+
+    while i < len(runs):
+        match = runs[i]
+        simple = SIMPLE_RUN_RE.match(match.group(0))
+        if not simple or not _ends_inside_tag(simple.group(3)):
+            i += 1
+            continue
+
+        # Collect following runs until the tag is closed
+        open_tag, run_props, text = simple.group(1), simple.group(2) or '', simple.group(3)
+        group_end = i
+        texts = [text]
+        blocked = None
+        while _ends_inside_tag(''.join(texts)):
+            if group_end + 1 >= len(runs):
+                blocked = "tag is not closed"
+                break
+            gap = xml_text[runs[group_end].end():runs[group_end + 1].start()]
+            if not IGNORABLE_GAP_RE.match(gap):
+                blocked = "tag spans a paragraph or field boundary"
+                break
+            next_simple = SIMPLE_RUN_RE.match(runs[group_end + 1].group(0))
+            if not next_simple:
+                blocked = "tag continues in a complex run"
+                break
+            if (next_simple.group(2) or '') != run_props:
+                blocked = "formatting differs between runs"
+                break
+            texts.append(next_simple.group(3))
+            group_end += 1
+
+        if blocked:
+            fixups.append(f"⚠ Could not merge split tag near '{''.join(texts)[-40:]}': {blocked}")
+            i = group_end + 1
+            continue
+
+        merged = f'{open_tag}{run_props}<w:t xml:space="preserve">{"".join(texts)}</w:t></w:r>'
+        output.append(xml_text[last_end:match.start()])
+        output.append(merged)
+        last_end = runs[group_end].end()
+        fixups.append(f"Merged {group_end - i + 1} runs into '{''.join(texts)}'")
+        i = group_end + 1
+
+    output.append(xml_text[last_end:])
+    return ''.join(output)
+
+
+def _canonicalize_tags(xml_text, fixups):
+    """Rewrite escaped or misspelled known tags to <resume_x>."""
+    def canonical(match):
+        name = match.group(1).lower()
+        if name not in KNOWN_TAGS:
+            return match.group(0)
+        tag = f"<{name}>"
+        if match.group(0) != tag:
+            fixups.append(f"Canonicalized '{match.group(0)}' -> '{tag}'")
+        return tag
+
+    return LOOSE_TAG_RE.sub(canonical, xml_text)
+
+
+def normalize_template(xml_text):
+    """Normalize a template part.
+
+    Returns:
+        (normalized xml, list of human readable fix-ups applied)
+    """
+    fixups = []
+    if 'resume_' not in xml_text.lower():
+        return xml_text, fixups
+
+    xml_text = _merge_split_runs(xml_text, fixups)
+    xml_text = _canonicalize_tags(xml_text, fixups)
+    return xml_text, fixups
+
+
+def escape_tags(xml_text):
+    """Escape canonical tags back to &lt;resume_x&gt; text (for tags left unreplaced)."""
+    return TAG_RE.sub(lambda match: '&lt;' + match.group(0)[1:-1] + '&gt;', xml_text)
+
+
+def index_tags(xml_text):
+    """Index every canonical tag in one scan: {tag: [positions]}."""
+    index = {}
+    for match in TAG_RE.finditer(xml_text):
+        index.setdefault(match.group(0), []).append(match.start())
+    return index
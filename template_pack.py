@@ -0,0 +1,316 @@
+"""
+Template pack - load template parts once and share them between worker processes
+
+A pack is a single read-only byte layout holding every file of a template
+folder (document.xml, styles, media, ...). Workers attach to it zero-copy,
+either through multiprocessing.shared_memory or through an mmap'd pack file.
+
+Layout (little endian):
+    header   MAGIC(8) | format version(u16) | flags(u16) | generation(u64)
+             | total size(u64) | entry count(u32) | sha256 of data(32)
+    index    per entry: name length(u16) | name (utf-8) | offset(u64) | length(u64)
+    data     raw file bytes, offsets are relative to the start of the pack
+"""
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+MAGIC = b'RESPACK\x00'
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct('<8sHHQQI32s')
+INDEX_ENTRY = struct.Struct('<QQ')
+NAME_LEN = struct.Struct('<H')
+
+# Control segment for shared memory: magic | version | generation | data segment name
+CONTROL = struct.Struct('<8sHQ64s')
+CONTROL_MAGIC = b'RESCTRL\x00'
+# Longer names would be silently truncated by CONTROL
+MAX_SEGMENT_NAME = 64
+
+# The tagged source document lives outside the template folder
+DOCUMENT_PART = 'word/document.xml'
+
+# Segments created by publishers in this process (their tracker entry must stay)
+_owned_segments = set()
+
+
+class TemplatePackError(Exception):
+    """Raised when a pack is missing, corrupt or from an unknown format version."""
+
+
+def collect_template_files(template_folder, template_doc=None):
+    """Read every file of a template folder into {posix relative path: bytes}."""
+    entries = {}
+    for dirpath, _, filenames in os.walk(template_folder):
+        for filename in filenames:
+            if filename.endswith('.backup'):
+                continue
+            full_path = os.path.join(dirpath, filename)
+            rel_path = os.path.relpath(full_path, template_folder).replace(os.sep, '/')
+            with open(full_path, 'rb') as f:
+                entries[rel_path] = f.read()
+
+    # The tagged document.xml overrides the (rendered) copy inside the folder
+    if template_doc:
+        with open(template_doc, 'rb') as f:
+            entries[DOCUMENT_PART] = f.read()
+
+    return entries
+
+
+def build_pack(entries, generation=None):
+    """Serialize {name: bytes} into pack bytes."""
+    if generation is None:
+        generation = time.time_ns()
+
+    names = sorted(entries)
+    encoded_names = [name.encode('utf-8') for name in names]
+
+    index_size = sum(NAME_LEN.size + len(n) + INDEX_ENTRY.size for n in encoded_names)
+    data_start = HEADER.size + index_size
+
+    index = bytearray()
+    offset = data_start
+    for name, encoded in zip(names, encoded_names):
+        length = len(entries[name])
+        index += NAME_LEN.pack(len(encoded)) + encoded + INDEX_ENTRY.pack(offset, length)
+        offset += length
+
+    data = b''.join(entries[name] for name in names)
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, generation, offset, len(names),
+        hashlib.sha256(data).digest()
+    )
+    return header + bytes(index) + data
+
+
+def write_pack_file(template_folder, pack_path, template_doc=None):
+    """Build a pack file atomically so readers never see a half-written pack."""
+    pack = build_pack(collect_template_files(template_folder, template_doc))
+
+    pack_dir = os.path.dirname(os.path.abspath(pack_path))
+    os.makedirs(pack_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.respack_', dir=pack_dir)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(pack)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, pack_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    print(f"✓ Template pack written: {pack_path} ({len(pack):,} bytes)")
+    return pack_path
+
+
+class TemplatePack:
+    """Read-only, zero-copy view over a pack held in shared memory or an mmap."""
+
+    def __init__(self, buffer, owner=None, verify=False):
+        self._buffer = memoryview(buffer)
+        self._owner = owner
+        self.entries = {}
+
+        if len(self._buffer) < HEADER.size:
+            raise TemplatePackError("Pack too small for header")
+
+        magic, version, _, generation, total_size, count, digest = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise TemplatePackError("Not a template pack (bad magic)")
+        if version != FORMAT_VERSION:
+            raise TemplatePackError(f"Unsupported pack format version {version}")
+        if total_size > len(self._buffer):
+            raise TemplatePackError("Pack is truncated")
+
+        self.version = version
+        self.generation = generation
+        self.digest = digest
+        self.size = total_size
+
+        pos = HEADER.size
+        for _ in range(count):
+            (name_len,) = NAME_LEN.unpack_from(self._buffer, pos)
+            pos += NAME_LEN.size
+            name = bytes(self._buffer[pos:pos + name_len]).decode('utf-8')
+            pos += name_len
+            offset, length = INDEX_ENTRY.unpack_from(self._buffer, pos)
+            pos += INDEX_ENTRY.size
+            self.entries[name] = (offset, length)
+
+        if verify:
+            data = self._buffer[pos:total_size]
+            if hashlib.sha256(data).digest() != digest:
+                raise TemplatePackError("Pack checksum mismatch")
+
+    @classmethod
+    def open_file(cls, pack_path, verify=False):
+        """Map a pack file read-only."""
+        with open(pack_path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, owner=mapped, verify=verify)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def names(self):
+        """Return all part names in the pack."""
+        return list(self.entries)
+
+    def get(self, name):
+        """Return a zero-copy memoryview of a part."""
+        offset, length = self.entries[name]
+        return self._buffer[offset:offset + length]
+
+    def read_text(self, name, encoding='utf-8'):
+        """Decode a part as text (this copies, str cannot share the buffer)."""
+        return str(self.get(name), encoding)
+
+    def extract_to(self, folder):
+        """Write every part into a folder (used for working copies)."""
+        for name in self.entries:
+            target = os.path.join(folder, *name.split('/'))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(self.get(name))
+
+    def close(self):
+        """Release the view and the underlying mapping."""
+        self._buffer.release()
+        if self._owner is not None:
+            self._owner.close()
+            self._owner = None
+
+
+def _shared_memory():
+    """Import multiprocessing.shared_memory (Python 3.8+)."""
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        raise TemplatePackError("multiprocessing.shared_memory requires Python 3.8+")
+    return shared_memory
+
+
+def _attach_segment(name):
+    """Attach to an existing segment without letting this process unlink it on exit."""
+    shared_memory = _shared_memory()
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers with the resource tracker
+        segment = shared_memory.SharedMemory(name=name)
+        if name in _owned_segments:
+            return segment
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(segment._name, 'shared_memory')
+        except Exception:
+            pass
+        return segment
+
+
+class SharedTemplatePublisher:
+    """Owns the shared memory segments for one template name.
+
+    A small control segment (the template name) points at the current data
+    segment. Publishing a new version writes a fresh data segment first and
+    only then flips the control segment, so workers always attach to a
+    complete pack and in-flight readers keep their old mapping.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.control = None
+        self.current = None
+        self.generation = 0
+
+    def publish(self, template_folder, template_doc=None):
+        """Load a template folder once and publish it; returns the generation."""
+        shared_memory = _shared_memory()
+
+        generation = max(time.time_ns(), self.generation + 1)
+        pack = build_pack(collect_template_files(template_folder, template_doc), generation)
+
+        segment_name = f"{self.name}_{generation:x}"
+        encoded_name = segment_name.encode('utf-8')
+        if not segment_name.isascii() or len(encoded_name) > MAX_SEGMENT_NAME:
+            raise ValueError(
+                f"Shared template name '{self.name}' is too long or not ASCII: the data segment "
+                f"name '{segment_name}' must be at most {MAX_SEGMENT_NAME} ASCII characters"
+            )
+        segment = shared_memory.SharedMemory(name=segment_name, create=True, size=len(pack))
+        segment.buf[:len(pack)] = pack
+        _owned_segments.add(segment_name)
+
+        if self.control is None:
+            self.control = shared_memory.SharedMemory(name=self.name, create=True, size=CONTROL.size)
+            _owned_segments.add(self.name)
+        CONTROL.pack_into(
+            self.control.buf, 0,
+            CONTROL_MAGIC, FORMAT_VERSION, generation, encoded_name
+        )
+
+        # Old segment: unlinking keeps existing mappings valid for attached workers
+        previous = self.current
+        self.current = segment
+        self.generation = generation
+        if previous is not None:
+            previous.close()
+            previous.unlink()
+
+        print(f"✓ Published template '{self.name}' generation {generation:x} ({len(pack):,} bytes)")
+        return generation
+
+    def close(self):
+        """Unlink all segments owned by this publisher."""
+        for segment in (self.current, self.control):
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+        self.current = None
+        self.control = None
+
+
+def read_generation(name):
+    """Read the currently published generation and its data segment name."""
+    control = _attach_segment(name)
+    try:
+        magic, version, generation, segment_name = CONTROL.unpack_from(control.buf, 0)
+    finally:
+        control.close()
+
+    if magic != CONTROL_MAGIC:
+        raise TemplatePackError(f"Shared template '{name}' has no valid control block")
+    if version != FORMAT_VERSION:
+        raise TemplatePackError(f"Unsupported pack format version {version}")
+    return generation, segment_name.rstrip(b'\x00').decode('ascii')
+
+
+def attach_shared(name, retries=3):
+    """Attach (zero-copy) to the current published version of a template."""
+    for _ in range(retries):
+        generation, segment_name = read_generation(name)
+        try:
+            segment = _attach_segment(segment_name)
+        except FileNotFoundError:
+            # Swapped between reading the control block and attaching
+            continue
+
+        pack = TemplatePack(segment.buf, owner=segment)
+        if pack.generation == generation:
+            return pack
+        pack.close()
+
+    raise TemplatePackError(f"Shared template '{name}' kept changing while attaching")
+
+
+def is_current(name, pack):
+    """Return True if `pack` is still the published generation of `name`."""
+    generation, _ = read_generation(name)
+    return generation == pack.generation
@@ -0,0 +1,226 @@
+"""
+Template registry - many template styles, loaded on demand by name or hash
+
+Every extracted template folder below the templates root (a folder holding
+[Content_Types].xml) is a template named after the folder. Its tagged
+document is word/document.xml inside the folder; the original template1 keeps
+using input/document.xml. Templates are loaded and normalized on first use and
+kept in an LRU bounded by memory.
+
+Each cached template remembers the stat fingerprint of its files. When a file
+changes, the next lookup loads the new version and swaps it in under a lock.
+A CompiledTemplate snapshots every file of its version in memory (the
+folder as a TemplatePack, plus the template .docx bytes), and its processors
+render, estimate the layout and package from that snapshot. CompiledTemplate
+objects are never modified, so jobs that already hold the old version finish
+on it, even if the files change mid-job, while new jobs get the new one.
+"""
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_ROOT = "input"
+DEFAULT_TEMPLATE = "template1"
+# The first template predates the registry: its tagged document lives next to the folder
+LEGACY_DOCUMENTS = {DEFAULT_TEMPLATE: os.path.join(DEFAULT_ROOT, "document.xml")}
+
+DEFAULT_MAX_MB = int(os.environ.get('RESUME_TEMPLATE_CACHE_MB', '64'))
+# Minimum prefix length when a template is addressed by hash
+MIN_HASH_PREFIX = 8
+
+
+def _fingerprint(template_folder, template_doc):
+    """(path, mtime_ns, size) of the tagged document, the XML parts and the .docx."""
+    paths = [template_doc, template_folder.rstrip('/\\') + '.docx']
+    for dirpath, _, filenames in os.walk(template_folder):
+        paths.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(('.xml', '.rels')))
+
+    fingerprint = []
+    for path in sorted(paths):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        fingerprint.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
+
+
+class CompiledTemplate:
+    """One loaded (normalized, parts discovered) version of a template."""
+
+    def __init__(self, name, template_folder, template_doc, state, fingerprint, pack=None, docx_data=None):
+        self.name = name
+        self.template_folder = template_folder
+        self.template_doc = template_doc
+        self.state = state
+        self.template_hash = state['template_hash']
+        self.fingerprint = fingerprint
+        self.pack = pack
+        self.docx_data = docx_data
+        self.loaded_at = time.time()
+        self.size = sys.getsizeof(state['xml_content']) + sum(
+            sys.getsizeof(part) for part in state['rendered_parts'].values()
+        )
+        self.size += (pack.size if pack is not None else 0) + len(docx_data or b'')
+
+    def processor(self, chatgpt_file=None, config=None, **kwargs):
+        """ResumeProcessor that renders with this template version (no template load)."""
+        from processor import ResumeProcessor
+
+        # A job that names its own template .docx packages from that file instead
+        docx_data = None if (config or {}).get('template_docx') else self.docx_data
+        processor = ResumeProcessor(
+            template_doc=self.template_doc,
+            template_folder=self.template_folder,
+            chatgpt_file=chatgpt_file,
+            config=config,
+            template_pack=self.pack,
+            template_docx_data=docx_data,
+            **kwargs
+        )
+        processor.use_template_state(self.state)
+        return processor
+
+
+class TemplateRegistry:
+    """Name/hash lookup of templates with a memory-bounded LRU and hot reload."""
+
+    def __init__(self, root=DEFAULT_ROOT, max_mb=DEFAULT_MAX_MB, check_interval=1.0):
+        self.root = root
+        self.max_bytes = max_mb * 1024 * 1024
+        self.check_interval = check_interval
+        self._specs = {}
+        self._cache = OrderedDict()
+        self._checked = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self.loads = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    def register(self, name, template_folder, template_doc=None):
+        """Add a template that is not below the root (or override one)."""
+        self._specs[name] = (template_folder, template_doc or os.path.join(template_folder, 'word', 'document.xml'))
+
+    def _discover(self):
+        """{name: (folder, tagged document)} of the templates below the root."""
+        found = {}
+        try:
+            entries = list(os.scandir(self.root))
+        except OSError:
+            entries = []
+        for entry in entries:
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, '[Content_Types].xml')):
+                document = LEGACY_DOCUMENTS.get(entry.name)
+                if not document or not os.path.exists(document):
+                    document = os.path.join(entry.path, 'word', 'document.xml')
+                found[entry.name] = (entry.path, document)
+        found.update(self._specs)
+        return found
+
+    def names(self):
+        """Names of every available template."""
+        return sorted(self._discover())
+
+    def get(self, key=DEFAULT_TEMPLATE):
+        """Current version of a template, by name or by (a prefix of) its template hash."""
+        specs = self._discover() if key not in self._specs else self._specs
+        if key not in specs:
+            compiled = self._find_by_hash(key)
+            if compiled is None:
+                raise KeyError(f"Unknown template: {key}")
+            return compiled
+
+        name = key
+        template_folder, template_doc = specs[name]
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached is not None:
+                self._cache.move_to_end(name)
+                if time.monotonic() - self._checked.get(name, 0) < self.check_interval:
+                    return cached
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # One loader per template; other callers wait and reuse its result
+        with load_lock:
+            fingerprint = _fingerprint(template_folder, template_doc)
+            with self._lock:
+                cached = self._cache.get(name)
+                self._checked[name] = time.monotonic()
+                if cached is not None and cached.fingerprint == fingerprint:
+                    return cached
+
+            compiled = self._compile(name, template_folder, template_doc, fingerprint)
+
+            with self._lock:
+                if cached is not None:
+                    self.reloads += 1
+                    print(f"🔁 Template '{name}' changed, new jobs use {compiled.template_hash[:12]}")
+                self._cache[name] = compiled
+                self._cache.move_to_end(name)
+                self._evict()
+            return compiled
+
+    def _compile(self, name, template_folder, template_doc, fingerprint):
+        """Snapshot, load and normalize a template (outside the registry lock)."""
+        from processor import ResumeProcessor
+        from template_pack import TemplatePack, build_pack, collect_template_files
+
+        if not os.path.exists(template_doc):
+            raise FileNotFoundError(f"Template '{name}' has no tagged document: {template_doc}")
+        pack = TemplatePack(build_pack(collect_template_files(template_folder, template_doc)))
+        template_docx = ResumeProcessor._find_template_docx(template_folder, None)
+        docx_data = None
+        if template_docx:
+            with open(template_docx, 'rb') as f:
+                docx_data = f.read()
+
+        processor = ResumeProcessor(template_doc, template_folder, None, config={},
+                                    template_pack=pack, template_docx_data=docx_data)
+        state = processor.load_template_state()
+        self.loads += 1
+        return CompiledTemplate(name, template_folder, template_doc, state, fingerprint, pack, docx_data)
+
+    def _find_by_hash(self, key):
+        """Cached template whose hash starts with key (only loaded versions have a hash)."""
+        if len(key) < MIN_HASH_PREFIX:
+            return None
+        with self._lock:
+            for compiled in self._cache.values():
+                if compiled.template_hash.startswith(key):
+                    return compiled
+        return None
+
+    def _evict(self):
+        """Drop least recently used templates while over the memory limit (keep at least one)."""
+        total = sum(compiled.size for compiled in self._cache.values())
+        while total > self.max_bytes and len(self._cache) > 1:
+            _, compiled = self._cache.popitem(last=False)
+            total -= compiled.size
+            self.evictions += 1
+
+    def stats(self):
+        """Cache counters."""
+        with self._lock:
+            return {
+                'cached': len(self._cache),
+                'bytes': sum(compiled.size for compiled in self._cache.values()),
+                'loads': self.loads,
+                'reloads': self.reloads,
+                'evictions': self.evictions,
+            }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_template_registry():
+    """Process-wide registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = TemplateRegistry()
+        return _registry
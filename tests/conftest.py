@@ -0,0 +1,130 @@
+import os
+import sys
+
+# The modules live flat in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+# Smallest document.xml the processor can render: every block finder needs its anchors
+TEMPLATE_XML = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    ' xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml"><w:body>'
+    '<w:p w14:paraId="1"><w:r w:rsidR="1"><w:t><resume_person_name></w:t></w:r></w:p>'
+    '<w:p w14:paraId="2"><w:r w:rsidR="1"><w:t><resume_person_email></w:t></w:r></w:p>'
+    '<w:p w14:paraId="3"><w:r w:rsidR="1"><w:t><resume_summary></w:t></w:r></w:p>'
+    '<w:p w14:paraId="4"><w:r w:rsidR="1"><w:t><resume_skill_head></w:t></w:r>'
+    '<w:r w:rsidR="1"><w:t>: <resume_skill_body></w:t></w:r><w:r w:rsidR="1"><w:br/></w:r></w:p>'
+    '<w:p w14:paraId="5"><w:r w:rsidR="1"><w:t><resume_company_name> | <resume_company_role>'
+    ' | <resume_company_dates> | <resume_company_location></w:t></w:r></w:p>'
+    '<w:p w14:paraId="6"><w:r w:rsidR="1"><w:t><resume_company_bullet></w:t></w:r></w:p>'
+    '<w:p w14:paraId="7"><w:r w:rsidR="1"><w:t>EDUCATION</w:t></w:r></w:p>'
+    '<w:p w14:paraId="8"><w:r w:rsidR="1"><w:t><resume_education_name>, <resume_education_date></w:t></w:r></w:p>'
+    '</w:body></w:document>'
+)
+
+
+@pytest.fixture
+def template_xml():
+    return TEMPLATE_XML
+
+
+@pytest.fixture
+def parsed_resume():
+    return {
+        'personal': {'name': 'Jane Roe', 'email': 'jane@example.com'},
+        'summary': 'Engineer & builder of <things>',
+        'skills': {'Languages': 'Python, Go', 'Cloud': 'AWS, GCP'},
+        'experiences': [
+            {'company': 'PayPal', 'dates': '2020 - 2024', 'role': 'Engineer', 'location': 'Remote',
+             'bullets': ['Built the payments ledger used by every checkout flow', 'Cut p99 latency by 40%']},
+        ],
+        'education': {},
+    }
+
+
+@pytest.fixture
+def base_data(parsed_resume):
+    return {
+        'personal': parsed_resume['personal'],
+        'education': {'university': 'State University', 'graduation_year': '2019'},
+        'company': ['PayPal'],
+    }
+
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml"'
+    ' ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/header1.xml"'
+    ' ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.header+xml"/>'
+    '<Override PartName="/word/footer1.xml"'
+    ' ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.footer+xml"/>'
+    '</Types>'
+)
+DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="header" Target="header1.xml"/>'
+    '<Relationship Id="rId2" Type="footer" Target="footer1.xml"/>'
+    '<Relationship Id="rId3" Type="hyperlink" Target="https://example.com" TargetMode="External"/>'
+    '</Relationships>'
+)
+# Word splits and escapes the tag; the normalizer has to repair it
+HEADER_XML = (
+    '<w:hdr xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:p>'
+    '<w:r><w:t>&lt;resume_person_</w:t></w:r><w:r><w:t>email&gt;</w:t></w:r>'
+    '</w:p></w:hdr>'
+)
+FOOTER_XML = (
+    '<w:ftr xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:p>'
+    '<w:r><w:t>Page footer without tags</w:t></w:r></w:p></w:ftr>'
+)
+STYLES_XML = '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>'
+
+
+def write_template(root, template_xml=TEMPLATE_XML, docx=True):
+    """input/template1/ (+ template1.docx) and input/document.xml under root; returns their paths."""
+    import zipfile
+
+    files = {
+        '[Content_Types].xml': CONTENT_TYPES,
+        'word/_rels/document.xml.rels': DOCUMENT_RELS,
+        'word/document.xml': template_xml,
+        'word/header1.xml': HEADER_XML,
+        'word/footer1.xml': FOOTER_XML,
+        'word/styles.xml': STYLES_XML,
+        'word/media/image1.png': '\x89PNG fake image',
+    }
+    folder = root / 'input' / 'template1'
+    for name, content in files.items():
+        path = folder / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    (root / 'input' / 'document.xml').write_text(template_xml, encoding='utf-8')
+    if docx:
+        with zipfile.ZipFile(root / 'input' / 'template1.docx', 'w', zipfile.ZIP_DEFLATED) as z:
+            for name, content in files.items():
+                z.writestr(name, content)
+    return {
+        'template_doc': str(root / 'input' / 'document.xml'),
+        'template_folder': str(folder),
+        'template_docx': str(root / 'input' / 'template1.docx'),
+    }
+
+
+@pytest.fixture
+def template_files(tmp_path, monkeypatch):
+    """A template on disk, with tmp_path as the working directory (output/ goes there)."""
+    monkeypatch.chdir(tmp_path)
+    return write_template(tmp_path)
+
+
+@pytest.fixture
+def job_config(parsed_resume):
+    """Config of a job with a structured resume (no text parsing involved)."""
+    resume = {key: parsed_resume[key] for key in ('personal', 'summary', 'skills', 'experiences')}
+    return {'resume': resume, 'personal': parsed_resume['personal'], 'company': ['PayPal'],
+            'education': {'university': 'State University'}, 'folder_name': 'PayPal+SWE'}
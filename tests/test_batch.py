@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from batch import Journal, in_shard, job_id_for, load_manifest, parse_shard
+
+
+def test_job_id_is_stable_and_explicit_ids_win():
+    job = {'folder_name': 'Stripe+SWE', 'company': ['Stripe']}
+    assert job_id_for(job) == job_id_for(dict(reversed(list(job.items()))))
+    assert job_id_for(dict(job, job_id='stripe-01')) == 'stripe-01'
+
+
+def test_shards_partition_the_jobs():
+    assert parse_shard('2/4') == (2, 4)
+    for spec in ('0/4', '5/4', '1/0', 'x'):
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+    job_ids = [f'job-{i}' for i in range(200)]
+    shards = [[j for j in job_ids if in_shard(j, (i, 4))] for i in range(1, 5)]
+    assert sorted(sum(shards, [])) == sorted(job_ids)
+    assert all(shards)
+
+
+def test_manifest_skips_comments_and_reports_bad_lines(tmp_path):
+    manifest = tmp_path / 'jobs.jsonl'
+    manifest.write_text('# comment\n\n{"folder_name": "a"}\n')
+    assert load_manifest(str(manifest)) == [{'folder_name': 'a'}]
+
+    manifest.write_text('{"folder_name": "a"}\n{broken\n')
+    with pytest.raises(ValueError, match='jobs.jsonl:2'):
+        load_manifest(str(manifest))
+
+
+def test_journal_survives_a_torn_last_line(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = Journal(str(path))
+    journal.append({'job_id': 'a', 'status': 'done'})
+    journal.append({'job_id': 'b', 'status': 'failed'})
+    journal.close()
+    # Crash in the middle of writing the next record
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"job_id": "c", "sta')
+
+    journal = Journal(str(path))
+    assert set(journal.completed) == {'a'}
+    journal.append({'job_id': 'd', 'status': 'done'})
+    journal.close()
+
+    assert set(Journal(str(path)).completed) == {'a', 'd'}
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert json.loads(lines[-1]) == {'job_id': 'd', 'status': 'done'}
+
+
+def test_journal_survives_a_torn_multibyte_character(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = Journal(str(path))
+    journal.append({'job_id': 'a', 'status': 'done', 'company': 'Zürich AG'})
+    journal.close()
+    # Crash after the first byte of a two-byte UTF-8 character
+    with open(path, 'ab') as f:
+        f.write('{"job_id": "b", "company": "Mü'.encode('utf-8')[:-1])
+
+    journal = Journal(str(path))
+    assert set(journal.completed) == {'a'}
+    journal.append({'job_id': 'c', 'status': 'done'})
+    journal.close()
+
+    assert set(Journal(str(path)).completed) == {'a', 'c'}
+    last = path.read_bytes().splitlines()[-1]
+    assert json.loads(last) == {'job_id': 'c', 'status': 'done'}
+
+
+def test_empty_journal(tmp_path):
+    path = tmp_path / 'output' / 'journal.jsonl'
+    journal = Journal(str(path))
+    assert journal.completed == {}
+    journal.append({'job_id': 'a', 'status': 'done'})
+    journal.close()
+    assert path.read_text(encoding='utf-8') == '{"job_id": "a", "status": "done"}\n'
@@ -0,0 +1,100 @@
+import os
+import zipfile
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from catalog import Catalog, content_hash_of_docx, content_hash_of_xml, record_job
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = Catalog(str(tmp_path / 'catalog.db'))
+    yield catalog
+    catalog.close()
+
+
+def make_docx(path, document_xml):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with zipfile.ZipFile(path, 'w') as z:
+        z.writestr('word/document.xml', document_xml)
+    return str(path)
+
+
+def entry(job_id, folder='PayPal+SWE', content_hash='c1', created_at=1000.0, **extra):
+    row = {
+        'job_id': job_id, 'folder': folder, 'docx_path': f'output/{folder}/resume.docx',
+        'content_hash': content_hash, 'template_hash': 't1', 'created_at': created_at,
+        'target_companies': [folder.split('+')[0]], 'companies': ['Stripe'],
+    }
+    row.update(extra)
+    return row
+
+
+def test_lookup_by_company_hash_and_date(catalog):
+    catalog.record(entry('a', created_at=1000.0, timings={'convert': 1.5}))
+    catalog.record(entry('b', folder='Meta+SWE', content_hash='c2', created_at=2000.0))
+
+    assert [r['job_id'] for r in catalog.find_by_company('  paypal ')] == ['a']
+    assert [r['job_id'] for r in catalog.find_by_company('STRIPE')] == ['a', 'b']
+    assert [r['job_id'] for r in catalog.find_by_hash('c2')] == ['b']
+    assert [r['job_id'] for r in catalog.find_by_hash('t1')] == ['a', 'b']
+    assert [r['job_id'] for r in catalog.find_by_date(since=1500)] == ['b']
+    assert [r['job_id'] for r in catalog.find_by_date(until=datetime.fromtimestamp(1500))] == ['a']
+
+    row = catalog.find_by_hash('c1')[0]
+    assert row['timings'] == {'convert': 1.5}
+    assert row['companies'] == ['Stripe', 'PayPal']
+
+
+def test_recording_a_job_again_replaces_its_row(catalog):
+    catalog.record(entry('a', companies=['Stripe']))
+    catalog.record(entry('a', companies=['Square']))
+    rows = catalog.find_by_hash('c1')
+    assert len(rows) == 1 and rows[0]['companies'] == ['Square', 'PayPal']
+    assert catalog.find_by_company('Stripe') == []
+
+
+def test_duplicate_content_is_found_by_hash(catalog):
+    catalog.record(entry('a', folder='PayPal+SWE'))
+    catalog.record(entry('b', folder='Meta+SWE'))
+    assert {r['folder'] for r in catalog.find_by_hash('c1')} == {'PayPal+SWE', 'Meta+SWE'}
+
+
+def test_rebuild_skips_recorded_artifacts(catalog, tmp_path):
+    output = tmp_path / 'output'
+    recorded = make_docx(output / 'PayPal+SWE' / 'resume.docx', '<doc>a</doc>')
+    make_docx(output / 'Meta+SWE' / 'resume.docx', '<doc>b</doc>')
+    catalog.record(entry('a', docx_path=recorded))
+
+    assert catalog.rebuild(str(output)) == 1
+    assert catalog.rebuild(str(output)) == 0
+    assert [r['folder'] for r in catalog.find_by_company('Meta')] == ['Meta+SWE']
+
+
+def test_record_job_hashes_the_packaged_docx(catalog, tmp_path):
+    # The packaged XML can differ from the processor's copy (e.g. a folder-zipped docx)
+    docx_path = make_docx(tmp_path / 'out' / 'resume.docx', '<?xml version="1.0"?><doc/>')
+    processor = SimpleNamespace(
+        config={'folder_name': 'PayPal+SWE'}, metrics={}, job_id='job-1',
+        xml_content='<doc/>', template_hash='t1', timings={},
+        parsed_data={'experiences': [{'company': 'Stripe'}]},
+    )
+
+    recorded = record_job(processor, docx_path, catalog=catalog)
+    assert recorded['content_hash'] == content_hash_of_docx(docx_path)
+    assert recorded['content_hash'] != content_hash_of_xml(processor.xml_content)
+    assert catalog.find_by_hash(recorded['content_hash'])[0]['job_id'] == 'job-1'
+
+
+def test_ignored_preset_is_recorded_as_a_plain_export(catalog, tmp_path):
+    docx_path = make_docx(tmp_path / 'out' / 'resume.docx', '<doc/>')
+    pdf_path = tmp_path / 'out' / 'resume.pdf'
+    pdf_path.write_bytes(b'%PDF')
+    processor = SimpleNamespace(
+        config={'folder_name': 'PayPal+SWE'}, job_id='job-1', template_hash='t1', timings={},
+        parsed_data={'experiences': []},
+        metrics={'conversion': {'backend': 'pypandoc', 'preset': 'print', 'preset_ignored': True}},
+    )
+    assert record_job(processor, docx_path, str(pdf_path), catalog=catalog)['pdf_preset'] == 'default'
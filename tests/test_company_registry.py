@@ -0,0 +1,107 @@
+import pytest
+
+from company_registry import CompanyRegistry, normalize_company
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / 'company.db'), tmp_path / 'company.txt'
+
+
+def open_registry(paths):
+    db_path, legacy_file = paths
+    return CompanyRegistry(db_path, str(legacy_file))
+
+
+def test_normalize_company():
+    assert normalize_company('  Pay   Pal\t') == 'pay pal'
+    assert normalize_company('STRASSE') == normalize_company('straße')
+
+
+def test_claim_is_case_insensitive_and_logged(paths):
+    registry = open_registry(paths)
+    assert registry.claim('PayPal')
+    assert not registry.claim('  paypal ')
+    assert 'PAYPAL' in registry and len(registry) == 1
+    assert paths[1].read_text() == 'PayPal\n'
+    with pytest.raises(ValueError):
+        registry.claim('   ')
+
+
+def test_last_line_without_newline_is_imported(paths):
+    paths[1].write_text('Amazon\nGoogle')
+    registry = open_registry(paths)
+    assert 'Google' in registry and 'Amazon' in registry
+
+    registry.claim('Stripe')
+    assert paths[1].read_text() == 'Amazon\nGoogle\nStripe\n'
+
+
+def test_import_resumes_after_the_last_offset(paths):
+    paths[1].write_text('Amazon\n')
+    registry = open_registry(paths)
+    registry.close()
+
+    with open(paths[1], 'a') as f:
+        f.write('Netflix\nMeta\n')
+    registry = open_registry(paths)
+    assert len(registry) == 3
+    assert registry.import_file(str(paths[1])) == 0
+
+
+def test_extended_unterminated_line_is_read_whole(paths):
+    paths[1].write_text('Amazon\nGoo')
+    registry = open_registry(paths)
+    with open(paths[1], 'a') as f:
+        f.write('gle\n')
+    registry.import_file(str(paths[1]))
+    assert 'Google' in registry
+
+
+def test_truncated_file_is_imported_again(paths):
+    paths[1].write_text('Amazon\nGoogle\nNetflix\n')
+    open_registry(paths).close()
+
+    paths[1].write_text('Zoom\n')
+    registry = open_registry(paths)
+    assert 'Zoom' in registry and len(registry) == 4
+
+
+def test_two_connections_cannot_claim_the_same_company(paths):
+    first, second = open_registry(paths), open_registry(paths)
+    assert first.claim('Stripe', source='worker-1')
+    assert not second.claim('stripe', source='worker-2')
+    assert paths[1].read_text() == 'Stripe\n'
+
+
+def test_same_size_rewrite_is_imported_again(paths):
+    paths[1].write_text('Amazon\nGoogle\n')
+    open_registry(paths).close()
+
+    paths[1].write_text('Zillow\nGitLab\n')
+    registry = open_registry(paths)
+    assert 'Zillow' in registry and 'GitLab' in registry
+
+
+def test_larger_rewrite_is_imported_again(paths):
+    paths[1].write_text('Amazon\n')
+    open_registry(paths).close()
+
+    paths[1].write_text('Zillow\nGitLab\nStripe\n')
+    registry = open_registry(paths)
+    assert all(name in registry for name in ('Zillow', 'GitLab', 'Stripe'))
+    assert registry.import_file(str(paths[1])) == 0
+
+
+def test_database_without_fingerprints_is_upgraded(paths):
+    import sqlite3
+    db_path, legacy_file = paths
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE imports (path TEXT PRIMARY KEY, offset INTEGER NOT NULL)")
+    conn.execute("INSERT INTO imports VALUES (?, ?)", (str(legacy_file), 7))
+    conn.commit()
+    conn.close()
+
+    legacy_file.write_text('Amazon\nGoogle\n')
+    registry = open_registry(paths)
+    assert 'Amazon' in registry and 'Google' in registry
@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+import conversion_policy
+from conversion_policy import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, RetryPolicy
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic() for the breaker."""
+    now = [1000.0]
+    monkeypatch.setattr(conversion_policy.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.state == CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    clock[0] += 59.9
+    assert not breaker.allow()
+
+    clock[0] += 0.1
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=10)
+    for _ in range(5):
+        breaker.record_failure()
+    clock[0] += 10
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock[0] += 9
+    assert not breaker.allow()
+
+
+def test_timeout_uses_default_until_enough_samples():
+    policy = RetryPolicy(default_timeout=30, min_samples=3, min_timeout=1, max_timeout=100)
+    policy.record_latency('libreoffice', 2.0)
+    policy.record_latency('libreoffice', 4.0)
+    assert policy.timeout_for('libreoffice') == 30
+
+    policy.record_latency('libreoffice', 3.0)
+    assert policy.percentile('libreoffice', 50) == 3.0
+    assert policy.timeout_for('libreoffice') == 8.0
+    assert policy.timeout_for('docx2pdf') == 30
+
+
+def test_timeout_is_clamped():
+    policy = RetryPolicy(min_samples=1, min_timeout=10, max_timeout=20, timeout_multiplier=2)
+    policy.record_latency('fast', 0.1)
+    policy.record_latency('slow', 60)
+    assert policy.timeout_for('fast') == 10
+    assert policy.timeout_for('slow') == 20
+
+
+def test_latency_window_forgets_old_samples():
+    policy = RetryPolicy(window=3, min_samples=1)
+    for seconds in (100, 1, 1, 1):
+        policy.record_latency('libreoffice', seconds)
+    assert policy.percentile('libreoffice', 100) == 1
+
+
+def test_backoff_is_jittered_and_capped():
+    random.seed(0)
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+    assert all(0 <= policy.backoff(1) <= 1.0 for _ in range(100))
+    assert all(0 <= policy.backoff(3) <= 4.0 for _ in range(100))
+    assert max(policy.backoff(10) for _ in range(200)) <= 5.0
+    assert len({policy.backoff(2) for _ in range(20)}) > 1
+
+
+def test_breakers_are_per_backend():
+    policy = RetryPolicy(failure_threshold=1)
+    assert policy.breaker('libreoffice') is policy.breaker('libreoffice')
+    policy.breaker('libreoffice').record_failure()
+    policy.breaker('docx2pdf')
+    assert policy.breaker_states() == {'libreoffice': OPEN, 'docx2pdf': CLOSED}
@@ -0,0 +1,106 @@
+import io
+import os
+import stat
+import zipfile
+
+import pytest
+
+import docx_packager
+from docx_packager import template_drift, write_docx
+
+FILES = {
+    '[Content_Types].xml': b'<Types/>',
+    'word/document.xml': b'<w:document>template</w:document>',
+    'word/styles.xml': b'<w:styles>' + b'x' * 5000 + b'</w:styles>',
+    'word/media/image1.png': b'\x89PNG' + bytes(range(256)) * 4,
+}
+
+
+class Unseekable(io.RawIOBase):
+    """Forces zipfile to write data descriptors after each member."""
+
+    def __init__(self, f):
+        self.f = f
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.f.write(data)
+
+
+@pytest.fixture(params=['seekable', 'data_descriptors'])
+def template_docx(request, tmp_path):
+    path = tmp_path / 'template1.docx'
+    with open(path, 'wb') as f:
+        target = f if request.param == 'seekable' else Unseekable(f)
+        with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as z:
+            for name, data in FILES.items():
+                z.writestr(name, data)
+    return str(path)
+
+
+def compressed_bytes(path, name):
+    """Raw (still compressed) data of one member."""
+    with zipfile.ZipFile(path) as z, open(path, 'rb') as f:
+        info = z.getinfo(name)
+        f.seek(info.header_offset + 26)
+        name_length, extra_length = int.from_bytes(f.read(2), 'little'), int.from_bytes(f.read(2), 'little')
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+        return f.read(info.compress_size)
+
+
+def test_unchanged_entries_are_copied_raw(template_docx, tmp_path):
+    output = str(tmp_path / 'resume.docx')
+    stats = write_docx(template_docx, output, {
+        'word/document.xml': '<w:document>rendered é</w:document>',
+        'word/header1.xml': '<w:hdr/>',
+    })
+
+    assert stats['copied'] == 3 and stats['compressed'] == 2
+    with zipfile.ZipFile(output) as z:
+        assert z.testzip() is None
+        assert z.namelist() == list(FILES) + ['word/header1.xml']
+        assert z.read('word/document.xml').decode('utf-8') == '<w:document>rendered é</w:document>'
+        assert z.read('word/styles.xml') == FILES['word/styles.xml']
+    assert compressed_bytes(output, 'word/styles.xml') == compressed_bytes(template_docx, 'word/styles.xml')
+
+
+def test_omitted_members_are_left_out(template_docx, tmp_path):
+    output = str(tmp_path / 'resume.docx')
+    write_docx(template_docx, output, {}, omit={'word/media/image1.png'})
+    with zipfile.ZipFile(output) as z:
+        assert 'word/media/image1.png' not in z.namelist()
+        assert z.testzip() is None
+
+
+def test_output_gets_the_umask_mode(template_docx, tmp_path, monkeypatch):
+    monkeypatch.setattr(docx_packager, '_file_mode', None)
+    previous = os.umask(0o027)
+    try:
+        def no_umask(mask):
+            raise AssertionError("write_docx must not change the process umask")
+
+        monkeypatch.setattr(docx_packager.os, 'umask', no_umask)
+        for name in ('first.docx', 'second.docx'):
+            write_docx(template_docx, str(tmp_path / name), {})
+    finally:
+        monkeypatch.undo()
+        os.umask(previous)
+    assert stat.S_IMODE(os.stat(tmp_path / 'first.docx').st_mode) == 0o640
+    assert stat.S_IMODE(os.stat(tmp_path / 'second.docx').st_mode) == 0o640
+    assert [name for name in os.listdir(tmp_path) if name.startswith('.')] == []
+
+
+def test_template_drift(template_docx):
+    files = dict(FILES)
+    files['word/styles.xml'] = b'<w:styles>edited</w:styles>'
+    files['word/footer1.xml'] = b'<w:ftr/>'
+    files['word/document.xml'] = b'ignored'
+    del files['word/media/image1.png']
+
+    changed, removed = template_drift(template_docx, files, ignore={'word/document.xml'})
+    assert changed == {'word/styles.xml': b'<w:styles>edited</w:styles>', 'word/footer1.xml': b'<w:ftr/>'}
+    assert removed == {'word/media/image1.png'}
+
+    assert template_drift(template_docx, FILES) == ({}, set())
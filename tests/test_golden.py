@@ -0,0 +1,66 @@
+import sys
+
+import pytest
+
+import golden
+from golden import canonicalize, compare, edge_cases, first_divergence, fixture_template, legacy_render
+
+
+def test_equal_texts_have_no_divergence():
+    assert first_divergence('<a/>', '<a/>') is None
+
+
+def test_first_divergence_locates_the_difference():
+    expected = '<w:p>one</w:p>\n<w:p>two</w:p>'
+    actual = '<w:p>one</w:p>\n<w:p>tw0</w:p>'
+    diff = first_divergence(expected, actual, context=4)
+    assert diff['offset'] == expected.index('two') + 2
+    assert diff['line'] == 2 and diff['paragraph'] == 2
+    assert diff['expected'] == 'p>two</w' and diff['actual'] == 'p>tw0</w'
+    assert diff['expected'][diff['marker']] == 'o'
+
+
+def test_truncated_output_diverges_where_it_ends():
+    diff = first_divergence('<a>abc</a>', '<a>ab')
+    assert diff['offset'] == 5
+    assert (diff['expected_length'], diff['actual_length']) == (10, 5)
+
+
+def test_canonicalize_ignores_layout_but_not_text():
+    pretty = '<root b="2" a="1">\n  <w:t xmlns:w="urn:w"> keep </w:t>\n  <x/>\n</root>'
+    compact = '<root a="1" b="2"><w:t xmlns:w="urn:w"> keep </w:t><x></x></root>'
+    assert canonicalize(pretty) == canonicalize(compact)
+    assert canonicalize(compact) != canonicalize(compact.replace(' keep ', 'keep'))
+    with pytest.raises(Exception):
+        canonicalize('<unclosed>')
+
+
+def test_current_renderer_matches_the_fixture_reference():
+    templates = [(golden.FIXTURE_TEMPLATE, fixture_template())]
+    checked, divergences = compare(legacy_render, golden.current_render, templates, list(edge_cases()))
+    assert checked == len(list(edge_cases()))
+    assert divergences == []
+
+
+def test_a_changed_renderer_is_reported():
+    def shouting(xml_content, rendered_parts, parsed_data, base_data):
+        xml, parts = legacy_render(xml_content, rendered_parts, parsed_data, base_data)
+        return xml.replace('EDUCATION', 'Education'), parts
+
+    templates = [(golden.FIXTURE_TEMPLATE, fixture_template())]
+    _, divergences = compare(legacy_render, shouting, templates, list(edge_cases())[:1])
+    assert len(divergences) == 1
+    assert divergences[0]['part'] == 'word/document.xml'
+    assert 'first difference' in golden.format_divergence(divergences[0])
+
+
+def test_bare_checkout_falls_back_to_the_fixture(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    import template_registry
+    monkeypatch.setattr(template_registry, '_registry', None)
+    monkeypatch.setattr(sys, 'argv', ['golden.py', '--synthetic', '2', '--repeat', '1'])
+
+    assert golden.main() == 0
+    out, err = capsys.readouterr()
+    assert "built-in 'fixture' template" in err
+    assert '✓ Identical output for every case' in out
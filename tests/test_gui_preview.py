@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip('tkinter')
+
+from gui import preview_rows  # noqa: E402
+from parser import IncrementalParser  # noqa: E402
+
+
+def test_preview_of_parsed_text(parsed_resume):
+    rows = dict(preview_rows(parsed_resume, ['PayPal', 'Stripe']))
+    assert 'name: Jane Roe' in rows['👤 Personal']
+    assert 'phone: —' in rows['👤 Personal']
+    assert rows['🛠 Skills (2 categories)'] == ['Languages: 2 items', 'Cloud: 2 items']
+    assert rows['💼 Experience (1)'] == ['PayPal — Engineer | 2020 - 2024 (2 bullets)', '⚠ Stripe: not found']
+
+
+def test_preview_flags_missing_sections():
+    data = {'personal': {}, 'summary': '', 'skills': {'Technical': 'Python, , Go'}, 'experiences': []}
+    rows = preview_rows(data, [])
+    assert rows[0] == ('👤 Personal', ['name: —', 'location: —', 'email: —', 'phone: —', 'linkedin: —'])
+    assert rows[1] == ('📝 Summary: ⚠ not found', [])
+    assert rows[2] == ('🛠 Skills (1 categories)', ['Technical: 2 items'])
+    assert rows[3] == ('💼 Experience (0)', [])
+
+
+def test_preview_counts_words_and_bullets():
+    data = {
+        'personal': {'name': 'Jane'}, 'summary': 'Ships reliable systems fast.', 'skills': {},
+        'experiences': [{'company': 'PayPal', 'role': '', 'dates': '2020', 'bullets': ['a', 'b']}],
+    }
+    rows = preview_rows(data, ['PayPal'])
+    assert rows[1][0] == '📝 Summary: 4 words'
+    assert rows[3][1] == ['PayPal — ? | 2020 (2 bullets)']
+
+
+def test_preview_of_incremental_parse():
+    text = "Jane Roe | Austin, TX | jane@example.com\n\nPROFESSIONAL SUMMARY\nBuilds APIs.\n"
+    data = IncrementalParser().parse(text, {'company': []})
+    rows = dict(preview_rows(data, []))
+    assert 'email: jane@example.com' in rows['👤 Personal']
@@ -0,0 +1,83 @@
+import xml.etree.ElementTree as ET
+
+from layout import Styles, _measure_table, estimate_layout, trim_one_bullet
+
+NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def para(text='Hello world', extra=''):
+    return f'<w:p>{extra}<w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+
+
+def document(*blocks):
+    return f'<w:document {NS}><w:body>{"".join(blocks)}</w:body></w:document>'
+
+
+def cell(*blocks):
+    return f'<w:tc>{"".join(blocks)}</w:tc>'
+
+
+def table(*rows):
+    return '<w:tbl>' + ''.join(f'<w:tr>{"".join(cells)}</w:tr>' for cells in rows) + '</w:tbl>'
+
+
+def test_short_paragraph_fits_one_line():
+    estimate = estimate_layout(document(para()))
+    assert estimate['pages'] == 1 and estimate['lines'] == 1 and estimate['paragraphs'] == 1
+    assert 0 < estimate['last_page_fill'] < 0.05
+
+
+def test_long_paragraph_wraps():
+    estimate = estimate_layout(document(para('word ' * 200)))
+    # 6.5" of 10pt Helvetica holds roughly 20 of these words per line
+    assert 8 <= estimate['lines'] <= 14
+
+
+def test_overflow_and_page_breaks_add_pages():
+    assert estimate_layout(document(*[para()] * 60))['pages'] == 2
+    page_break = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+    assert estimate_layout(document(para(), page_break, para()))['pages'] == 2
+
+
+def test_style_line_spacing_is_applied():
+    styles = (f'<w:styles {NS}><w:style w:type="paragraph" w:default="1" w:styleId="Normal">'
+              '<w:pPr><w:spacing w:line="480" w:lineRule="exact"/></w:pPr></w:style></w:styles>')
+    single = estimate_layout(document(*[para()] * 10))
+    exact = estimate_layout(document(*[para()] * 10), styles)
+    assert exact['last_page_fill'] > single['last_page_fill']
+
+
+def _rows(xml):
+    return _measure_table(ET.fromstring(f'<w:root {NS}>{xml}</w:root>')[0], Styles(), 9360)
+
+
+def test_nested_table_is_measured_once():
+    flat = _rows(table([cell(para(), para(), para())]))
+    nested = _rows(table([cell(para(), table([cell(para())], [cell(para())]))]))
+    assert len(nested) == 1
+    assert nested == flat
+
+
+def test_table_row_is_as_tall_as_its_tallest_cell():
+    rows = _rows(table([cell(para()), cell(para(), para())], [cell(para())]))
+    assert rows[0] == 2 * rows[1]
+
+
+def test_trim_one_bullet_takes_from_the_longest_experience():
+    experiences = [
+        {'company': 'A', 'bullets': ['a1', 'a2', 'a3']},
+        {'company': 'B', 'bullets': ['b1', 'b2', 'b3']},
+        {'company': 'C', 'bullets': ['c1']},
+    ]
+    # Ties go to the later experience
+    assert trim_one_bullet(experiences) == ('B', 'b3')
+    assert trim_one_bullet(experiences) == ('A', 'a3')
+    assert trim_one_bullet(experiences) == ('B', 'b2')
+    assert trim_one_bullet(experiences) == ('A', 'a2')
+    assert trim_one_bullet(experiences) is None
+    assert [len(e['bullets']) for e in experiences] == [1, 1, 1]
+
+
+def test_trim_one_bullet_respects_min_bullets():
+    experiences = [{'company': 'A', 'bullets': ['a1', 'a2']}]
+    assert trim_one_bullet(experiences, min_bullets=2) is None
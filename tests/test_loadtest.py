@@ -0,0 +1,71 @@
+import pytest
+
+from loadtest import COMPANIES, SAMPLE_EXPERIENCES, find_saturation, percentile, summarize, synthetic_inputs
+from parser import parse_chatgpt_output
+
+
+def test_percentile_is_nearest_rank():
+    values = [5, 1, 4, 2, 3, 6, 7, 8, 9, 10]
+    assert percentile(values, 50) == 5
+    assert percentile(values, 95) == 10
+    assert percentile(values, 10) == 1
+    assert percentile(values, 0) == 1
+    assert percentile(values, 100) == 10
+    assert percentile([42], 99) == 42
+    assert percentile([], 50) is None
+
+
+def concurrency_level(concurrency, per_min):
+    return {'mode': 'concurrency', 'concurrency': concurrency, 'throughput_per_min': per_min}
+
+
+def rate_level(rate, per_min):
+    return {'mode': 'rate', 'rate_per_s': rate, 'offered_per_min': rate * 60, 'throughput_per_min': per_min}
+
+
+def test_saturation_is_the_last_level_that_still_scales():
+    levels = [concurrency_level(1, 100), concurrency_level(2, 190), concurrency_level(4, 200),
+              concurrency_level(8, 150)]
+    saturation = find_saturation(levels)
+    assert saturation['concurrency'] == 2 and saturation['throughput_per_min'] == 190
+    assert '+5%' in saturation['reason']
+
+
+def test_no_saturation_while_throughput_keeps_scaling():
+    levels = [concurrency_level(1, 100), concurrency_level(2, 180), concurrency_level(4, 300)]
+    assert find_saturation(levels) is None
+    assert find_saturation([]) is None
+
+
+def test_rate_saturation_is_the_first_rate_that_falls_behind():
+    levels = [rate_level(1, 60), rate_level(2, 118), rate_level(4, 200), rate_level(8, 210)]
+    saturation = find_saturation(levels)
+    assert saturation['rate_per_s'] == 4
+    assert saturation['achieved_per_s'] == pytest.approx(200 / 60, abs=1e-3)
+    assert find_saturation(levels[:2]) is None
+
+
+def test_summarize_counts_errors_and_throughput():
+    samples = [
+        {'ok': True, 'latency': 0.2, 'service': 0.1, 'stages': {'render': 0.05}},
+        {'ok': True, 'latency': 0.4, 'service': 0.3, 'stages': {'render': 0.07}},
+        {'ok': False, 'error': 'TimeoutError'},
+    ]
+    summary = summarize(samples, wall_seconds=2.0, level={'mode': 'concurrency', 'concurrency': 2})
+    assert summary['jobs'] == 3 and summary['completed'] == 2
+    assert summary['error_rate'] == pytest.approx(1 / 3, abs=1e-4)
+    assert summary['errors_by_type'] == {'TimeoutError': 1}
+    assert summary['throughput_per_min'] == 60.0
+    assert summary['latency']['p50'] == 0.2 and summary['latency']['max'] == 0.4
+    assert summary['stages']['render']['p99'] == 0.07
+
+
+def test_synthetic_inputs_parse_and_are_reproducible():
+    first = list(synthetic_inputs(3, seed=7))
+    assert first == list(synthetic_inputs(3, seed=7))
+    assert first != list(synthetic_inputs(3, seed=8))
+
+    data = parse_chatgpt_output(first[0], {'company': COMPANIES})
+    assert data['personal']['email'] == 'load@example.com'
+    assert len(data['experiences']) == len(SAMPLE_EXPERIENCES)
+    assert all(2 <= len(exp['bullets']) <= 8 for exp in data['experiences'])
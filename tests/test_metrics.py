@@ -0,0 +1,122 @@
+import math
+import re
+
+import pytest
+
+import metrics
+from metrics import MetricsRegistry
+
+SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+LABEL_RE = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def _unescape(value):
+    return re.sub(r'\\(.)', lambda m: '\n' if m.group(1) == 'n' else m.group(1), value)
+
+
+def parse(text):
+    """{(sample name, ((label, value), ...)): float} plus {family: type} of an exposition."""
+    samples, types = {}, {}
+    assert text.endswith('\n')
+    for line in text.splitlines():
+        if line.startswith('# TYPE '):
+            _, _, name, kind = line.split(' ')
+            types[name] = kind
+            continue
+        if line.startswith('#'):
+            continue
+        match = SAMPLE_RE.match(line)
+        assert match, f"not a sample line: {line!r}"
+        name, labels, value = match.groups()
+        labels = tuple((k, _unescape(v)) for k, v in LABEL_RE.findall(labels or ''))
+        samples[(name, labels)] = float(value.replace('+Inf', 'inf'))
+    return samples, types
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_histogram_buckets_sum_and_count(registry):
+    histogram = registry.histogram('job_seconds', 'Job time.', ['stage'], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 7.0):
+        histogram.observe(value, stage='render')
+
+    samples, types = parse(registry.render())
+    assert types == {'job_seconds': 'histogram'}
+    stage = ('stage', 'render')
+    assert samples[('job_seconds_bucket', (stage, ('le', '0.1')))] == 1
+    assert samples[('job_seconds_bucket', (stage, ('le', '1')))] == 3
+    assert samples[('job_seconds_bucket', (stage, ('le', '+Inf')))] == 4
+    assert samples[('job_seconds_sum', (stage,))] == pytest.approx(8.05)
+    assert samples[('job_seconds_count', (stage,))] == 4
+
+
+def test_counters_and_gauges(registry):
+    jobs = registry.counter('jobs_total', 'Jobs.', ['outcome'])
+    jobs.inc(outcome='done')
+    jobs.inc(2, outcome='done')
+    registry.gauge('queue_depth', 'Queue.').set(5)
+
+    samples, types = parse(registry.render())
+    assert types == {'jobs_total': 'counter', 'queue_depth': 'gauge'}
+    assert samples[('jobs_total', (('outcome', 'done'),))] == 3
+    assert samples[('queue_depth', ())] == 5
+    with pytest.raises(ValueError):
+        jobs.inc(-1, outcome='done')
+    with pytest.raises(ValueError):
+        jobs.inc(wrong='label')
+
+
+def test_label_values_are_escaped(registry):
+    counter = registry.counter('weird_total', 'Escaping.', ['company'])
+    name = 'Back\\slash "Quoted"\nNew line'
+    counter.inc(company=name)
+
+    text = registry.render()
+    assert '\n' not in text.split('weird_total{')[1].split('}')[0]
+    samples, _ = parse(text)
+    assert samples[('weird_total', (('company', name),))] == 1
+
+
+def test_registering_twice_returns_the_same_family(registry):
+    first = registry.counter('jobs_total', 'Jobs.', ['outcome'])
+    assert registry.counter('jobs_total', 'Jobs.', ['outcome']) is first
+    with pytest.raises(ValueError):
+        registry.gauge('jobs_total', 'Jobs.', ['outcome'])
+
+
+def test_collectors_are_read_on_render_and_can_be_removed(registry):
+    class Cache:
+        hits, misses, evictions = 3, 1, 2
+
+    registry.register_collector('parse_cache', metrics.parse_cache_collector(Cache()))
+    samples, _ = parse(registry.render())
+    assert samples[('resume_parse_cache_lookups_total', (('result', 'hit'),))] == 3
+    assert samples[('resume_parse_cache_hit_ratio', ())] == 0.75
+
+    Cache.hits = 9
+    samples, _ = parse(registry.render())
+    assert samples[('resume_parse_cache_lookups_total', (('result', 'hit'),))] == 9
+
+    registry.unregister_collector('parse_cache')
+    assert registry.render() == '\n'
+
+
+def test_failing_collector_does_not_break_the_scrape(registry, capsys):
+    registry.counter('jobs_total', 'Jobs.')
+
+    def broken():
+        raise RuntimeError('boom')
+
+    registry.register_collector('broken', broken)
+    samples, _ = parse(registry.render())
+    assert samples[('jobs_total', ())] == 0
+    assert 'boom' in capsys.readouterr().out
+
+
+def test_format_value():
+    assert metrics._format_value(math.inf) == '+Inf'
+    assert metrics._format_value(2.0) == '2'
+    assert metrics._format_value(0.25) == '0.25'
@@ -0,0 +1,98 @@
+import sqlite3
+
+import pytest
+
+import parse_cache
+from parse_cache import ParseCache, cache_key
+
+TEXT = """Jane Roe | Austin, TX | jane@example.com
+
+PROFESSIONAL SUMMARY
+Engineer.
+
+SKILLS
+Technical: Python, Go, AWS
+
+PROFESSIONAL EXPERIENCE
+PayPal | 2020 - 2024 | Engineer | Remote
+• Built the payments ledger used by every checkout flow
+
+EDUCATION
+"""
+INPUT = {'company': ['PayPal'], 'education': {'university': 'State University'}}
+
+
+def test_key_depends_on_text_companies_order_and_parser_version(monkeypatch):
+    key = cache_key(TEXT, ['PayPal', 'Stripe'])
+    assert key == cache_key(TEXT, ('PayPal', 'Stripe'))
+    assert key != cache_key(TEXT + ' ', ['PayPal', 'Stripe'])
+    assert key != cache_key(TEXT, ['Stripe', 'PayPal'])
+    monkeypatch.setattr(parse_cache, 'PARSER_VERSION', parse_cache.PARSER_VERSION + 1)
+    assert key != cache_key(TEXT, ['PayPal', 'Stripe'])
+
+
+def test_hit_returns_the_parse_with_current_education(tmp_path):
+    cache = ParseCache(str(tmp_path / 'cache.db'))
+    first = cache.parse(TEXT, INPUT)
+    assert first['experiences'][0]['company'] == 'PayPal'
+
+    second = cache.parse(TEXT, dict(INPUT, education={'university': 'Other'}))
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second == dict(first, education={'university': 'Other'})
+
+
+def test_running_size_matches_the_table(tmp_path):
+    cache = ParseCache(str(tmp_path / 'cache.db'))
+    for i in range(20):
+        cache.parse(TEXT + f'\n{i}', INPUT)
+    cache.put(TEXT + '\n3', INPUT, cache.get(TEXT + '\n3', INPUT))
+    actual = cache.conn.execute("SELECT SUM(size) FROM parses").fetchone()[0]
+    assert cache.size() == actual == cache.stats()['bytes']
+
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ParseCache(str(tmp_path / 'cache.db'))
+    cache.parse(TEXT, INPUT)
+    entry_size = cache.size()
+    cache.max_bytes = entry_size * 5
+
+    texts = [TEXT + f'\n{i}' for i in range(10)]
+    for text in texts:
+        cache.parse(text, INPUT)
+        cache.get(TEXT, INPUT)  # keep the first entry hot
+
+    assert cache.evictions > 0
+    assert cache.size() <= cache.max_bytes
+    assert cache.get(TEXT, INPUT) is not None
+    assert cache.get(texts[0], INPUT) is None
+
+
+def test_existing_cache_gets_its_total_once(tmp_path):
+    db_path = str(tmp_path / 'cache.db')
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE parses (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,
+                             created_at REAL NOT NULL, last_used REAL NOT NULL) WITHOUT ROWID;
+        INSERT INTO parses VALUES ('a', x'00', 100, 0, 0), ('b', x'00', 50, 0, 0);
+    """)
+    conn.close()
+
+    assert ParseCache(db_path).size() == 150
+    # Reopening does not count the entries twice
+    cache = ParseCache(db_path)
+    assert cache.size() == 150
+    cache.conn.execute("DELETE FROM parses WHERE key = 'a'")
+    assert cache.size() == 50
+
+
+def test_concurrent_writers_keep_the_total(tmp_path):
+    db_path = str(tmp_path / 'cache.db')
+    first, second = ParseCache(db_path), ParseCache(db_path)
+    first.parse(TEXT, INPUT)
+    second.parse(TEXT + '\nother', INPUT)
+    second.put(TEXT, INPUT, first.get(TEXT, INPUT))
+    actual = first.conn.execute("SELECT SUM(size) FROM parses").fetchone()[0]
+    assert first.size() == second.size() == actual
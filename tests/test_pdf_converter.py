@@ -0,0 +1,102 @@
+import pytest
+
+import metrics
+import pdf_converter
+from conversion_policy import CLOSED, RetryPolicy
+
+
+@pytest.fixture
+def docx(tmp_path):
+    path = tmp_path / 'resume.docx'
+    path.write_bytes(b'PK')
+    return path
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    """Replace the three backends; each returns whatever its entry says."""
+    outcome = {'libreoffice': None, 'pypandoc': None, 'docx2pdf': None}
+    calls = []
+
+    def fake(name):
+        def convert(docx_path, pdf_path, timeout, children, *args):
+            calls.append(name)
+            if outcome[name] == 'ok':
+                pdf_path.write_bytes(b'%PDF')
+                return str(pdf_path)
+            return outcome[name]
+        return convert
+
+    monkeypatch.setattr(pdf_converter, '_convert_with_libreoffice', fake('libreoffice'))
+    monkeypatch.setattr(pdf_converter, '_convert_with_pypandoc', fake('pypandoc'))
+    monkeypatch.setattr(pdf_converter, '_convert_with_docx2pdf', fake('docx2pdf'))
+    return outcome, calls
+
+
+def test_one_bad_document_does_not_open_the_breakers(docx, backends):
+    outcome, calls = backends
+    policy = RetryPolicy(max_attempts=3, failure_threshold=3, backoff_base=0)
+    metrics = {}
+
+    assert pdf_converter.convert_docx_to_pdf(docx, policy=policy, metrics=metrics) is None
+    assert metrics['conversion']['failures'] == {'libreoffice': 3, 'pypandoc': 3, 'docx2pdf': 3}
+    assert set(metrics['conversion']['breakers'].values()) == {CLOSED}
+
+    # The next job still gets every backend
+    outcome['libreoffice'] = 'ok'
+    calls.clear()
+    assert pdf_converter.convert_docx_to_pdf(docx, policy=policy)
+    assert calls == ['libreoffice']
+
+
+def test_unavailable_backends_are_not_failures(docx, backends):
+    outcome, calls = backends
+    outcome['libreoffice'] = pdf_converter.BACKEND_UNAVAILABLE
+    outcome['pypandoc'] = pdf_converter.BACKEND_UNAVAILABLE
+    policy = RetryPolicy(max_attempts=3, failure_threshold=2, backoff_base=0)
+    metrics = {}
+
+    pdf_converter.convert_docx_to_pdf(docx, policy=policy, metrics=metrics)
+    conversion = metrics['conversion']
+    assert conversion['unavailable'] == ['libreoffice', 'pypandoc']
+    assert conversion['failures'] == {'docx2pdf': 3}
+    # Missing backends are asked once per job, not once per attempt
+    assert calls.count('libreoffice') == 1 and calls.count('pypandoc') == 1
+    assert policy.breaker('libreoffice').state == CLOSED
+    assert policy.breaker('pypandoc').state == CLOSED
+    assert policy.breaker('docx2pdf').failures == 1
+
+
+def test_nothing_installed_stops_after_one_pass(docx, backends):
+    outcome, calls = backends
+    for name in outcome:
+        outcome[name] = pdf_converter.BACKEND_UNAVAILABLE
+    metrics = {}
+
+    assert pdf_converter.convert_docx_to_pdf(docx, policy=RetryPolicy(backoff_base=0), metrics=metrics) is None
+    assert len(calls) == 3
+    assert metrics['conversion']['retries'] == 0
+
+
+def test_preset_ignored_by_a_fallback_backend_is_recorded(docx, backends):
+    outcome, _ = backends
+    outcome['libreoffice'] = pdf_converter.BACKEND_UNAVAILABLE
+    outcome['pypandoc'] = 'ok'
+    job_metrics = {}
+
+    assert pdf_converter.convert_docx_to_pdf(docx, policy=RetryPolicy(backoff_base=0), metrics=job_metrics,
+                                             export='email-small')
+    assert job_metrics['conversion']['preset_ignored'] is True
+
+    before = metrics.PRESET_IGNORED._values.get(('pypandoc', 'email-small'), 0)
+    metrics.observe_job(job_metrics, 'done')
+    assert metrics.PRESET_IGNORED._values[('pypandoc', 'email-small')] == before + 1
+
+
+def test_preset_applied_by_libreoffice_is_not_flagged(docx, backends):
+    outcome, _ = backends
+    outcome['libreoffice'] = 'ok'
+    job_metrics = {}
+    pdf_converter.convert_docx_to_pdf(docx, policy=RetryPolicy(backoff_base=0), metrics=job_metrics,
+                                      export='print')
+    assert 'preset_ignored' not in job_metrics['conversion']
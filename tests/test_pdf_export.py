@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from pdf_export import PRESETS, convert_to_arg, export_from_config, filter_options, resolve_export
+
+
+def test_presets_resolve_by_name():
+    assert resolve_export() == ('default', {})
+    assert resolve_export('print') == ('print', PRESETS['print'])
+    # Callers get a copy they may change
+    name, settings = resolve_export('print')
+    settings['max_image_dpi'] = 75
+    assert PRESETS['print']['max_image_dpi'] == 300
+
+
+def test_overrides_win_over_the_preset():
+    name, settings = resolve_export({'preset': 'email-small', 'max_image_dpi': 300, 'tagged': True})
+    assert name == 'email-small+custom'
+    assert settings == dict(PRESETS['email-small'], max_image_dpi=300, tagged=True)
+    assert resolve_export({'preset': 'archive'}) == ('archive', PRESETS['archive'])
+
+
+def test_config_picks_preset_and_overrides():
+    config = {'pdf_preset': 'print', 'pdf_export': {'jpeg_quality': 90}}
+    assert resolve_export(export_from_config(config)) == (
+        'print+custom', dict(PRESETS['print'], jpeg_quality=90))
+    assert resolve_export(export_from_config(None)) == ('default', {})
+
+
+@pytest.mark.parametrize('export', [
+    'tiny',
+    {'preset': 'tiny'},
+    {'max_image_dpi': 100},
+    {'jpeg_quality': 0},
+    {'jpeg_quality': 101},
+    {'jpeg_quality': 80.5},
+    {'jpeg_quality': True},
+    {'pdfa': 4},
+    {'tagged': 'yes'},
+    {'embed_full_fonts': True},
+])
+def test_bad_values_are_rejected(export):
+    with pytest.raises(ValueError):
+        resolve_export(export)
+
+
+def test_default_converts_to_plain_pdf():
+    assert convert_to_arg({}) == 'pdf'
+    assert convert_to_arg(None) == 'pdf'
+
+
+def test_convert_to_string_is_exact():
+    _, settings = resolve_export('email-small')
+    assert convert_to_arg(settings) == (
+        'pdf:writer_pdf_Export:{'
+        '"ReduceImageResolution":{"type":"boolean","value":"true"},'
+        '"MaxImageResolution":{"type":"long","value":"150"},'
+        '"Quality":{"type":"long","value":"75"},'
+        '"UseLosslessCompression":{"type":"boolean","value":"false"},'
+        '"EmbedStandardFonts":{"type":"boolean","value":"false"}}'
+    )
+
+
+def test_archive_filter_options():
+    _, settings = resolve_export('archive')
+    options = json.loads(convert_to_arg(settings).split(':', 2)[2])
+    assert options == filter_options(settings) == {
+        'SelectPdfVersion': {'type': 'long', 'value': '2'},
+        'UseTaggedPDF': {'type': 'boolean', 'value': 'true'},
+        'EmbedStandardFonts': {'type': 'boolean', 'value': 'true'},
+    }
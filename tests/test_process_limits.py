@@ -0,0 +1,64 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from process_limits import get_limits, limited_command, limits_from_config, run_limited
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason='rlimits are POSIX only')
+
+PRINT_LIMITS = (
+    "import resource; "
+    "print(resource.getrlimit(resource.RLIMIT_NOFILE)[0], resource.getrlimit(resource.RLIMIT_CPU)[0])"
+)
+
+
+def test_limits_are_applied_in_the_child():
+    result = run_limited([sys.executable, '-c', PRINT_LIMITS], 30, {'open_files': 64, 'cpu_seconds': 42})
+    assert result['returncode'] == 0, result['stderr']
+    assert result['stdout'].split() == ['64', '42']
+    assert not result['timed_out']
+    assert result['peak_rss_kb'] > 0
+
+
+def test_children_from_a_thread_pool():
+    def run(index):
+        return run_limited([sys.executable, '-c', PRINT_LIMITS], 30, {'open_files': 64 + index})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(run, range(16)))
+    assert [r['stdout'].split()[0] for r in results] == [str(64 + i) for i in range(16)]
+
+
+def test_timeout_kills_the_child():
+    result = run_limited([sys.executable, '-c', 'import time; time.sleep(30)'], 0.5)
+    assert result['timed_out']
+    assert result['returncode'] < 0
+    assert result['wall_seconds'] < 10
+
+
+def test_missing_command_fails_like_a_shell():
+    result = run_limited(['definitely-not-a-command-xyz'], 30)
+    assert result['returncode'] == 127
+    assert 'Cannot run definitely-not-a-command-xyz' in result['stderr']
+
+
+def test_zero_disables_a_limit():
+    assert limited_command(['soffice'], {'cpu_seconds': 0, 'open_files': 0, 'address_space_mb': 0}) == ['soffice']
+
+
+def test_environment_and_job_limits(monkeypatch):
+    monkeypatch.setenv('RESUME_CHILD_CPU_SECONDS', '60')
+    monkeypatch.setenv('RESUME_CHILD_OPEN_FILES', 'lots')
+    limits = get_limits({'address_space_mb': 2048})
+    assert limits == {'address_space_mb': 2048, 'cpu_seconds': 60, 'open_files': 1024}
+
+
+def test_job_config_limits_are_validated():
+    assert limits_from_config({'child_limits': {'cpu_seconds': 10}}) == {'cpu_seconds': 10}
+    assert limits_from_config({}) is None
+    assert limits_from_config(None) is None
+    with pytest.raises(ValueError, match='Unknown child limit'):
+        limits_from_config({'child_limits': {'cpu': 10}})
+    with pytest.raises(ValueError, match='non-negative integer'):
+        limits_from_config({'child_limits': {'cpu_seconds': '10'}})
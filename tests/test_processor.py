@@ -0,0 +1,163 @@
+import os
+
+import pytest
+
+from processor import ResumeProcessor
+from template_normalizer import normalize_template
+
+
+@pytest.fixture
+def processor(tmp_path):
+    return ResumeProcessor(
+        str(tmp_path / 'document.xml'), str(tmp_path / 'template1'), str(tmp_path / 'chatgpt.txt')
+    )
+
+
+def test_well_formed_part_passes(processor):
+    processor._check_well_formed('word/document.xml', '<a><b>é</b></a>\n')
+
+
+def test_error_after_trailing_newline_is_reported(processor):
+    with pytest.raises(ValueError, match=r'not well-formed: no element found at line 2'):
+        processor._check_well_formed('word/document.xml', '<a>\n')
+
+
+def test_error_column_counts_characters(processor):
+    with pytest.raises(ValueError) as excinfo:
+        processor._check_well_formed('word/header1.xml', '<a>\n<b>ééé</c></a>')
+    message = str(excinfo.value)
+    assert 'Rendered word/header1.xml' in message
+    # expat points at the 'c' of '</c>'; the same column as with ASCII 'eee'
+    assert 'mismatched tag at line 2, column 9' in message
+    assert message.endswith('near: <b>ééé</c></a>')
+
+
+def render(processor, xml_content, parsed_resume, base_data):
+    processor.xml_content = xml_content
+    processor.rendered_parts = {}
+    processor.parsed_data = parsed_resume
+    processor.base_data = base_data
+    processor._process_xml()
+    processor._check_all_well_formed()
+    return processor.xml_content
+
+
+def test_unknown_escaped_tag_renders_as_text(processor, template_xml, parsed_resume, base_data):
+    template = template_xml.replace(
+        '</w:body>', '<w:p w14:paraId="9"><w:r><w:t>Phone: &lt;resume_person_phone&gt;</w:t></w:r></w:p></w:body>'
+    )
+    xml_content, _ = normalize_template(template)
+    rendered = render(processor, xml_content, parsed_resume, base_data)
+
+    assert 'Phone: &lt;resume_person_phone&gt;' in rendered
+    assert 'Jane Roe' in rendered and 'Engineer &amp; builder of &lt;things&gt;' in rendered
+
+
+def test_unreplaced_known_tag_is_escaped(processor, template_xml, parsed_resume, base_data):
+    parsed_resume['experiences'][0]['bullets'] = []
+    rendered = render(processor, template_xml, parsed_resume, base_data)
+
+    assert '&lt;resume_company_bullet&gt;' in rendered
+    assert '<resume_' not in rendered
+
+
+def test_edited_template_folder_wins_over_template_docx(tmp_path, monkeypatch):
+    import zipfile
+
+    folder = tmp_path / 'input' / 'template1'
+    (folder / 'word').mkdir(parents=True)
+    (folder / 'word' / 'styles.xml').write_bytes(b'<w:styles>v1</w:styles>')
+    (folder / 'word' / 'fontTable.xml').write_bytes(b'<w:fonts/>')
+    with zipfile.ZipFile(tmp_path / 'input' / 'template1.docx', 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr('word/document.xml', '<w:document/>')
+        z.writestr('word/styles.xml', '<w:styles>v1</w:styles>')
+        z.writestr('word/fontTable.xml', '<w:fonts/>')
+        z.writestr('word/media/old.png', 'png')
+
+    monkeypatch.chdir(tmp_path)
+    processor = ResumeProcessor('input/document.xml', 'input/template1', None, config={'folder_name': 'job'})
+    assert processor.template_docx == 'input/template1.docx'
+    processor.xml_content = '<w:document>rendered</w:document>'
+
+    (folder / 'word' / 'styles.xml').write_bytes(b'<w:styles>v2, edited in the folder</w:styles>')
+    output = processor._create_docx_from_template()
+
+    with zipfile.ZipFile(output) as z:
+        assert z.read('word/styles.xml') == b'<w:styles>v2, edited in the folder</w:styles>'
+        assert z.read('word/fontTable.xml') == b'<w:fonts/>'
+        assert z.read('word/document.xml') == b'<w:document>rendered</w:document>'
+        assert 'word/media/old.png' not in z.namelist()
+
+
+def structured_config(parsed_resume, **extra):
+    resume = {key: parsed_resume[key] for key in ('personal', 'summary', 'skills', 'experiences')}
+    return dict({'resume': resume, 'personal': parsed_resume['personal'], 'company': ['PayPal']}, **extra)
+
+
+def test_malformed_render_is_reported_before_the_layout_estimate(tmp_path, template_xml, parsed_resume, capsys):
+    template_doc = tmp_path / 'document.xml'
+    template_doc.write_text(template_xml.replace('</w:body>', '<w:p w14:paraId="9"><w:r><w:t>x</w:r></w:p></w:body>'))
+    processor = ResumeProcessor(str(template_doc), str(tmp_path / 'template1'), None,
+                                config=structured_config(parsed_resume))
+
+    assert processor.run() is None
+    out = capsys.readouterr().out
+    assert 'Rendered word/document.xml is not well-formed: mismatched tag' in out
+    assert 'layout' not in processor.timings
+
+
+def test_layout_estimate_is_advisory_without_auto_fit(processor, monkeypatch, capsys):
+    import processor as processor_module
+
+    def broken_estimate(document_xml, styles_xml=None):
+        raise ValueError('no body')
+
+    monkeypatch.setattr(processor_module, 'estimate_layout', broken_estimate)
+    processor.xml_content = '<w:document/>'
+    processor.config = {}
+    processor._fit_layout()
+    assert '⚠ Could not estimate the page count: no body' in capsys.readouterr().out
+    assert processor.metrics['layout'] == {'error': 'no body'}
+
+    processor.config = {'auto_fit': True}
+    with pytest.raises(ValueError, match='no body'):
+        processor._fit_layout()
+
+
+def test_structured_resume_without_personal_uses_the_config(tmp_path, parsed_resume):
+    config = structured_config(parsed_resume)
+    del config['resume']['personal']
+    processor = ResumeProcessor(str(tmp_path / 'document.xml'), str(tmp_path / 'template1'), None, config=config)
+    processor._load_input()
+    processor._validate_data()
+
+    assert processor.parsed_data['personal'] == parsed_resume['personal']
+    assert processor.base_data['personal'] == parsed_resume['personal']
+
+
+def test_structured_personal_overrides_the_config(tmp_path, parsed_resume):
+    config = structured_config(parsed_resume)
+    config['resume']['personal'] = {'name': 'J. Roe', 'location': 'Austin, TX'}
+    processor = ResumeProcessor(str(tmp_path / 'document.xml'), str(tmp_path / 'template1'), None, config=config)
+    processor._load_input()
+
+    assert processor.base_data['personal'] == {'name': 'J. Roe', 'email': 'jane@example.com', 'location': 'Austin, TX'}
+    assert processor.parsed_data['personal'] == processor.base_data['personal']
+
+
+def test_tags_in_headers_are_rendered_and_untagged_parts_copied(template_files, job_config):
+    import zipfile
+
+    processor = ResumeProcessor(template_files['template_doc'], template_files['template_folder'], None,
+                                config=job_config)
+    output = processor.run()
+    assert output == os.path.join('output', 'PayPal+SWE', 'resume.docx')
+    assert list(processor.rendered_parts) == ['word/header1.xml']
+
+    with zipfile.ZipFile(output) as z, zipfile.ZipFile(template_files['template_docx']) as template:
+        header = z.read('word/header1.xml').decode('utf-8')
+        assert 'jane@example.com' in header and 'resume_' not in header
+        for name in ('word/footer1.xml', 'word/styles.xml', 'word/media/image1.png'):
+            assert z.getinfo(name).CRC == template.getinfo(name).CRC
+        document = z.read('word/document.xml').decode('utf-8')
+        assert 'Jane Roe' in document and 'State University' in document
@@ -0,0 +1,73 @@
+import json
+import pickle
+import sys
+
+import pytest
+
+from records import Experience, ParsedResume
+
+
+def resume_dict(company='PayPal'):
+    return {
+        'personal': {'name': 'Jane Roe', 'email': 'jane@example.com'},
+        'summary': 'Backend engineer.',
+        'skills': {'Languages': 'Python, Go', 'Cloud': 'AWS'},
+        'experiences': [
+            {'company': company, 'dates': '2020 - 2024', 'role': 'Engineer',
+             'location': 'Remote', 'bullets': ['Built payments', 'Cut latency 40%']},
+            {'company': 'Stripe', 'dates': '2018 - 2020', 'role': 'Engineer',
+             'location': 'SF', 'bullets': ['Shipped checkout']},
+        ],
+        'education': {'university': 'State University'},
+    }
+
+
+def test_dict_round_trip():
+    data = resume_dict()
+    assert ParsedResume.from_dict(data).to_dict() == data
+
+
+def test_serialized_round_trip():
+    record = ParsedResume.from_dict(resume_dict())
+    assert ParsedResume.loads(record.dumps()) == record
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_content_hash_is_stable_and_content_sensitive():
+    first = ParsedResume.from_dict(resume_dict())
+    assert first.content_hash() == ParsedResume.from_dict(resume_dict()).content_hash()
+    assert first.content_hash() != ParsedResume.from_dict(resume_dict('Meta')).content_hash()
+
+
+def test_unknown_version_is_rejected():
+    payload = json.loads(ParsedResume.from_dict(resume_dict()).dumps())
+    payload[0] = 999
+    with pytest.raises(ValueError):
+        ParsedResume.loads(json.dumps(payload))
+
+
+def test_records_answer_dict_lookups():
+    record = ParsedResume.from_dict(resume_dict())
+    assert record['personal']['email'] == 'jane@example.com'
+    assert record['skills']['Cloud'] == 'AWS'
+    assert record['experiences'][0]['company'] == 'PayPal'
+    assert record.experiences[0].get('missing', 'x') == 'x'
+    with pytest.raises(KeyError):
+        record.personal['phone']
+
+
+def test_records_are_more_compact_than_dicts():
+    data = resume_dict()
+    record = ParsedResume.from_dict(data)
+    assert len(record.dumps()) < len(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+    # A slotted record carries no per-instance dict
+    experience = record.experiences[0]
+    assert not hasattr(experience, '__dict__')
+    assert sys.getsizeof(experience) < sys.getsizeof(data['experiences'][0])
+
+
+def test_repeated_strings_are_shared():
+    # Built at runtime so the literals are not already the same object
+    first = Experience.from_dict({'company': ''.join(['Pay', 'Pal']), 'dates': '2020'})
+    second = Experience.from_dict({'company': ''.join(['Pay', 'Pal']), 'dates': '2020'})
+    assert first.company is second.company
@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from startup_bench import HEADLESS, HEAVY_MODULES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules each entry point only imports on first use
+LAZY = {
+    'processor': ('subprocess',),
+    'batch': ('subprocess', 'processor', 'pdf_converter', 'catalog', 'template_registry'),
+    'gui': ('pdf_converter', 'catalog', 'company_registry', 'subprocess'),
+}
+
+
+def loaded_after_import(module, candidates):
+    """Which of candidates are in sys.modules after a cold import of module."""
+    check = f"import {module}, sys; print(','.join(m for m in {tuple(candidates)!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', check], capture_output=True, text=True, cwd=ROOT)
+    assert result.returncode == 0, result.stderr
+    return [m for m in result.stdout.strip().split(',') if m]
+
+
+@pytest.mark.parametrize('module', HEADLESS)
+def test_headless_modules_do_not_load_tkinter_or_backends(module):
+    assert loaded_after_import(module, HEAVY_MODULES) == []
+
+
+@pytest.mark.parametrize('module', sorted(LAZY))
+def test_lazy_imports_stay_lazy(module):
+    if module == 'gui':
+        pytest.importorskip('tkinter')
+    assert loaded_after_import(module, LAZY[module]) == []
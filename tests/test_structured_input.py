@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from structured_input import InvalidResumeError, compile_schema, load_resume_file, resume_to_parsed, validate_resume
+
+RESUME = {
+    'personal': {'name': 'Jane Roe', 'email': ''},
+    'skills': {'Technical': 'Python'},
+    'experiences': [{'company': 'PayPal', 'bullets': ['Built things']}],
+}
+
+
+def test_valid_resume_is_converted_to_the_parser_shape():
+    parsed = resume_to_parsed(RESUME, {'education': {'university': 'State University'}})
+    assert parsed == {
+        'personal': {'name': 'Jane Roe'},
+        'summary': '',
+        'skills': {'Technical': 'Python'},
+        'experiences': [{'company': 'PayPal', 'dates': '', 'role': '', 'location': '', 'bullets': ['Built things']}],
+        'education': {'university': 'State University'},
+    }
+
+
+@pytest.mark.parametrize('document, message', [
+    ([], r"\$: expected an object, got list"),
+    ({}, r"\$: missing required key 'experiences'"),
+    ({'experiences': []}, r"\$.experiences: needs at least 1 item"),
+    ({'experiences': [{'role': 'Engineer'}]}, r"\$.experiences\[0\]: missing required key 'company'"),
+    ({'experiences': [{'company': 'PayPal', 'bulets': []}]}, r"\$.experiences\[0\]: unknown key 'bulets'"),
+    ({'experiences': [{'company': 'PayPal', 'bullets': ['a', 3]}]}, r"\$.experiences\[0\].bullets\[1\]: expected a string"),
+    ({'experiences': [{'company': 'PayPal'}], 'skills': {'Soft': ['a']}}, r"\$.skills.Soft: expected a string"),
+    ({'experiences': [{'company': 'PayPal'}], 'personal': {'phone': 5551234}}, r"\$.personal.phone: expected a string"),
+])
+def test_invalid_documents_name_the_offending_path(document, message):
+    with pytest.raises(InvalidResumeError, match=message):
+        validate_resume(document)
+
+
+def test_invalid_resume_error_is_a_value_error():
+    assert issubclass(InvalidResumeError, ValueError)
+    with pytest.raises(ValueError, match='Unsupported schema type'):
+        compile_schema({'type': 'number'})
+
+
+def test_load_resume_file(tmp_path):
+    path = tmp_path / 'resume.json'
+    path.write_text(json.dumps(RESUME))
+    assert load_resume_file(str(path)) == RESUME
+
+    path.write_text('{"experiences": [')
+    with pytest.raises(InvalidResumeError, match='not valid JSON'):
+        load_resume_file(str(path))
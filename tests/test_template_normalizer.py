@@ -0,0 +1,56 @@
+from template_normalizer import escape_tags, index_tags, normalize_template
+
+RPR = '<w:rPr><w:b/></w:rPr>'
+
+
+def run(text, rpr=RPR):
+    return f'<w:r w:rsidR="1">{rpr}<w:t>{text}</w:t></w:r>'
+
+
+def test_split_escaped_tag_is_merged_and_canonicalized():
+    xml = '<w:p>' + run('&lt;resume_') + '<w:proofErr w:type="spellStart"/>' + run('person_name&gt;') + '</w:p>'
+    normalized, fixups = normalize_template(xml)
+
+    assert normalized == f'<w:p><w:r w:rsidR="1">{RPR}<w:t xml:space="preserve"><resume_person_name></w:t></w:r></w:p>'
+    assert any(fixup.startswith('Merged 2 runs') for fixup in fixups)
+    assert index_tags(normalized) == {'<resume_person_name>': [normalized.index('<resume_person_name>')]}
+
+
+def test_tag_in_a_single_run_keeps_the_run():
+    xml = '<w:p>' + run('Hello &lt; RESUME_Summary &gt;') + '</w:p>'
+    normalized, _ = normalize_template(xml)
+    assert normalized == '<w:p>' + run('Hello <resume_summary>') + '</w:p>'
+
+
+def test_runs_with_different_formatting_are_not_merged():
+    xml = '<w:p>' + run('&lt;resume_') + run('summary&gt;', rpr='<w:rPr><w:i/></w:rPr>') + '</w:p>'
+    normalized, fixups = normalize_template(xml)
+
+    assert 'resume_summary' not in index_tags(normalized)
+    assert any('formatting differs' in fixup for fixup in fixups)
+
+
+def test_runs_across_paragraphs_are_not_merged():
+    xml = '<w:p>' + run('&lt;resume_') + '</w:p><w:p>' + run('summary&gt;') + '</w:p>'
+    normalized, fixups = normalize_template(xml)
+
+    assert normalized == xml
+    assert any('paragraph or field boundary' in fixup for fixup in fixups)
+
+
+def test_unknown_escaped_tag_stays_text():
+    xml = '<w:p><w:r><w:t>Phone: &lt;resume_person_phone&gt;</w:t></w:r></w:p>'
+    normalized, fixups = normalize_template(xml)
+
+    assert normalized == xml
+    assert fixups == []
+    assert index_tags(normalized) == {}
+
+
+def test_template_without_tags_is_returned_unchanged():
+    xml = '<w:p>' + run('Plain text') + '</w:p>'
+    assert normalize_template(xml) == (xml, [])
+
+
+def test_escape_tags():
+    assert escape_tags('<w:t><resume_summary> and <w:b/></w:t>') == '<w:t>&lt;resume_summary&gt; and <w:b/></w:t>'
@@ -0,0 +1,54 @@
+import pytest
+
+from template_pack import (
+    DOCUMENT_PART, SharedTemplatePublisher, TemplatePack, TemplatePackError,
+    build_pack, collect_template_files, write_pack_file,
+)
+
+
+def test_pack_round_trip(tmp_path):
+    entries = {DOCUMENT_PART: b'<w:document/>', 'word/media/logo.png': b'\x89PNG\x00\x01'}
+    pack = TemplatePack(build_pack(entries, generation=7), verify=True)
+
+    assert pack.generation == 7
+    assert sorted(pack.names()) == sorted(entries)
+    assert bytes(pack.get('word/media/logo.png')) == b'\x89PNG\x00\x01'
+    assert pack.read_text(DOCUMENT_PART) == '<w:document/>'
+
+
+def test_corrupt_pack_is_rejected():
+    data = bytearray(build_pack({'a.xml': b'<a/>'}))
+    data[-1] ^= 0xFF
+    with pytest.raises(TemplatePackError):
+        TemplatePack(bytes(data), verify=True)
+    with pytest.raises(TemplatePackError):
+        TemplatePack(b'not a pack at all, just some bytes padding it out to header size')
+
+
+def test_pack_file_uses_template_doc(tmp_path):
+    folder = tmp_path / 'template1'
+    (folder / 'word').mkdir(parents=True)
+    (folder / 'word' / 'document.xml').write_bytes(b'rendered')
+    (folder / 'word' / 'styles.xml').write_bytes(b'<styles/>')
+    (folder / 'word' / 'styles.xml.backup').write_bytes(b'old')
+    template_doc = tmp_path / 'document.xml'
+    template_doc.write_bytes(b'tagged')
+
+    assert sorted(collect_template_files(str(folder))) == [DOCUMENT_PART, 'word/styles.xml']
+
+    pack_path = write_pack_file(str(folder), str(tmp_path / 'template.pack'), str(template_doc))
+    pack = TemplatePack.open_file(pack_path, verify=True)
+    try:
+        assert bytes(pack.get(DOCUMENT_PART)) == b'tagged'
+    finally:
+        pack.close()
+
+
+def test_publish_rejects_names_the_control_block_would_truncate(tmp_path):
+    (tmp_path / 'word').mkdir()
+    (tmp_path / 'word' / 'styles.xml').write_bytes(b'<styles/>')
+
+    publisher = SharedTemplatePublisher('t' * 60)
+    with pytest.raises(ValueError, match='at most 64'):
+        publisher.publish(str(tmp_path))
+    assert publisher.current is None and publisher.control is None
@@ -0,0 +1,79 @@
+import os
+import shutil
+import zipfile
+
+import pytest
+
+from conftest import STYLES_XML
+from template_registry import TemplateRegistry
+
+
+def bump(path, text):
+    """Rewrite a file with a clearly newer mtime."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+
+def test_templates_are_found_by_name_and_hash(template_files):
+    shutil.copytree('input/template1', 'input/style2')
+    registry = TemplateRegistry(root='input')
+    assert registry.names() == ['style2', 'template1']
+
+    compiled = registry.get('template1')
+    assert registry.get(compiled.template_hash[:8]) is compiled
+    with pytest.raises(KeyError):
+        registry.get('missing')
+
+
+def test_lru_is_bounded_by_memory(template_files):
+    for name in ('style2', 'style3'):
+        shutil.copytree('input/template1', f'input/{name}')
+        shutil.copy('input/template1.docx', f'input/{name}.docx')
+    registry = TemplateRegistry(root='input', max_mb=1)
+    size = registry.get('template1').size
+    # Room for two templates, not three
+    registry.max_bytes = 2 * size + size // 2
+
+    registry.get('style2')
+    registry.get('template1')
+    registry.get('style3')
+    stats = registry.stats()
+    assert stats['cached'] == 2 and stats['evictions'] == 1
+    assert stats['bytes'] <= registry.max_bytes
+    # style2 was the least recently used
+    assert list(registry._cache) == ['template1', 'style3']
+
+    registry.get('style2')
+    assert registry.stats()['loads'] == 4
+
+
+def test_changed_template_is_reloaded(template_files, template_xml):
+    registry = TemplateRegistry(root='input', check_interval=0)
+    first = registry.get('template1')
+    assert registry.get('template1') is first
+
+    bump(template_files['template_doc'], template_xml.replace('EDUCATION', 'EDUCATION &amp; CERTIFICATES'))
+    second = registry.get('template1')
+    assert second is not first
+    assert second.template_hash != first.template_hash
+    assert 'CERTIFICATES' in second.state['xml_content']
+    assert 'CERTIFICATES' not in first.state['xml_content']
+    assert registry.stats()['reloads'] == 1
+
+
+def test_jobs_package_from_the_snapshot(template_files, job_config):
+    registry = TemplateRegistry(root='input')
+    compiled = registry.get('template1')
+
+    # The template changes on disk while a job still holds the old version
+    bump(os.path.join(template_files['template_folder'], 'word', 'styles.xml'), '<broken')
+    with open(template_files['template_docx'], 'wb') as f:
+        f.write(b'not a zip')
+
+    docx_path = compiled.processor(config=job_config).run()
+    assert docx_path
+    with zipfile.ZipFile(docx_path) as z:
+        assert z.read('word/styles.xml').decode('utf-8') == STYLES_XML
+        assert 'Jane Roe' in z.read('word/document.xml').decode('utf-8')
@@ -0,0 +1,83 @@
+import json
+import os
+
+import pytest
+
+import pdf_converter
+import processor as processor_module
+from watch import WatchSession
+
+
+@pytest.fixture
+def session(template_files, job_config, monkeypatch):
+    config = {k: v for k, v in job_config.items() if k != 'folder_name'}
+    with open('input/base_data.json', 'w', encoding='utf-8') as f:
+        json.dump(config, f)
+    return WatchSession(
+        template_doc=template_files['template_doc'], template_folder=template_files['template_folder'],
+        chatgpt_file='input/chatgpt.txt', base_data_file='input/base_data.json', convert=False,
+    )
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Count template loads and input loads done by the processor."""
+    counts = {'template': 0, 'input': 0}
+    load_template = processor_module.ResumeProcessor._load_template
+    load_input = processor_module.ResumeProcessor._load_input
+
+    def counting_template(self):
+        counts['template'] += 1
+        return load_template(self)
+
+    def counting_input(self):
+        counts['input'] += 1
+        return load_input(self)
+
+    monkeypatch.setattr(processor_module.ResumeProcessor, '_load_template', counting_template)
+    monkeypatch.setattr(processor_module.ResumeProcessor, '_load_input', counting_input)
+    return counts
+
+
+def test_unchanged_inputs_reuse_every_stage(session, loads):
+    first = session.regenerate()
+    assert first and loads == {'template': 1, 'input': 1}
+
+    assert session.regenerate() == first
+    assert loads == {'template': 1, 'input': 1}
+
+
+def test_only_the_changed_stage_runs_again(session, loads, template_xml):
+    session.regenerate()
+
+    with open('input/base_data.json', 'r+', encoding='utf-8') as f:
+        config = json.load(f)
+        config['resume']['summary'] = 'A different summary.'
+        f.seek(0)
+        f.truncate()
+        json.dump(config, f)
+    docx_path = session.regenerate()
+    assert loads == {'template': 1, 'input': 2}
+
+    with open(session.template_doc, 'w', encoding='utf-8') as f:
+        f.write(template_xml.replace('EDUCATION', 'EDUCATION AND TRAINING'))
+    session.regenerate()
+    assert loads == {'template': 2, 'input': 2}
+    assert os.path.exists(docx_path)
+
+
+def test_pdf_is_only_converted_when_the_docx_changes(session, monkeypatch):
+    converted = []
+
+    def fake_convert(docx_path, **kwargs):
+        pdf_path = docx_path[:-len('.docx')] + '.pdf'
+        with open(pdf_path, 'wb') as f:
+            f.write(b'%PDF')
+        converted.append(docx_path)
+        return pdf_path
+
+    monkeypatch.setattr(pdf_converter, 'convert_docx_to_pdf', fake_convert)
+    session.convert = True
+    session.regenerate()
+    session.regenerate()
+    assert len(converted) == 1
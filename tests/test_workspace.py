@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import workspace
+from workspace import WorkspaceManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return WorkspaceManager(root=str(tmp_path), quota_mb=1, stale_seconds=60, wait_timeout=0)
+
+
+def _dead_pid():
+    proc = subprocess.Popen([sys.executable, '-c', 'pass'])
+    proc.wait()
+    return proc.pid
+
+
+def test_sweep_removes_folders_of_dead_processes(manager, tmp_path):
+    dead = tmp_path / f'resume_{_dead_pid()}_abc'
+    alive = tmp_path / f'resume_{os.getppid()}_def'
+    for folder in (dead, alive):
+        folder.mkdir()
+        (folder / 'document.xml').write_bytes(b'x' * 100)
+
+    assert manager.sweep_stale() == (1, 100)
+    assert not dead.exists() and alive.exists()
+
+
+def test_sweep_uses_mtime_for_old_style_names(manager, tmp_path):
+    old, recent = tmp_path / 'resume_old', tmp_path / 'resume_new'
+    old.mkdir()
+    recent.mkdir()
+    past = time.time() - 3600
+    os.utime(old, (past, past))
+
+    manager.sweep_stale()
+    assert not old.exists() and recent.exists()
+
+
+def test_sweep_keeps_our_own_workspaces(manager):
+    path = manager.acquire()
+    assert manager.sweep_stale() == (0, 0)
+    assert os.path.isdir(path)
+
+
+def test_acquire_reserves_expected_bytes(manager):
+    first = manager.acquire(expected_bytes=700 * 1024)
+    # The first workspace is still empty on disk, but its reservation counts
+    assert manager.usage() == 700 * 1024
+    with pytest.raises(RuntimeError, match='quota'):
+        manager.acquire(expected_bytes=700 * 1024)
+
+    manager.release(first)
+    assert manager.usage() == 0
+    assert manager.acquire(expected_bytes=700 * 1024)
+
+
+def test_usage_counts_the_larger_of_reserved_and_actual(manager):
+    path = manager.acquire(expected_bytes=10)
+    with open(os.path.join(path, 'big.bin'), 'wb') as f:
+        f.write(b'x' * 500)
+    assert manager.usage() == 500
+
+
+def test_release_all_removes_every_workspace(manager, tmp_path):
+    paths = [manager.acquire(expected_bytes=1) for _ in range(3)]
+    manager.release_all()
+    assert not any(os.path.exists(p) for p in paths)
+    assert manager.usage() == 0 and not list(tmp_path.iterdir())
+
+
+def test_pid_alive():
+    assert workspace._pid_alive(os.getpid())
+    assert not workspace._pid_alive(_dead_pid())
@@ -0,0 +1,204 @@
+"""
+Watch mode - regenerate the resume when input or template files change
+
+Polls file stats (no external dependencies), waits until a burst of saves has
+settled, then re-runs only the stages whose inputs changed:
+    - re-parse only if the ChatGPT text or base data changed
+    - reload/normalize the template only if its XML changed
+    - reconvert to PDF only if the DOCX bytes changed
+"""
+import hashlib
+import json
+import os
+import time
+
+XML_SUFFIXES = ('.xml', '.rels')
+
+
+def _snapshot(paths, folders):
+    """{path: (mtime_ns, size)} for the watched files and every file in the folders."""
+    snapshot = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            snapshot[path] = None
+    for folder in folders:
+        for dirpath, _, filenames in os.walk(folder):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def _hash_files(paths):
+    """SHA-256 over the contents of several files (missing files hash as empty)."""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(path.encode('utf-8'))
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b'\0missing')
+    return digest.hexdigest()
+
+
+class WatchSession:
+    """Keeps per-stage caches between regenerations."""
+
+    def __init__(self, template_doc="input/document.xml", template_folder="input/template1",
+                 chatgpt_file="input/chatgpt.txt", base_data_file="input/base_data.json",
+                 folder_name="watch", convert=True, interval=0.5, debounce=1.0,
+                 metrics=None, metrics_file=None):
+        self.template_doc = template_doc
+        self.template_folder = template_folder
+        self.chatgpt_file = chatgpt_file
+        self.base_data_file = base_data_file
+        self.folder_name = folder_name
+        self.convert = convert
+        self.interval = interval
+        self.debounce = debounce
+
+        self._input_key = None
+        self._input_state = None
+        self._template_key = None
+        self._template_state = None
+        self._docx_hash = None
+        self._parse_cache = None
+        # Optional metrics module (see metrics.py) recording every regeneration
+        self.metrics = metrics
+        self.metrics_file = metrics_file
+        self._job_metrics = None
+
+    def _config(self):
+        """Base data from base_data.json plus the output folder."""
+        config = {}
+        if os.path.exists(self.base_data_file):
+            with open(self.base_data_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        config['folder_name'] = self.folder_name
+        return config
+
+    def _template_xml_files(self):
+        files = [self.template_doc]
+        for dirpath, _, filenames in os.walk(self.template_folder):
+            files.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(XML_SUFFIXES))
+        return files
+
+    def _get_parse_cache(self):
+        """Parse results survive restarts of the watcher (e.g. reverting an edit)."""
+        if self._parse_cache is None:
+            from parse_cache import ParseCache
+            self._parse_cache = ParseCache()
+            if self.metrics:
+                self.metrics.REGISTRY.register_collector(
+                    'parse_cache', self.metrics.parse_cache_collector(self._parse_cache))
+        return self._parse_cache
+
+    def regenerate(self):
+        """Run one generation, reusing every stage whose inputs are unchanged."""
+        if not self.metrics:
+            return self._regenerate()
+
+        self.metrics.JOBS_IN_PROGRESS.inc()
+        self._job_metrics = None
+        docx_path = None
+        try:
+            docx_path = self._regenerate()
+            return docx_path
+        finally:
+            self.metrics.JOBS_IN_PROGRESS.dec()
+            self.metrics.observe_job(self._job_metrics, 'done' if docx_path else 'failed')
+            if self.metrics_file:
+                self.metrics.write_textfile(self.metrics_file)
+
+    def _regenerate(self):
+        from processor import ResumeProcessor
+
+        processor = ResumeProcessor(
+            template_doc=self.template_doc,
+            template_folder=self.template_folder,
+            chatgpt_file=self.chatgpt_file,
+            config=self._config(),
+            parse_cache=self._get_parse_cache(),
+        )
+        self._job_metrics = processor.metrics
+
+        input_key = _hash_files([self.chatgpt_file, self.base_data_file])
+        if input_key == self._input_key:
+            processor.use_input_state(self._input_state)
+            print("⏭ Input unchanged, reusing parse result")
+
+        template_key = _hash_files(self._template_xml_files())
+        if template_key == self._template_key:
+            processor.use_template_state(self._template_state)
+            print("⏭ Template XML unchanged, reusing loaded template")
+
+        docx_path = processor.run()
+        if not docx_path:
+            return None
+
+        self._input_key, self._input_state = input_key, processor.input_state()
+        self._template_key, self._template_state = template_key, processor.template_state()
+
+        docx_hash = _hash_files([docx_path])
+        if not self.convert:
+            return docx_path
+        if docx_hash == self._docx_hash and os.path.exists(docx_path[:-len('.docx')] + '.pdf'):
+            print("⏭ DOCX unchanged, skipping PDF conversion")
+            return docx_path
+
+        from pdf_converter import convert_docx_to_pdf
+        from pdf_export import export_from_config
+        from process_limits import limits_from_config
+        if convert_docx_to_pdf(docx_path, metrics=processor.metrics, export=export_from_config(processor.config),
+                               limits=limits_from_config(processor.config)):
+            self._docx_hash = docx_hash
+        return docx_path
+
+    def run(self):
+        """Poll forever (Ctrl+C to stop)."""
+        # The template .docx is only repackaged, so a change there shows up in the DOCX hash
+        template_docx = self.template_folder.rstrip('/\\') + '.docx'
+        paths = [self.template_doc, self.chatgpt_file, self.base_data_file, template_docx]
+        folders = [self.template_folder]
+
+        print(f"👀 Watching {', '.join(paths)} and {self.template_folder}/ (Ctrl+C to stop)")
+        self.regenerate()
+        last = _snapshot(paths, folders)
+
+        try:
+            while True:
+                time.sleep(self.interval)
+                current = _snapshot(paths, folders)
+                if current == last:
+                    continue
+
+                # Debounce: wait until nothing changed for `debounce` seconds
+                settled_since = time.monotonic()
+                while time.monotonic() - settled_since < self.debounce:
+                    time.sleep(self.interval)
+                    newer = _snapshot(paths, folders)
+                    if newer != current:
+                        current = newer
+                        settled_since = time.monotonic()
+
+                changed = sorted(p for p in set(current) | set(last) if current.get(p) != last.get(p))
+                print(f"\n🔄 Changed: {', '.join(changed[:5])}{' ...' if len(changed) > 5 else ''}")
+                last = current
+                self.regenerate()
+        except KeyboardInterrupt:
+            print("\n👋 Watch stopped")
+        finally:
+            if self._parse_cache is not None:
+                from parse_cache import format_stats
+                print(format_stats(self._parse_cache.stats()))
+                if self.metrics:
+                    self.metrics.REGISTRY.unregister_collector('parse_cache')
+                self._parse_cache.close()
@@ -0,0 +1,221 @@
+"""
+Workspace manager - temp working folders with deterministic cleanup and a disk quota
+
+Every resume used to leave a full template copy in a tempfile.mkdtemp("resume_")
+folder. Workspaces are now named resume_<pid>_<random>, removed when the job
+ends (also on exceptions, exit and SIGTERM), and folders of crashed or killed
+runs are swept at startup. A disk quota throttles new jobs while too much
+workspace space is in use.
+"""
+import atexit
+import os
+import re
+import shutil
+import signal
+import tempfile
+import threading
+import time
+
+PREFIX = 'resume_'
+
+# resume_<pid>_<random> ; older runs created plain resume_<random>
+NAME_RE = re.compile(r'^resume_(\d+)_')
+
+DEFAULT_QUOTA_MB = int(os.environ.get('RESUME_WORKSPACE_QUOTA_MB', '1024'))
+DEFAULT_STALE_SECONDS = 3600
+
+
+def folder_size(path):
+    """Total size in bytes of the files below path."""
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+    return total
+
+
+def _pid_alive_windows(pid):
+    """os.kill(pid, 0) would terminate the process on Windows; ask the kernel instead."""
+    import ctypes
+    from ctypes import wintypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    STILL_ACTIVE = 259
+    ERROR_ACCESS_DENIED = 5
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # Access denied means the process exists but belongs to someone else
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+    try:
+        exit_code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return True
+        return exit_code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _pid_alive(pid):
+    """Return True if a process with this pid exists."""
+    if pid == os.getpid():
+        return True
+    if os.name == 'nt':
+        return _pid_alive_windows(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        # Exists but owned by someone else (or not checkable on this platform)
+        return True
+    return True
+
+
+class WorkspaceManager:
+    """Creates, tracks and removes resume_* working folders."""
+
+    def __init__(self, root=None, quota_mb=DEFAULT_QUOTA_MB,
+                 stale_seconds=DEFAULT_STALE_SECONDS, wait_timeout=300):
+        self.root = root or tempfile.gettempdir()
+        self.quota_bytes = quota_mb * 1024 * 1024 if quota_mb else None
+        self.stale_seconds = stale_seconds
+        self.wait_timeout = wait_timeout
+        self._live = set()
+        self._reserved = {}
+        self._lock = threading.Lock()
+
+    def _workspace_dirs(self):
+        """All resume_* folders in the root, from any process."""
+        try:
+            with os.scandir(self.root) as entries:
+                return [e for e in entries if e.name.startswith(PREFIX) and e.is_dir(follow_symlinks=False)]
+        except OSError:
+            return []
+
+    def sweep_stale(self):
+        """Remove workspaces left behind by crashed or killed runs.
+
+        Returns:
+            (folders removed, bytes freed)
+        """
+        removed, freed = 0, 0
+        now = time.time()
+        for entry in self._workspace_dirs():
+            match = NAME_RE.match(entry.name)
+            if match:
+                stale = not _pid_alive(int(match.group(1)))
+            else:
+                try:
+                    stale = now - entry.stat().st_mtime > self.stale_seconds
+                except OSError:
+                    continue
+            if not stale or entry.path in self._live:
+                continue
+
+            size = folder_size(entry.path)
+            shutil.rmtree(entry.path, ignore_errors=True)
+            if not os.path.exists(entry.path):
+                removed += 1
+                freed += size
+
+        if removed:
+            print(f"🧹 Removed {removed} stale workspaces ({freed / (1024 * 1024):.1f} MB)")
+        return removed, freed
+
+    def usage(self):
+        """Bytes used by all workspaces in the root.
+
+        Our own workspaces count at least what was reserved for them, so jobs
+        that have not finished copying their template still hold their share.
+        """
+        total = 0
+        for entry in self._workspace_dirs():
+            size = folder_size(entry.path)
+            total += max(size, self._reserved.get(entry.path, 0))
+        return total
+
+    def _try_create(self, expected_bytes):
+        """Create and reserve a workspace if it fits the quota, else return None."""
+        with self._lock:
+            if self.quota_bytes and self.usage() + expected_bytes > self.quota_bytes:
+                return None
+            path = tempfile.mkdtemp(prefix=f"{PREFIX}{os.getpid()}_", dir=self.root)
+            self._live.add(path)
+            self._reserved[path] = expected_bytes
+            return path
+
+    def acquire(self, expected_bytes=0):
+        """Create a workspace, waiting while the disk quota is exhausted.
+
+        expected_bytes stay reserved until the workspace is released.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        delay = 0.5
+        announced = False
+        while True:
+            path = self._try_create(expected_bytes)
+            if path:
+                return path
+            if time.monotonic() >= deadline:
+                raise RuntimeError(
+                    f"Workspace quota of {self.quota_bytes // (1024 * 1024)} MB exceeded in {self.root}"
+                )
+            if not announced:
+                print("⏳ Workspace quota reached, waiting for running jobs to finish...")
+                announced = True
+            time.sleep(delay)
+            delay = min(delay * 2, 5.0)
+
+    def release(self, path):
+        """Delete a workspace."""
+        if not path:
+            return
+        with self._lock:
+            self._live.discard(path)
+            self._reserved.pop(path, None)
+        shutil.rmtree(path, ignore_errors=True)
+
+    def release_all(self):
+        """Delete every workspace this process still holds."""
+        with self._lock:
+            live = list(self._live)
+        for path in live:
+            self.release(path)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def _handle_sigterm(previous):
+    """SIGTERM handler that cleans up, then defers to the previous handler."""
+    def handler(signum, frame):
+        if _manager is not None:
+            _manager.release_all()
+        if callable(previous):
+            previous(signum, frame)
+        else:
+            signal.signal(signum, signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+    return handler
+
+
+def get_workspace_manager():
+    """Process-wide manager; the first call sweeps stale workspaces and installs cleanup hooks."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = WorkspaceManager()
+            _manager.sweep_stale()
+            atexit.register(_manager.release_all)
+            if threading.current_thread() is threading.main_thread() and hasattr(signal, 'SIGTERM'):
+                previous = signal.getsignal(signal.SIGTERM)
+                if previous not in (signal.SIG_IGN, None):
+                    signal.signal(signal.SIGTERM, _handle_sigterm(previous))
+        return _manager